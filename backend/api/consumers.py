@@ -7,8 +7,9 @@ from rest_framework_simplejwt.tokens import UntypedToken
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from jwt import decode as jwt_decode
 from django.conf import settings
-from .models import ChatRoom, Message, Notification
-import uuid
+from .models import ChatRoom, Message
+from .utils.ids import new_id
+from .utils.notifications import get_unread_count, mark_notifications_read
 
 
 class NotificationConsumer(AsyncWebsocketConsumer):
@@ -92,10 +93,8 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             await self.accept()
             logger.info("[NotificationConsumer] Connection accepted")
             
-            # Send unread notifications count (excluding message notifications)
-            unread_count = await database_sync_to_async(
-                Notification.objects.filter(user=self.user, is_read=False).exclude(type='message').count
-            )()
+            # Send unread notifications count (excluding message notifications), from the cached counter
+            unread_count = await database_sync_to_async(get_unread_count)(self.user.id)
             
             # Close database connections after database operations
             from django.db import close_old_connections
@@ -163,17 +162,10 @@ class NotificationConsumer(AsyncWebsocketConsumer):
                 # Mark notification as read
                 notification_id = data.get('notification_id')
                 if notification_id:
-                    await database_sync_to_async(
-                        Notification.objects.filter(
-                            id=notification_id,
-                            user=self.user
-                        ).update
-                    )(is_read=True)
+                    await database_sync_to_async(mark_notifications_read)(self.user.id, notification_id)
                     
                     # Send updated unread count (excluding message notifications)
-                    unread_count = await database_sync_to_async(
-                        Notification.objects.filter(user=self.user, is_read=False).exclude(type='message').count
-                    )()
+                    unread_count = await database_sync_to_async(get_unread_count)(self.user.id)
                     await self.send(text_data=json.dumps({
                         'type': 'unread_count_updated',
                         'unread_count': unread_count
@@ -185,9 +177,7 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             
             elif message_type == 'mark_all_read':
                 # Mark all notifications as read (excluding message notifications)
-                await database_sync_to_async(
-                    Notification.objects.filter(user=self.user, is_read=False).exclude(type='message').update
-                )(is_read=True)
+                await database_sync_to_async(mark_notifications_read)(self.user.id)
                 
                 await self.send(text_data=json.dumps({
                     'type': 'unread_count_updated',
@@ -205,6 +195,14 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             'unread_count': event.get('unread_count', 0)
         }))
     
+    async def notifications_batch(self, event):
+        """Send notifications coalesced by api/utils/notification_delivery.py in one frame"""
+        await self.send(text_data=json.dumps({
+            'type': 'notifications_batch',
+            'notifications': event['notifications'],
+            'unread_count': event.get('unread_count', 0)
+        }))
+    
     async def notification_updated(self, event):
         """Send notification update to WebSocket"""
         await self.send(text_data=json.dumps({
@@ -242,6 +240,20 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         
         logger.info(f"[NotificationConsumer] Event notification sent successfully")
 
+    async def import_job_progress(self, event):
+        """Send import job progress to WebSocket"""
+        await self.send(text_data=json.dumps({
+            'type': 'import_job_progress',
+            'job': event['job']
+        }))
+
+    async def import_job_finished(self, event):
+        """Send the final state and report of an import job to WebSocket"""
+        await self.send(text_data=json.dumps({
+            'type': 'import_job_finished',
+            'job': event['job']
+        }))
+
 
 class ChatConsumer(AsyncWebsocketConsumer):
     """WebSocket consumer for real-time chat"""
@@ -355,9 +367,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 # Create message in database
                 chat_room = await database_sync_to_async(ChatRoom.objects.get)(id=self.room_id)
                 
-                message_id = uuid.uuid4().hex[:12]
-                while await database_sync_to_async(Message.objects.filter(id=message_id).exists)():
-                    message_id = uuid.uuid4().hex[:12]
+                message_id = new_id()
                 
                 message = await database_sync_to_async(Message.objects.create)(
                     id=message_id,
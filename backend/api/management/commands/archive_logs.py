@@ -0,0 +1,79 @@
+"""
+Management command to archive old activity logs.
+
+Creates the monthly partitions of the Log table ahead of time (PostgreSQL) and
+moves the months older than the retention window to the archive storage as
+gzipped NDJSON (see api/utils/log_archive.py). Run it from a daily/monthly cron.
+"""
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand
+
+from api.utils import log_archive
+
+
+class Command(BaseCommand):
+    help = 'Create the upcoming Log partitions and archive the logs older than the retention window'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-months',
+            type=int,
+            default=12,
+            help='Number of months (current month included) kept in the database (default: 12)'
+        )
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=3,
+            help='Number of future monthly partitions to create (default: 3)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show the months that would be archived without archiving them'
+        )
+
+    def handle(self, *args, **options):
+        retention_months = max(options['retention_months'], 1)
+        dry_run = options['dry_run']
+
+        current_month = log_archive.month_start(datetime.now(dt_timezone.utc).date())
+        cutoff_month = log_archive.add_months(current_month, -(retention_months - 1))
+        cutoff, _ = log_archive.month_bounds(cutoff_month)
+
+        if not dry_run:
+            created = log_archive.ensure_partitions(options['months_ahead'])
+            for name in created:
+                self.stdout.write(f'Created partition {name}')
+
+        partitions = {}
+        if log_archive.is_partitioned():
+            partitions = {
+                month: name for month, name in log_archive.monthly_partitions().items() if month < cutoff_month
+            }
+        # Rows of old months outside a dedicated partition (default partition, non partitioned table)
+        row_months = [
+            month for month in log_archive.months_with_rows_before(cutoff) if month not in partitions
+        ]
+
+        if not partitions and not row_months:
+            self.stdout.write(self.style.SUCCESS(f'No logs older than {cutoff_month:%Y-%m} to archive'))
+            return
+
+        for month, name in sorted(partitions.items()):
+            if dry_run:
+                self.stdout.write(f'[dry run] Would archive partition {name}')
+                continue
+            archive = log_archive.archive_partition(month, name)
+            self.stdout.write(f'Archived partition {name}: {archive.row_count} logs to {archive.storage_prefix}')
+
+        for month in row_months:
+            if dry_run:
+                self.stdout.write(f'[dry run] Would archive the logs of {month:%Y-%m}')
+                continue
+            archive = log_archive.archive_rows(month)
+            if archive:
+                self.stdout.write(f'Archived {archive.row_count} logs of {month:%Y-%m} to {archive.storage_prefix}')
+
+        self.stdout.write(self.style.SUCCESS('Done'))
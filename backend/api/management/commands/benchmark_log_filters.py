@@ -0,0 +1,147 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+
+from api.models import Contact, Log
+from api.utils.ids import new_ids
+
+
+class _Rollback(Exception):
+    """Raised at the end of the benchmark to roll back everything it created"""
+
+
+# Indexes the filter queries are expected to use (migration 0113)
+STATUS_CHANGE_INDEXES = ('log_edit_old_status_idx', 'log_edit_new_status_idx', 'log_edit_old_teleop_idx')
+
+
+class Command(BaseCommand):
+    help = (
+        'Run the previousStatus / previousTeleoperator log queries on generated contact edit logs, '
+        'show their timings and the indexes used by their plans, then roll back'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--logs',
+            type=int,
+            default=200000,
+            help='Number of logs generated before running the queries, 0 to use the existing logs only (default: 200000)',
+        )
+        parser.add_argument(
+            '--contacts',
+            type=int,
+            default=2000,
+            help='Number of temporary contacts the logs are spread over (default: 2000)',
+        )
+        parser.add_argument(
+            '--statuses',
+            type=int,
+            default=20,
+            help='Number of distinct status / teleoperator names in the generated logs (default: 20)',
+        )
+
+    def handle(self, *args, **options):
+        logs = options['logs']
+        if logs < 0:
+            raise CommandError('--logs must be positive or 0')
+        names = max(options['statuses'], 2)
+
+        results = []
+        try:
+            with transaction.atomic():
+                if logs:
+                    self.stdout.write(f'Generating {logs} logs...')
+                    self._generate(logs, max(options['contacts'], 1), names)
+                if connection.vendor == 'postgresql':
+                    with connection.cursor() as cursor:
+                        cursor.execute('ANALYZE api_log')
+                for label, queryset in self._queries():
+                    plan = queryset.explain()
+                    started = time.perf_counter()
+                    rows = len(list(queryset))
+                    elapsed = time.perf_counter() - started
+                    used = [name for name in STATUS_CHANGE_INDEXES if name in plan]
+                    results.append((label, rows, elapsed, used, plan))
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+        if connection.vendor != 'postgresql':
+            self.stdout.write(self.style.WARNING(
+                f'Running on {connection.vendor}: the status change indexes target PostgreSQL, '
+                'the plans below are not representative'
+            ))
+        all_used = True
+        for label, rows, elapsed, used, plan in results:
+            all_used = all_used and bool(used)
+            style = self.style.SUCCESS if used else self.style.WARNING
+            self.stdout.write(style(
+                f"{label}: {rows} rows in {elapsed * 1000:.1f}ms, indexes: {', '.join(used) or 'none'}"
+            ))
+            if options['verbosity'] > 1 or not used:
+                self.stdout.write(plan)
+        if all_used:
+            self.stdout.write(self.style.SUCCESS('Every query uses a status change index (rolled back)'))
+        else:
+            self.stdout.write(self.style.WARNING('Some queries do not use a status change index (rolled back)'))
+
+    def _generate(self, count, contacts_count, names):
+        contact_ids = new_ids(contacts_count)
+        Contact.objects.bulk_create(
+            [Contact(id=contact_id, fname='Benchmark') for contact_id in contact_ids],
+            batch_size=1000,
+        )
+        statuses = [f'Benchmark status {i}' for i in range(names)]
+        teleoperators = [f'Benchmark teleoperator {i}' for i in range(names)]
+        batch = []
+        for log_id in new_ids(count):
+            contact_id = random.choice(contact_ids)
+            kind = random.random()
+            if kind < 0.4:
+                # Status change
+                old_status, new_status = random.sample(statuses, 2)
+                log = Log(id=log_id, event_type='editContact', contact_id_id=contact_id,
+                          old_value={'statusName': old_status}, new_value={'statusName': new_status})
+            elif kind < 0.6:
+                # Teleoperator change
+                old_name, new_name = random.sample(teleoperators, 2)
+                log = Log(id=log_id, event_type='editContact', contact_id_id=contact_id,
+                          old_value={'teleoperatorName': old_name}, new_value={'teleoperatorName': new_name})
+            elif kind < 0.7:
+                # Other contact edit
+                log = Log(id=log_id, event_type='editContact', contact_id_id=contact_id,
+                          old_value={'city': 'Paris'}, new_value={'city': 'Lyon'})
+            else:
+                log = Log(id=log_id, event_type='addNote', contact_id_id=contact_id,
+                          new_value={'text': 'Benchmark note'})
+            batch.append(log)
+            if len(batch) >= 5000:
+                Log.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Log.objects.bulk_create(batch)
+
+    def _queries(self):
+        """Same queries as the previousStatus / previousTeleoperator filters of ContactView and FosseContactView"""
+        status = 'Benchmark status 1'
+        teleoperator = 'Benchmark teleoperator 1'
+        yield 'previousStatus (old status in values)', Log.objects.filter(
+            event_type='editContact',
+            old_value__statusName__in=[status],
+            new_value__statusName__isnull=False
+        ).exclude(
+            old_value__statusName=models.F('new_value__statusName')
+        ).order_by('contact_id_id', '-created_at').values_list('contact_id_id', 'new_value')
+        yield 'Status changed to', Log.objects.filter(
+            event_type='editContact',
+            new_value__statusName=status,
+        ).values_list('contact_id_id', flat=True)
+        yield 'previousTeleoperator (old teleoperator)', Log.objects.filter(
+            event_type='editContact',
+            old_value__teleoperatorName=teleoperator,
+            new_value__teleoperatorName__isnull=False
+        ).exclude(
+            old_value__teleoperatorName=models.F('new_value__teleoperatorName')
+        ).values_list('contact_id_id', flat=True)
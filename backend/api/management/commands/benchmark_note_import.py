@@ -0,0 +1,116 @@
+import io
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth.models import User as DjangoUser
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.models import Contact, Note
+
+
+class _Rollback(Exception):
+    """Raised at the end of the benchmark to roll back everything it created"""
+
+
+class _BenchmarkRequest:
+    """Minimal stand-in for the DRF request given to the notes import pipeline"""
+
+    def __init__(self, user, file, column_mapping):
+        self.user = user
+        self.data = {'columnMapping': json.dumps(column_mapping)}
+        self.query_params = {}
+        self.FILES = {'file': file}
+        self.META = {}
+
+
+class Command(BaseCommand):
+    help = 'Measure the notes CSV import (historical notes with their own created_at) on the current database, then roll it back'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=100000,
+            help='Number of notes in the generated CSV (default: 100000)',
+        )
+        parser.add_argument(
+            '--contacts',
+            type=int,
+            default=100,
+            help='Number of temporary contacts the notes are spread over (default: 100)',
+        )
+        parser.add_argument(
+            '--username',
+            type=str,
+            default=None,
+            help='User running the import (default: first superuser)',
+        )
+
+    def handle(self, *args, **options):
+        from api.views import run_csv_import_notes
+
+        rows = options['rows']
+        if rows <= 0:
+            raise CommandError('--rows must be positive')
+
+        if options['username']:
+            user = DjangoUser.objects.filter(username=options['username']).first()
+        else:
+            user = DjangoUser.objects.filter(is_superuser=True).order_by('id').first()
+        if not user:
+            raise CommandError('No user found to run the import (use --username)')
+
+        prefix = uuid.uuid4().hex[:4]
+        old_ids = [f'B{prefix}{i:06d}' for i in range(max(1, options['contacts']))]
+
+        # Historical notes: one per minute going back from a fixed date
+        start = datetime(2020, 1, 1, 12, 0, 0, tzinfo=dt_timezone.utc)
+        buffer = io.StringIO()
+        buffer.write('text,old_contact_id,created_at\n')
+        for i in range(rows):
+            created_at = start - timedelta(minutes=i)
+            buffer.write(f'Note historique {i},{old_ids[i % len(old_ids)]},{created_at:%Y-%m-%d %H:%M:%S}\n')
+        csv_file = SimpleUploadedFile('benchmark_notes.csv', buffer.getvalue().encode('utf-8'), content_type='text/csv')
+        buffer = None
+
+        request = _BenchmarkRequest(user, csv_file, {
+            'text': 'text',
+            'oldContactId': 'old_contact_id',
+            'createdAt': 'created_at',
+        })
+
+        self.stdout.write(f'Importing {rows} notes...')
+        try:
+            with transaction.atomic():
+                Contact.objects.bulk_create([
+                    Contact(id=uuid.uuid4().hex[:12], old_contact_id=old_id, fname='Benchmark')
+                    for old_id in old_ids
+                ])
+
+                started = time.perf_counter()
+                response = run_csv_import_notes(request)
+                elapsed = time.perf_counter() - started
+
+                results = response.data
+                restored = Note.objects.filter(
+                    contactId__old_contact_id__in=old_ids,
+                    created_at__lt=start + timedelta(seconds=1),
+                ).count()
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+        if 'imported' not in results:
+            raise CommandError(f"Import failed: {results.get('error')}")
+
+        self.stdout.write(
+            f"Imported {results['imported']}/{results['total']} notes ({results['failed']} failed) "
+            f"in {elapsed:.1f}s ({results['imported'] / elapsed if elapsed else 0:.0f} rows/s), "
+            f"{restored} with their historical created_at"
+        )
+        style = self.style.SUCCESS if elapsed < 60 else self.style.WARNING
+        self.stdout.write(style(f'Total time: {elapsed:.1f}s (rolled back)'))
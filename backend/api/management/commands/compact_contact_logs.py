@@ -0,0 +1,88 @@
+"""
+Management command to compact the editContact logs that store full contact snapshots.
+
+Older contact edits (and imported logs) stored the whole contact in old_value and
+new_value. They are rewritten to keep only the changed fields, like the logs written
+now; the full snapshots can be rebuilt with reconstruct_contact_log_snapshots.
+
+The reconstruction starts from the current contact and cannot recover fields that
+changed without a log, so the original rows of every batch are first copied to the
+log archive storage (log-backup/compact-contact-logs-<time>/batch-<n>.ndjson.gz,
+gzipped NDJSON in the log_archive columns). A batch is only rewritten once its copy
+is stored.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from api.models import Log
+from api.utils.log_archive import ARCHIVE_COLUMNS, BACKUP_KEY_PREFIX, backup_rows
+from api.views import compact_contact_log_values
+
+
+class Command(BaseCommand):
+    help = (
+        'Rewrite editContact logs storing full contact snapshots to store only the changed fields '
+        '(the original rows are copied to the log archive storage first)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of logs updated per query (default: 1000)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count the logs that would be compacted without updating them'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options['batch_size'], 1)
+        dry_run = options['dry_run']
+        backup_name = f'compact-contact-logs-{timezone.now():%Y%m%d-%H%M%S}'
+
+        old_index = ARCHIVE_COLUMNS.index('old_value')
+        new_index = ARCHIVE_COLUMNS.index('new_value')
+        logs = Log.objects.filter(event_type='editContact').values_list(*ARCHIVE_COLUMNS)
+        checked = 0
+        compacted = 0
+        batches = 0
+        pending = []
+        originals = []
+        for row in logs.iterator(chunk_size=batch_size):
+            checked += 1
+            old_value, new_value = row[old_index], row[new_index]
+            if not isinstance(old_value, dict) or not isinstance(new_value, dict):
+                continue
+            old_changes, new_changes = compact_contact_log_values(old_value, new_value)
+            if old_changes == old_value and new_changes == new_value:
+                continue
+            compacted += 1
+            if dry_run:
+                continue
+            pending.append(Log(id=row[0], old_value=old_changes, new_value=new_changes))
+            originals.append(row)
+            if len(pending) >= batch_size:
+                batches += 1
+                self._update(pending, originals, f'{backup_name}/batch-{batches:05d}')
+                pending = []
+                originals = []
+        if pending:
+            batches += 1
+            self._update(pending, originals, f'{backup_name}/batch-{batches:05d}')
+
+        prefix = '[dry run] ' if dry_run else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefix}{compacted} of {checked} editContact logs compacted'
+        ))
+        if batches:
+            self.stdout.write(f'Original rows copied to {BACKUP_KEY_PREFIX}/{backup_name}/ ({batches} files)')
+
+    def _update(self, logs, originals, backup_name):
+        # Keep the full snapshots before they are rewritten
+        backup_rows(originals, backup_name)
+        with transaction.atomic():
+            Log.objects.bulk_update(logs, ['old_value', 'new_value'])
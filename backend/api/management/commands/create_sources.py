@@ -4,7 +4,7 @@ Management command to create sources in the database.
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
 from api.models import Source
-import uuid
+from api.utils.ids import new_id
 
 
 class Command(BaseCommand):
@@ -188,9 +188,7 @@ class Command(BaseCommand):
         
         for name in missing_names:
             # Generate unique ID
-            source_id = uuid.uuid4().hex[:12]
-            while Source.objects.filter(id=source_id).exists():
-                source_id = uuid.uuid4().hex[:12]
+            source_id = new_id()
             
             try:
                 # Create source
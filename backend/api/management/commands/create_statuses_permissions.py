@@ -4,7 +4,7 @@ These are needed for managing statuses in the Settings tab.
 """
 from django.core.management.base import BaseCommand
 from api.models import Permission, Role, PermissionRole
-import uuid
+from api.utils.ids import new_id
 
 
 class Command(BaseCommand):
@@ -60,9 +60,7 @@ class Command(BaseCommand):
         created_count = 0
         for action in missing_actions:
             # Generate unique ID
-            permission_id = uuid.uuid4().hex[:12]
-            while Permission.objects.filter(id=permission_id).exists():
-                permission_id = uuid.uuid4().hex[:12]
+            permission_id = new_id()
             
             # Create permission
             permission = Permission.objects.create(
@@ -1,7 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User as DjangoUser
 from api.models import UserDetails, Role, Team, TeamMember
-import uuid
+from api.utils.ids import new_id
 
 
 class Command(BaseCommand):
@@ -50,24 +50,7 @@ class Command(BaseCommand):
             return
 
         # Generate UserDetails ID
-        max_id = 0
-        for id_val in UserDetails.objects.values_list('id', flat=True):
-            try:
-                int_id = int(id_val)
-                if int_id > max_id:
-                    max_id = int_id
-            except (ValueError, TypeError):
-                continue
-
-        new_id = max_id + 1
-        user_details_id = str(new_id)
-
-        # If the ID exceeds 12 characters, use a truncated UUID instead
-        if len(user_details_id) > 12:
-            while True:
-                user_details_id = uuid.uuid4().hex[:12]
-                if not UserDetails.objects.filter(id=user_details_id).exists():
-                    break
+        user_details_id = new_id()
 
         # Get role if role_id provided
         role = None
@@ -96,9 +79,7 @@ class Command(BaseCommand):
         if team_id:
             try:
                 team = Team.objects.get(id=team_id)
-                team_member_id = uuid.uuid4().hex[:12]
-                while TeamMember.objects.filter(id=team_member_id).exists():
-                    team_member_id = uuid.uuid4().hex[:12]
+                team_member_id = new_id()
                 TeamMember.objects.create(
                     id=team_member_id,
                     user=user_details,
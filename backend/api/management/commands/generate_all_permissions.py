@@ -4,15 +4,12 @@ This ensures all permissions exist in the database and links them to all existin
 """
 from django.core.management.base import BaseCommand
 from api.models import Permission, Role, PermissionRole
-import uuid
+from api.utils.ids import new_id
 
 
 def generate_unique_id(model_class):
     """Generate a unique 12-character ID for a model"""
-    while True:
-        new_id = uuid.uuid4().hex[:12]
-        if not model_class.objects.filter(id=new_id).exists():
-            return new_id
+    return new_id()
 
 
 class Command(BaseCommand):
@@ -0,0 +1,73 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.utils.email_verification_queue import (
+    VERIFICATION_BATCH_SIZE, VERIFICATION_TIMEOUT,
+    enqueue_unverified_contacts, process_email_verification_batch,
+)
+
+
+class Command(BaseCommand):
+    help = 'Verify the email domains of queued contacts (DNS MX check) and store the results'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process the entries currently due and exit instead of polling',
+        )
+        parser.add_argument(
+            '--backfill',
+            action='store_true',
+            help='Queue every contact with an email still not verified before processing',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=VERIFICATION_BATCH_SIZE,
+            help=f'Queue entries verified per batch (default: {VERIFICATION_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=VERIFICATION_TIMEOUT,
+            help=f'DNS query timeout in seconds (default: {VERIFICATION_TIMEOUT})',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=10.0,
+            help='Seconds to wait between two polls when no entry is due (default: 10)',
+        )
+
+    def handle(self, *args, **options):
+        once = options['once']
+
+        if options['backfill']:
+            queued = enqueue_unverified_contacts()
+            self.stdout.write(f'Queued {queued} not verified contacts')
+
+        self.stdout.write('Email verification worker started')
+
+        while True:
+            close_old_connections()
+            stats = process_email_verification_batch(
+                batch_size=options['batch_size'],
+                timeout=options['timeout'],
+            )
+
+            if stats['processed']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Verified {stats['processed']} contacts: {stats['valid']} valid, {stats['invalid']} invalid, "
+                    f"{stats['retried']} to retry, {stats['dropped']} dropped, "
+                    f"{stats['requeued']} requeued after an email change"
+                ))
+                continue
+
+            if once:
+                break
+            time.sleep(options['poll_interval'])
+
+        self.stdout.write(self.style.SUCCESS('Email verification worker finished'))
@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.utils.import_jobs import (
+    STALE_JOB_SECONDS, claim_next_import_job, requeue_stale_import_jobs, run_import_job,
+)
+
+
+class Command(BaseCommand):
+    help = 'Process queued background import jobs (contacts, notes, logs, integration update)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process the jobs currently queued and exit instead of polling',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to wait between two polls when the queue is empty (default: 2)',
+        )
+        parser.add_argument(
+            '--stale-after',
+            type=int,
+            default=STALE_JOB_SECONDS,
+            help=f'Requeue running jobs without progress for this many seconds, they resume from their checkpoint (default: {STALE_JOB_SECONDS})',
+        )
+
+    def handle(self, *args, **options):
+        once = options['once']
+        poll_interval = options['poll_interval']
+
+        self.stdout.write('Import worker started')
+
+        while True:
+            close_old_connections()
+            requeue_stale_import_jobs(options['stale_after'])
+            job = claim_next_import_job()
+
+            if job is None:
+                if once:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            self.stdout.write(f'Processing {job.kind} import job {job.id} ({job.file_name})')
+            job = run_import_job(job)
+
+            if job.status == 'completed':
+                self.stdout.write(self.style.SUCCESS(
+                    f'Job {job.id} completed: {job.imported} imported, {job.failed} failed'
+                ))
+            else:
+                self.stdout.write(self.style.ERROR(f'Job {job.id} failed: {job.error}'))
+
+        self.stdout.write(self.style.SUCCESS('Import worker finished'))
@@ -0,0 +1,67 @@
+"""
+Management command to delete the read notifications older than the retention period.
+
+Unread notifications are always kept. The rows are deleted in batches (one short
+transaction each) so the notifications table is never locked for long; the
+unread counters are not affected.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.models import Notification
+
+
+class Command(BaseCommand):
+    help = 'Delete read notifications older than NOTIFICATION_RETENTION_DAYS, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Delete read notifications older than this many days (default: NOTIFICATION_RETENTION_DAYS)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Number of notifications deleted per query (default: 5000)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count the notifications that would be deleted without deleting them'
+        )
+
+    def handle(self, *args, **options):
+        days = options['days']
+        if days is None:
+            days = getattr(settings, 'NOTIFICATION_RETENTION_DAYS', 90)
+        if days < 1:
+            raise CommandError('--days must be at least 1')
+        batch_size = max(options['batch_size'], 1)
+        cutoff = timezone.now() - timedelta(days=days)
+
+        # notification_read_created_idx
+        expired = Notification.objects.filter(is_read=True, created_at__lt=cutoff)
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(
+                f'[dry run] {expired.count()} read notifications older than {days} days would be deleted'
+            ))
+            return
+
+        deleted = 0
+        while True:
+            batch_ids = list(expired.order_by('created_at').values_list('id', flat=True)[:batch_size])
+            if not batch_ids:
+                break
+            count, _ = Notification.objects.filter(id__in=batch_ids, is_read=True).delete()
+            deleted += count
+            if options['verbosity'] > 1:
+                self.stdout.write(f'Deleted {deleted} notifications...')
+
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} read notifications older than {days} days'))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from api.utils.notifications import UNREAD_COUNT_TTL, reconcile_unread_counts
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the cached unread notification counters from the notifications table '
+        f'(counters also expire after {UNREAD_COUNT_TTL} seconds)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=int,
+            action='append',
+            dest='users',
+            help='Django user ID to reconcile (repeatable, default: all users)',
+        )
+
+    def handle(self, *args, **options):
+        count = reconcile_unread_counts(options['users'])
+        self.stdout.write(self.style.SUCCESS(f'Reconciled the unread counters of {count} users'))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from api.utils.event_reminders import REFRESH_SECONDS, ReminderScheduler
+
+
+class Command(BaseCommand):
+    help = 'Send the event reminders at their exact time (long-running process, see api/utils/event_reminders.py)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Send the reminders due now and exit instead of running continuously',
+        )
+        parser.add_argument(
+            '--refresh-interval',
+            type=int,
+            default=REFRESH_SECONDS,
+            help=f'Seconds between two loads of new or moved events (default: {REFRESH_SECONDS})',
+        )
+
+    def handle(self, *args, **options):
+        scheduler = ReminderScheduler(refresh_seconds=max(options['refresh_interval'], 1))
+
+        if options['once']:
+            sent = scheduler.run_once()
+            self.stdout.write(self.style.SUCCESS(f'Sent {sent} event reminders'))
+            return
+
+        self.stdout.write('Event reminder scheduler started')
+        scheduler.run_forever()
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-19 07:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0106_contactview'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.CharField(default='', max_length=12, primary_key=True, serialize=False, unique=True)),
+                ('kind', models.CharField(choices=[('contacts', 'Contacts'), ('notes', 'Notes'), ('logs', 'Logs'), ('integration_update', 'Integration update')], max_length=30)),
+                ('status', models.CharField(choices=[('pending', 'En attente'), ('running', 'En cours'), ('completed', 'Terminé'), ('failed', 'Échoué')], default='pending', max_length=20)),
+                ('file_name', models.CharField(blank=True, default='', max_length=255)),
+                ('file_path', models.CharField(blank=True, default='', max_length=500)),
+                ('params', models.JSONField(blank=True, default=dict)),
+                ('request_meta', models.JSONField(blank=True, default=dict)),
+                ('total_rows', models.IntegerField(default=0)),
+                ('processed_rows', models.IntegerField(default=0)),
+                ('imported', models.IntegerField(default=0)),
+                ('failed', models.IntegerField(default=0)),
+                ('report', models.JSONField(blank=True, default=dict)),
+                ('error', models.TextField(blank=True, default='')),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='import_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='api_importj_status_47df30_idx'), models.Index(fields=['user', '-created_at'], name='api_importj_user_id_23e92f_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-19 07:43
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0107_importjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailVerificationQueue',
+            fields=[
+                ('id', models.CharField(default='', max_length=12, primary_key=True, serialize=False, unique=True)),
+                ('attempts', models.IntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('contact', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='email_verification_queue', to='api.contact')),
+            ],
+            options={
+                'ordering': ['next_attempt_at'],
+                'indexes': [models.Index(fields=['next_attempt_at'], name='api_emailve_next_at_a463ef_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-19 07:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0108_emailverificationqueue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='attempts',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='checkpoint_failed',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='checkpoint_imported',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='checkpoint_row',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='importjob',
+            name='status',
+            field=models.CharField(choices=[('uploading', 'Envoi en cours'), ('pending', 'En attente'), ('running', 'En cours'), ('completed', 'Terminé'), ('failed', 'Échoué')], default='pending', max_length=20),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-19 08:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0109_importjob_checkpoint'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['old_contact_id'], name='api_contact_old_con_2dcabb_idx'),
+        ),
+    ]
@@ -0,0 +1,136 @@
+# Generated by Django 5.2.7 on 2026-10-19 08:15
+
+from datetime import timedelta
+
+from django.db import migrations, models, transaction
+
+
+# Rows moved from the old table per transaction
+COPY_BATCH_SIZE = 10000
+
+
+def partition_log_table(apps, schema_editor):
+    """
+    Convert api_log to a table partitioned by month of created_at (PostgreSQL only).
+
+    The table switch is one short transaction: api_log is renamed to
+    api_log_unpartitioned and an empty partitioned api_log takes its place, with
+    monthly partitions from the oldest month to three months ahead (later months
+    are created by the archive_logs command, which has to run on a schedule, see
+    docs/deployment/heroku/HEROKU_SCHEDULER_SETUP.md). New logs are written to
+    the new table right away. The existing rows are then moved in batches of
+    COPY_BATCH_SIZE, one transaction each (the migration is not atomic), so
+    api_log is never locked for the whole copy; older logs reappear progressively
+    while it runs. An interrupted migration resumes the move when run again.
+
+    The primary key becomes (id, created_at): PostgreSQL requires the partition
+    key in the unique constraints of a partitioned table. The migration state
+    keeps Log.id as the primary key (no SeparateDatabaseAndState): ids stay
+    unique as they are generated by api/utils/ids.py, and Django only needs id to
+    address rows.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass('api_log')")
+        row = cursor.fetchone()
+    if row and row[0] != 'p':
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            _switch_to_partitioned_table(cursor)
+    _move_unpartitioned_rows(connection)
+
+
+def _switch_to_partitioned_table(cursor):
+    cursor.execute("LOCK TABLE api_log IN ACCESS EXCLUSIVE MODE")
+    cursor.execute(
+        "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = 'api_log' AND indexname <> 'api_log_pkey'"
+    )
+    indexes = cursor.fetchall()
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = 'api_log'::regclass AND contype = 'f'"
+    )
+    foreign_keys = cursor.fetchall()
+    cursor.execute(
+        "SELECT date_trunc('month', MIN(created_at) AT TIME ZONE 'UTC'), "
+        "date_trunc('month', now() AT TIME ZONE 'UTC') FROM api_log"
+    )
+    first_month, current_month = cursor.fetchone()
+    month = min(first_month or current_month, current_month)
+    last_month = current_month + timedelta(days=31 * 3)
+
+    cursor.execute("ALTER TABLE api_log RENAME TO api_log_unpartitioned")
+    cursor.execute("ALTER TABLE api_log_unpartitioned RENAME CONSTRAINT api_log_pkey TO api_log_unpartitioned_pkey")
+    # The old table is only read and emptied from now on: its indexes (the names are reused on api_log)
+    # and foreign keys are dropped
+    for name, _definition in foreign_keys:
+        cursor.execute(f'ALTER TABLE api_log_unpartitioned DROP CONSTRAINT "{name}"')
+    for name, _definition in indexes:
+        cursor.execute(f'DROP INDEX "{name}"')
+
+    cursor.execute("CREATE TABLE api_log (LIKE api_log_unpartitioned INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)")
+    cursor.execute("ALTER TABLE api_log ADD CONSTRAINT api_log_pkey PRIMARY KEY (id, created_at)")
+    cursor.execute("CREATE TABLE api_log_default PARTITION OF api_log DEFAULT")
+    while month <= last_month:
+        next_month = (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+        cursor.execute(
+            f"CREATE TABLE api_log_p{month:%Y%m} PARTITION OF api_log "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d} 00:00:00+00') TO ('{next_month:%Y-%m-%d} 00:00:00+00')"
+        )
+        month = next_month
+    # Created on the empty table: instant
+    for _name, definition in indexes:
+        cursor.execute(definition)
+    for name, definition in foreign_keys:
+        cursor.execute(f'ALTER TABLE api_log ADD CONSTRAINT "{name}" {definition}')
+
+
+def _move_unpartitioned_rows(connection):
+    """Move the rows of api_log_unpartitioned to api_log batch by batch, then drop it"""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('api_log_unpartitioned')")
+        if cursor.fetchone()[0] is None:
+            return
+    while True:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(
+                "WITH moved AS ("
+                "DELETE FROM api_log_unpartitioned WHERE ctid IN "
+                "(SELECT ctid FROM api_log_unpartitioned LIMIT %s) RETURNING *"
+                ") INSERT INTO api_log SELECT * FROM moved",
+                [COPY_BATCH_SIZE],
+            )
+            if cursor.rowcount < COPY_BATCH_SIZE:
+                break
+    with connection.cursor() as cursor:
+        cursor.execute("DROP TABLE api_log_unpartitioned")
+
+
+class Migration(migrations.Migration):
+
+    # The rows are moved in batches, each in its own transaction (see partition_log_table)
+    atomic = False
+
+    dependencies = [
+        ('api', '0110_contact_old_contact_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LogArchive',
+            fields=[
+                ('id', models.CharField(default='', max_length=12, primary_key=True, serialize=False, unique=True)),
+                ('month', models.DateField(db_index=True)),
+                ('source', models.CharField(default='', max_length=63)),
+                ('storage_prefix', models.CharField(max_length=255)),
+                ('buckets', models.JSONField(blank=True, default=list)),
+                ('row_count', models.IntegerField(default=0)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-month'],
+            },
+        ),
+        migrations.RunPython(partition_log_table, migrations.RunPython.noop),
+    ]
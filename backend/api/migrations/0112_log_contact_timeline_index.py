@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-19 08:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0111_log_partitions_and_archive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='log',
+            index=models.Index(fields=['contact_id', '-created_at', '-id'], name='api_log_contact_2fef52_idx'),
+        ),
+    ]
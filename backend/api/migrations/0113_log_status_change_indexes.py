@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-19 08:22
+
+import django.db.models.fields.json
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0112_log_contact_timeline_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='log',
+            index=models.Index(django.db.models.fields.json.KeyTransform('statusName', 'old_value'), condition=models.Q(('event_type', 'editContact')), name='log_edit_old_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='log',
+            index=models.Index(django.db.models.fields.json.KeyTransform('statusName', 'new_value'), condition=models.Q(('event_type', 'editContact')), name='log_edit_new_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='log',
+            index=models.Index(django.db.models.fields.json.KeyTransform('teleoperatorName', 'old_value'), condition=models.Q(('event_type', 'editContact')), name='log_edit_old_teleop_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-19 08:25
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0113_log_status_change_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventReminder',
+            fields=[
+                ('id', models.CharField(default='', max_length=12, primary_key=True, serialize=False, unique=True)),
+                ('reminder_type', models.CharField(max_length=20)),
+                ('event_datetime', models.DateTimeField()),
+                ('sent_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['datetime'], name='api_event_datetim_ec9874_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['updated_at'], name='api_event_updated_34a71e_idx'),
+        ),
+        migrations.AddField(
+            model_name='eventreminder',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='api.event'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='eventreminder',
+            unique_together={('event', 'reminder_type')},
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+def strip_old_contact_ids(apps, schema_editor):
+    """Strip the old IDs stored with surrounding whitespace (they are matched with exact IN lookups)"""
+    Contact = apps.get_model('api', 'Contact')
+    padded = Contact.objects.filter(old_contact_id__regex=r'^\s|\s$').values_list('id', 'old_contact_id')
+    contacts = []
+    for contact_id, old_contact_id in padded.iterator(chunk_size=1000):
+        contacts.append(Contact(id=contact_id, old_contact_id=old_contact_id.strip() or None))
+        if len(contacts) >= 1000:
+            Contact.objects.bulk_update(contacts, ['old_contact_id'])
+            contacts = []
+    if contacts:
+        Contact.objects.bulk_update(contacts, ['old_contact_id'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0116_contact_email_lower_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(strip_old_contact_ids, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,8 @@
 from django.db import models
+from django.db.models.fields.json import KeyTransform
+from django.db.models.functions import Lower
 from django.contrib.auth.models import User as DjangoUser
+from django.utils import timezone
 
 # Create your models here.
 class Source(models.Model):
@@ -103,10 +106,18 @@ class Contact(models.Model):
             models.Index(fields=['platform_id', '-created_at']),  # Optimize queries filtering by platform
             models.Index(fields=['fname', 'lname']),  # Optimize search queries
             models.Index(fields=['email']),  # Optimize email search
+            models.Index(Lower('email'), name='contact_email_lower_idx'),  # Case-insensitive duplicate checks (imports)
             models.Index(fields=['phone']),  # Optimize phone search
             models.Index(fields=['mobile']),  # Optimize mobile search
+            models.Index(fields=['old_contact_id']),  # Migration lookups and integration updates by old ID
             models.Index(fields=['-created_at']),  # Optimize ordering by created_at
         ]
+    
+    def save(self, *args, **kwargs):
+        # Old IDs are matched with exact (indexed) IN lookups: store them stripped
+        if self.old_contact_id is not None:
+            self.old_contact_id = str(self.old_contact_id).strip() or None
+        super().save(*args, **kwargs)
 
 class NoteCategory(models.Model):
     """Categories for notes"""
@@ -202,8 +213,10 @@ class Notification(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['user', '-created_at', '-id']),  # Notification feed (keyset pagination)
             models.Index(fields=['user', 'is_read']),
+            # Retention (prune_notifications): read notifications by age
+            models.Index(fields=['created_at'], condition=models.Q(is_read=True), name='notification_read_created_idx'),
         ]
     
     def __str__(self):
@@ -386,11 +399,33 @@ class Event(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['datetime']),  # Reminder scheduler range loads
+            models.Index(fields=['updated_at']),  # Reminder scheduler: events created or moved since the last load
+        ]
+
     def __str__(self):
         return f"Event {self.id} - {self.datetime}"
 
+class EventReminder(models.Model):
+    """Reminder sent for an event, one per event and reminder type (see api/utils/event_reminders.py)"""
+    id = models.CharField(max_length=12, default="", unique=True, primary_key=True)
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='reminders')
+    reminder_type = models.CharField(max_length=20)  # 5min_before, 10min_before, 30min_before
+    event_datetime = models.DateTimeField()  # Event time the reminder was sent for (a moved event gets a new reminder)
+    sent_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ['event', 'reminder_type']
+
+    def __str__(self):
+        return f"EventReminder {self.event_id} - {self.reminder_type}"
+
 class Log(models.Model):
     """Table for tracking all CRM activity logs"""
+    # On PostgreSQL the table is partitioned by created_at and its primary key is (id, created_at)
+    # (migration 0111); Django keeps id as the primary key, ids stay unique via new_id()
     id = models.CharField(max_length=12, default="", unique=True, primary_key=True)
     event_type = models.CharField(max_length=100, default="")  # createUser, editUser, createContact, etc.
     user_id = models.ForeignKey(DjangoUser, on_delete=models.SET_NULL, null=True, blank=True, related_name='activity_logs')
@@ -405,11 +440,32 @@ class Log(models.Model):
         indexes = [
             models.Index(fields=['contact_id', 'event_type', '-created_at']),  # Optimize previousStatus filter queries
             models.Index(fields=['event_type', '-created_at']),  # Optimize event_type queries
+            models.Index(fields=['contact_id', '-created_at', '-id']),  # Keyset pagination of contact_logs
+            # previousStatus / previousTeleoperator filters: JSON keys of the contact edit logs (partial, editContact only)
+            models.Index(KeyTransform('statusName', 'old_value'), name='log_edit_old_status_idx', condition=models.Q(event_type='editContact')),
+            models.Index(KeyTransform('statusName', 'new_value'), name='log_edit_new_status_idx', condition=models.Q(event_type='editContact')),
+            models.Index(KeyTransform('teleoperatorName', 'old_value'), name='log_edit_old_teleop_idx', condition=models.Q(event_type='editContact')),
         ]
 
     def __str__(self):
         return f"Log {self.id} - {self.event_type} - {self.created_at}"
 
+class LogArchive(models.Model):
+    """Month of logs moved out of the Log table to the archive storage (gzipped NDJSON, see api/utils/log_archive.py)"""
+    id = models.CharField(max_length=12, default="", unique=True, primary_key=True)
+    month = models.DateField(db_index=True)  # First day of the archived month (UTC)
+    source = models.CharField(max_length=63, default="")  # Detached partition, or 'rows' when the rows were deleted
+    storage_prefix = models.CharField(max_length=255)
+    buckets = models.JSONField(default=list, blank=True)  # Non-empty contact buckets (files) of the archive
+    row_count = models.IntegerField(default=0)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-month']
+
+    def __str__(self):
+        return f"LogArchive {self.id} - {self.month:%Y-%m} - {self.row_count} rows"
+
 class Document(models.Model):
     """Table for storing contact documents"""
     DOCUMENT_TYPES = [
@@ -706,4 +762,70 @@ class ContactView(models.Model):
         ]
     
     def __str__(self):
-        return f"ContactView {self.id} - {self.name} - {self.user.username}"
\ No newline at end of file
+        return f"ContactView {self.id} - {self.name} - {self.user.username}"
+
+class ImportJob(models.Model):
+    """Background import job - the uploaded file is processed by the import worker instead of the HTTP request"""
+    KIND_CHOICES = [
+        ('contacts', 'Contacts'),
+        ('notes', 'Notes'),
+        ('logs', 'Logs'),
+        ('integration_update', 'Integration update'),
+    ]
+
+    STATUS_CHOICES = [
+        ('uploading', 'Envoi en cours'),
+        ('pending', 'En attente'),
+        ('running', 'En cours'),
+        ('completed', 'Terminé'),
+        ('failed', 'Échoué'),
+    ]
+
+    id = models.CharField(max_length=12, default="", unique=True, primary_key=True)
+    user = models.ForeignKey(DjangoUser, on_delete=models.CASCADE, related_name='import_jobs')
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    file_name = models.CharField(max_length=255, default="", blank=True)  # Original upload name
+    file_path = models.CharField(max_length=500, default="", blank=True)  # Storage key of the uploaded file (prefix ending with / for chunked uploads)
+    params = models.JSONField(default=dict, blank=True)  # Form fields sent with the upload (columnMapping, defaults...)
+    request_meta = models.JSONField(default=dict, blank=True)  # IP / user agent headers, used for the bulk import log
+    total_rows = models.IntegerField(default=0)
+    processed_rows = models.IntegerField(default=0)
+    imported = models.IntegerField(default=0)
+    failed = models.IntegerField(default=0)
+    report = models.JSONField(default=dict, blank=True)  # Final results (errors, duplicates...)
+    error = models.TextField(default="", blank=True)
+    attempts = models.IntegerField(default=0)  # Number of times the job was picked up by a worker
+    checkpoint_row = models.IntegerField(default=0)  # Last file row whose batch is committed - a retried job resumes after it
+    checkpoint_imported = models.IntegerField(default=0)  # Rows imported up to checkpoint_row
+    checkpoint_failed = models.IntegerField(default=0)  # Rows failed up to checkpoint_row
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),  # Worker picks the oldest pending job
+            models.Index(fields=['user', '-created_at']),  # Optimize queries filtering by user
+        ]
+
+    def __str__(self):
+        return f"ImportJob {self.id} - {self.kind} - {self.status}"
+class EmailVerificationQueue(models.Model):
+    """Contacts waiting for a (re-)verification of their email domain by the email verification worker"""
+    id = models.CharField(max_length=12, default="", unique=True, primary_key=True)
+    contact = models.OneToOneField(Contact, on_delete=models.CASCADE, related_name='email_verification_queue')
+    attempts = models.IntegerField(default=0)  # Lookups that ended with not_verified (timeout, no nameservers...)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['next_attempt_at']
+        indexes = [
+            models.Index(fields=['next_attempt_at']),  # Worker picks the entries that are due
+        ]
+
+    def __str__(self):
+        return f"EmailVerificationQueue {self.id} - {self.contact_id} - attempts {self.attempts}"
@@ -1,8 +1,8 @@
 from django.contrib.auth.models import User as DjangoUser
 from rest_framework import serializers
-from .models import Contact, Note, NoteCategory, UserDetails, Team, Event, TeamMember, Log, Role, Permission, PermissionRole, Status, Source, Platform, Document, SMTPConfig, Email, EmailSignature, ChatRoom, Message, Notification, NotificationPreference, FosseSettings, Transaction, RIB, ContactView
+from .models import Contact, Note, NoteCategory, UserDetails, Team, Event, TeamMember, Log, Role, Permission, PermissionRole, Status, Source, Platform, Document, SMTPConfig, Email, EmailSignature, ChatRoom, Message, Notification, NotificationPreference, FosseSettings, Transaction, RIB, ContactView, ImportJob
 from django.db import transaction
-import uuid
+from .utils.ids import new_id
 
 class UserSerializer(serializers.ModelSerializer):
     first_name = serializers.CharField(write_only=True, required=False, allow_blank=True)
@@ -197,32 +197,8 @@ class UserSerializer(serializers.ModelSerializer):
                 user_details.save()
                 print(f"[DEBUG] UserDetails reactivated successfully: {user_details.id}")
             else:
-                # Generate a numeric UserDetails ID (str) incrementing from max existing one
-                # Ensure it's always 12 characters or less
-                max_id = 0
-                for id_val in UserDetails.objects.values_list('id', flat=True):
-                    try:
-                        int_id = int(id_val)
-                        if int_id > max_id:
-                            max_id = int_id
-                    except (ValueError, TypeError):
-                        continue
-                
-                # Generate new ID and ensure it doesn't exceed 12 characters
-                new_id = max_id + 1
-                user_details_id = str(new_id)
-                
-                # If the ID exceeds 12 characters, use a truncated UUID instead
-                if len(user_details_id) > 12:
-                    # Generate a unique 12-character ID
-                    while True:
-                        user_details_id = uuid.uuid4().hex[:12]
-                        if not UserDetails.objects.filter(id=user_details_id).exists():
-                            break
-                
-                # Ensure user_details_id is not empty
-                if not user_details_id:
-                    user_details_id = uuid.uuid4().hex[:12]
+                # Generate the UserDetails ID (no scan of the existing IDs)
+                user_details_id = new_id()
                 
                 # Create UserDetails entry for this user
                 # Use role_id directly instead of role property to avoid potential setter issues
@@ -258,9 +234,7 @@ class UserSerializer(serializers.ModelSerializer):
                     existing_team_member = TeamMember.objects.filter(user=user_details, team=team).first()
                     if not existing_team_member:
                         # Generate TeamMember ID
-                        team_member_id = uuid.uuid4().hex[:12]
-                        while TeamMember.objects.filter(id=team_member_id).exists():
-                            team_member_id = uuid.uuid4().hex[:12]
+                        team_member_id = new_id()
                         TeamMember.objects.create(
                             id=team_member_id,
                             user=user_details,
@@ -720,6 +694,51 @@ class ContactSerializer(serializers.ModelSerializer):
         
         return ret
 
+class ContactMigrationLookups:
+    """
+    Statuses, sources, platforms and users referenced by a migration payload,
+    fetched with one query per model instead of one query per row and field.
+    """
+    USER_FIELDS = ('teleoperatorId', 'confirmateurId', 'creatorId')
+    
+    def __init__(self, rows):
+        status_ids, source_ids, platform_ids, user_ids = set(), set(), set(), set()
+        for row in rows:
+            if not isinstance(row, dict):
+                continue
+            for field, ids in (('statusId', status_ids), ('sourceId', source_ids), ('platformId', platform_ids)):
+                if row.get(field):
+                    ids.add(str(row[field]).strip())
+            for field in self.USER_FIELDS:
+                if row.get(field):
+                    user_ids.add(str(row[field]).strip())
+        
+        self.statuses = {s.id: s for s in Status.objects.filter(id__in=status_ids)} if status_ids else {}
+        self.sources = {s.id: s for s in Source.objects.filter(id__in=source_ids)} if source_ids else {}
+        self.platforms = {p.id: p for p in Platform.objects.filter(id__in=platform_ids)} if platform_ids else {}
+        
+        # Users are referenced by UserDetails ID (what the frontend sends) or by Django User ID
+        self.users = {}
+        if user_ids:
+            for user_details in UserDetails.objects.filter(id__in=user_ids, django_user__isnull=False).select_related('django_user'):
+                self.users[str(user_details.id).strip()] = user_details.django_user
+            numeric_ids = {}
+            for user_id in user_ids - set(self.users):
+                try:
+                    numeric_ids[int(user_id)] = user_id
+                except (ValueError, TypeError):
+                    continue
+            if numeric_ids:
+                for user in DjangoUser.objects.filter(id__in=numeric_ids):
+                    self.users[numeric_ids[user.id]] = user
+    
+    def user(self, value):
+        """Django user referenced by a UserDetails ID or Django User ID, None if it does not exist"""
+        if value is None:
+            return None
+        return self.users.get(str(value).strip())
+
+
 class ContactMigrationSerializer(serializers.ModelSerializer):
     """
     Simplified serializer for contact migration/bulk import operations.
@@ -922,10 +941,7 @@ class ContactMigrationSerializer(serializers.ModelSerializer):
         
         # Generate ID if not provided
         if not validated_data.get('id'):
-            import uuid
-            contact_id = uuid.uuid4().hex[:12]
-            while Contact.objects.filter(id=contact_id).exists():
-                contact_id = uuid.uuid4().hex[:12]
+            contact_id = new_id()
             validated_data['id'] = contact_id
         
         return super().create(validated_data)
@@ -1332,6 +1348,22 @@ class LogSerializer(serializers.ModelSerializer):
         ret['oldLogs'] = instance.old_logs if instance.old_logs else None
         return ret
 
+class LogSummarySerializer(LogSerializer):
+    """Log without the details/oldValue/newValue JSON, for timelines (the full entry is fetched when expanded)"""
+    
+    class Meta(LogSerializer.Meta):
+        fields = ['id', 'eventType', 'userId', 'userName', 'contactId', 'createdAt']
+    
+    def to_representation(self, instance):
+        return {
+            'id': instance.id,
+            'eventType': instance.event_type,
+            'userId': instance.user_id.id if instance.user_id else None,
+            'userName': self.get_userName(instance),
+            'contactId': instance.contact_id.id if instance.contact_id else None,
+            'createdAt': instance.created_at,
+        }
+
 class SourceSerializer(serializers.ModelSerializer):
     createdAt = serializers.DateTimeField(source='created_at', read_only=True)
     updatedAt = serializers.DateTimeField(source='updated_at', read_only=True)
@@ -2382,9 +2414,25 @@ class ContactViewSerializer(serializers.ModelSerializer):
         validated_data.setdefault('column_order', [])
         
         # Generate unique ID
-        view_id = uuid.uuid4().hex[:12]
-        while ContactView.objects.filter(id=view_id).exists():
-            view_id = uuid.uuid4().hex[:12]
+        view_id = new_id()
         
         validated_data['id'] = view_id
         return super().create(validated_data)
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    """Serializer for ImportJob model (status polling and WebSocket progress)"""
+    userId = serializers.IntegerField(source='user.id', read_only=True)
+    fileName = serializers.CharField(source='file_name', read_only=True)
+    totalRows = serializers.IntegerField(source='total_rows', read_only=True)
+    processedRows = serializers.IntegerField(source='processed_rows', read_only=True)
+    startedAt = serializers.DateTimeField(source='started_at', read_only=True)
+    finishedAt = serializers.DateTimeField(source='finished_at', read_only=True)
+    createdAt = serializers.DateTimeField(source='created_at', read_only=True)
+    updatedAt = serializers.DateTimeField(source='updated_at', read_only=True)
+    checkpointRow = serializers.IntegerField(source='checkpoint_row', read_only=True)
+    
+    class Meta:
+        model = ImportJob
+        fields = ['id', 'userId', 'kind', 'status', 'fileName', 'totalRows', 'processedRows', 'imported', 'failed',
+                  'report', 'error', 'attempts', 'checkpointRow', 'startedAt', 'finishedAt', 'createdAt', 'updatedAt']
+        read_only_fields = fields
@@ -2,9 +2,8 @@ from django.db.models.signals import post_save
 from django.db.models import Q
 from django.dispatch import receiver
 from .models import Status, Role, Permission, PermissionRole, NotificationPreference, Notification
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
-import uuid
+from .utils.ids import new_id
+from .utils.notifications import count_created_notifications, push_notifications
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,11 +26,8 @@ ACTIONS = ['view', 'create', 'edit', 'delete']
 
 
 def generate_unique_id(model_class):
-    """Generate a unique 12-character ID for a model"""
-    while True:
-        new_id = uuid.uuid4().hex[:12]
-        if not model_class.objects.filter(id=new_id).exists():
-            return new_id
+    """Generate a unique 12-character ID for a model (time-sortable, no database check needed)"""
+    return new_id()
 
 
 @receiver(post_save, sender=Status)
@@ -158,6 +154,13 @@ def send_notification_via_websocket(sender, instance, created, **kwargs):
     if not created:
         return  # Only send for new notifications
     
+    try:
+        # Unread counter of the user (api/utils/notifications.py), event notifications included
+        count_created_notifications([instance])
+    except Exception as e:
+        # The counter is rebuilt from the table when it expires
+        logger.error(f"[send_notification_via_websocket] Error updating unread count of user {instance.user_id}: {str(e)}")
+    
     # Skip event notifications - they're handled by send_event_notification function
     if instance.type == 'event':
         return
@@ -167,40 +170,10 @@ def send_notification_via_websocket(sender, instance, created, **kwargs):
         return
     
     try:
-        channel_layer = get_channel_layer()
-        if not channel_layer:
-            logger.warning("[send_notification_via_websocket] No channel layer available")
-            return
-        
-        # Serialize notification data
-        notification_data = {
-            'id': instance.id,
-            'type': instance.type,
-            'title': instance.title,
-            'message': instance.message,
-            'message_id': instance.message_id if instance.message_id else None,
-            'email_id': instance.email_id if instance.email_id else None,
-            'contact_id': instance.contact_id if instance.contact_id else None,
-            'event_id': instance.event_id if instance.event_id else None,
-            'data': instance.data if instance.data else {},
-            'is_read': instance.is_read,
-            'created_at': instance.created_at.isoformat(),
-        }
-        
-        # Get unread count for this user
-        unread_count = Notification.objects.filter(user=instance.user, is_read=False).count()
-        
-        # Send via WebSocket
-        async_to_sync(channel_layer.group_send)(
-            f'notifications_{instance.user.id}',
-            {
-                'type': 'send_notification',
-                'notification': notification_data,
-                'unread_count': unread_count,
-            }
-        )
+        # Same payload and unread count as the bulk notifications (api/utils/notifications.py)
+        push_notifications([instance])
         
-        logger.info(f"[send_notification_via_websocket] Sent notification {instance.id} to user {instance.user.id}")
+        logger.info(f"[send_notification_via_websocket] Sent notification {instance.id} to user {instance.user_id}")
         
     except Exception as e:
         # Log but don't fail - notification is already saved in database
@@ -24,6 +24,12 @@ urlpatterns = [
     path('contacts/csv-import-preview/', api_views.csv_import_preview, name='csv-import-preview'),
     path('contacts/csv-import/', api_views.csv_import_contacts, name='csv-import-contacts'),
     path('contacts/integration-update/', api_views.contacts_integration_update, name='contacts-integration-update'),
+    path('imports/jobs/<str:job_id>/', api_views.import_job_detail, name='import-job-detail'),
+    path('imports/jobs/<str:job_id>/retry/', api_views.import_job_retry, name='import-job-retry'),
+    path('imports/uploads/', api_views.import_upload_create, name='import-upload-create'),
+    path('imports/uploads/<str:job_id>/', api_views.import_upload_detail, name='import-upload-detail'),
+    path('imports/uploads/<str:job_id>/parts/<int:part_number>/', api_views.import_upload_part, name='import-upload-part'),
+    path('imports/uploads/<str:job_id>/complete/', api_views.import_upload_complete, name='import-upload-complete'),
     path('contacts/migration/missing/', api_views.contacts_migration_missing, name='contacts-migration-missing'),
     path('contacts/by-old-ids/', api_views.contacts_by_old_ids, name='contacts-by-old-ids'),
     path('contacts/assigned-today-count/', api_views.contacts_assigned_today_count, name='contacts-assigned-today-count'),
@@ -32,6 +38,7 @@ urlpatterns = [
     path('contacts/<str:contact_id>/', api_views.contact_detail, name='contact-detail'),
     path('contacts/<str:contact_id>/delete/', api_views.contact_delete, name='contact-delete'),
     path('contacts/<str:contact_id>/logs/', api_views.contact_logs, name='contact-logs'),
+    path('contacts/<str:contact_id>/logs/<str:log_id>/', api_views.contact_log_detail, name='contact-log-detail'),
     path('contacts/<str:contact_id>/documents/', api_views.contact_documents, name='contact-documents'),
     # Documents endpoints
     path('documents/upload/', api_views.document_upload, name='document-upload'),
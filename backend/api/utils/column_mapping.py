@@ -0,0 +1,214 @@
+"""
+Column mapping resolver for CSV/Excel imports.
+
+The columnMapping sent by the frontend ({field: column name}) is resolved once
+against the file headers into positional indices, with one converter per
+field. Rows are then read as plain lists/tuples through the compiled plan
+instead of searching the matching header for every field of every row.
+"""
+import logging
+import re
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_column_name(name):
+    """Header/column name without surrounding spaces, quotes and case"""
+    return str(name).strip().replace('"', '').replace("'", '').lower()
+
+
+def resolve_column(headers, column):
+    """
+    Index of `column` in `headers` (None if not found).
+
+    Exact match first, then the same name with spaces, quotes and case ignored.
+    """
+    if not column:
+        return None
+    try:
+        return headers.index(column)
+    except ValueError:
+        pass
+    stripped_column = str(column).strip()
+    normalized_column = normalize_column_name(column)
+    for i, header in enumerate(headers):
+        if not header:
+            continue
+        if header.strip() == stripped_column or normalize_column_name(header) == normalized_column:
+            return i
+    return None
+
+
+def cell_text(value):
+    """Cell value as a stripped string ('' for empty cells)"""
+    if value is None:
+        return ''
+    return str(value).strip()
+
+
+def to_text(value):
+    """Text converter: stripped value, None when empty"""
+    return value or None
+
+
+def to_digits(value):
+    """Phone converter: digits only as an integer, None when there is no digit"""
+    digits = ''.join(c for c in value if '0' <= c <= '9')
+    return int(digits) if digits else None
+
+
+DATE_FORMATS = ['%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y', '%Y/%m/%d']
+
+DATETIME_FORMATS = [
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S.%f',
+    '%Y-%m-%dT%H:%M',
+    '%Y-%m-%d',
+    '%d/%m/%Y %H:%M:%S',
+    '%d/%m/%Y %H:%M',
+    '%d/%m/%Y',
+    '%m/%d/%Y %H:%M:%S',
+    '%m/%d/%Y %H:%M',
+    '%m/%d/%Y',
+]
+
+
+def _separators(text):
+    """Non-digit characters of a value, whitespace runs collapsed (e.g. '31/12/2020 10:00' -> '// :')"""
+    return ' '.join(''.join(c for c in part if not '0' <= c <= '9') for part in text.split()).upper()
+
+
+class FormatParser:
+    """
+    Date/datetime converter trying a list of strptime formats, in order.
+
+    Only the formats whose separators are the same as the value's are tried
+    (a value like '31/12/2020 10:00' can never match '%Y-%m-%d'), which skips
+    most of the failing strptime calls without changing which format wins.
+    Instances are picklable (they can be used in worker processes).
+    """
+
+    def __init__(self, formats, as_date=False):
+        self.formats = list(formats)
+        self.as_date = as_date
+        self._format_separators = [_separators(re.sub(r'%.', '', fmt)) for fmt in self.formats]
+        self._candidates = {}  # value separators -> formats that can match
+
+    def __call__(self, value):
+        separators = _separators(value)
+        candidates = self._candidates.get(separators)
+        if candidates is None:
+            candidates = [
+                fmt for fmt, fmt_separators in zip(self.formats, self._format_separators)
+                if fmt_separators == separators
+            ]
+            self._candidates[separators] = candidates
+        for fmt in candidates:
+            try:
+                parsed = datetime.strptime(value, fmt)
+            except ValueError:
+                continue
+            return parsed.date() if self.as_date else parsed
+        return None
+
+
+# Date converter: first matching format of DATE_FORMATS, None when no format matches
+to_date = FormatParser(DATE_FORMATS, as_date=True)
+
+# Datetime converter: first matching format of DATETIME_FORMATS, None when no format matches.
+# The result is naive (no Django settings needed, so it can run in a worker process):
+# make it aware with django.utils.timezone.make_aware before saving it.
+to_naive_datetime = FormatParser(DATETIME_FORMATS)
+
+
+class ColumnMappingPlan:
+    """
+    Compiled column mapping.
+
+    Args:
+        headers: Column names of the file, in file order
+        column_mapping: {field: column name} (a list of column names is allowed
+            for the fields in `multi_column_fields`, their values are joined with line breaks)
+        converters: {field: callable(str) -> value or None}, to_text by default
+        multi_column_fields: Fields that can be mapped to several columns
+    """
+
+    def __init__(self, headers, column_mapping, converters=None, multi_column_fields=()):
+        self.headers = list(headers)
+        converters = converters or {}
+        self.indices = {}  # field -> index, or list of indices for multi-column fields
+        self.missing = []  # (field, column) not found in the headers
+        self.fields = []  # (field, index or indices, is_multi, converter)
+
+        for field, column in (column_mapping or {}).items():
+            if not column:
+                continue
+            converter = converters.get(field, to_text)
+            if field in multi_column_fields and isinstance(column, list):
+                indices = []
+                for col in column:
+                    if not col:
+                        continue
+                    index = resolve_column(self.headers, col)
+                    if index is None:
+                        self.missing.append((field, col))
+                    else:
+                        indices.append(index)
+                if indices:
+                    self.indices[field] = indices
+                    self.fields.append((field, indices, True, converter))
+                continue
+            if isinstance(column, list):
+                continue
+            index = resolve_column(self.headers, column)
+            if index is None:
+                self.missing.append((field, column))
+                continue
+            self.indices[field] = index
+            self.fields.append((field, index, False, converter))
+
+    def __contains__(self, field):
+        return field in self.indices
+
+    def get(self, row, field):
+        """Raw value of a single-column field in a row (None if the field is not mapped or the row is short)"""
+        index = self.indices.get(field)
+        if index is None or isinstance(index, list) or index >= len(row):
+            return None
+        value = row[index]
+        return '' if value is None else str(value)
+
+    def apply_tuple(self, row):
+        """Convert a row into a tuple of values in self.fields order (None for empty or invalid values)"""
+        values = []
+        row_length = len(row)
+        for field, index, is_multi, converter in self.fields:
+            if is_multi:
+                text = '\n'.join(
+                    cell for cell in (cell_text(row[i]) for i in index if i < row_length) if cell
+                )
+            elif index < row_length:
+                text = cell_text(row[index])
+            else:
+                text = ''
+            values.append(converter(text) if text else None)
+        return tuple(values)
+
+    def to_dict(self, values):
+        """{field: value} from an apply_tuple() result, leaving out the empty values"""
+        return {
+            field_info[0]: value
+            for field_info, value in zip(self.fields, values)
+            if value is not None
+        }
+
+    def apply(self, row):
+        """Convert a row into {field: value}, leaving out fields whose value is empty or invalid"""
+        return self.to_dict(self.apply_tuple(row))
+
+    def log_missing(self, context):
+        for field, column in self.missing:
+            logger.warning(f"{context}: column '{column}' mapped to '{field}' not found. Available columns: {self.headers[:10]}")
@@ -0,0 +1,188 @@
+"""
+Bulk loader and timestamp restore for imports.
+
+On PostgreSQL, objects are streamed with COPY FROM STDIN into a temporary
+staging table and merged into the real table with a single INSERT ... SELECT,
+which avoids building multi-row INSERT statements. Other databases (SQLite in
+local development) use bulk_create.
+
+Field values are prepared the same way bulk_create does (pre_save, so
+auto_now/auto_now_add are applied, then get_db_prep_save), and a failure
+raises the same IntegrityError, so callers keep their existing error handling.
+
+restore_timestamps() writes historical created_at/updated_at values back after
+the insert (auto_now/auto_now_add override them) with one set-based UPDATE per
+batch.
+"""
+import io
+import json
+import uuid
+import logging
+from datetime import date, datetime, time
+
+from django.db import connection, models, transaction
+
+logger = logging.getLogger(__name__)
+
+COPY_NULL = '\\N'
+
+
+def _copy_escape(text):
+    return (
+        text.replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+def _copy_value(field, value):
+    """Format a prepared field value for COPY text format"""
+    if value is None:
+        return COPY_NULL
+    if isinstance(field, models.JSONField):
+        return _copy_escape(json.dumps(value, cls=field.encoder))
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return _copy_escape(str(value))
+
+
+class _CopyStream(io.RawIOBase):
+    """File-like object producing the COPY data lazily from an iterator of lines"""
+
+    def __init__(self, lines):
+        self._lines = lines
+        self._buffer = b''
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._lines).encode('utf-8')
+            except StopIteration:
+                break
+        if size < 0:
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _copy_lines(fields, objs):
+    for obj in objs:
+        values = []
+        for field in fields:
+            value = field.pre_save(obj, True)
+            if not isinstance(field, models.JSONField):
+                # JSON values are serialized by _copy_value, get_db_prep_save would wrap them in a driver adapter
+                value = field.get_db_prep_save(value, connection)
+            values.append(_copy_value(field, value))
+        yield '\t'.join(values) + '\n'
+
+
+def copy_supported(model):
+    """COPY is used on PostgreSQL for models whose primary key is set by the application"""
+    return connection.vendor == 'postgresql' and not isinstance(model._meta.pk, models.AutoField)
+
+
+def copy_insert(model, objs):
+    """Insert objs with COPY into a staging table + INSERT ... SELECT (PostgreSQL only)"""
+    objs = list(objs)
+    if not objs:
+        return objs
+
+    fields = [field for field in model._meta.concrete_fields]
+    table = connection.ops.quote_name(model._meta.db_table)
+    staging = connection.ops.quote_name(f"import_staging_{uuid.uuid4().hex[:12]}")
+    columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+
+    # Savepoint: a failed load (e.g. primary key collision) leaves the outer transaction usable
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f"CREATE TEMPORARY TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP")
+            cursor.cursor.copy_expert(
+                f"COPY {staging} ({columns}) FROM STDIN",
+                _CopyStream(_copy_lines(fields, objs)),
+            )
+            cursor.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging}")
+            cursor.execute(f"DROP TABLE {staging}")
+
+    for obj in objs:
+        obj._state.adding = False
+        obj._state.db = connection.alias
+    return objs
+
+
+def bulk_insert(model, objs, batch_size=1000):
+    """
+    Insert objs in the database: COPY fast path on PostgreSQL, bulk_create otherwise.
+
+    Returns the inserted objects.
+    """
+    if copy_supported(model):
+        return copy_insert(model, objs)
+    return model.objects.bulk_create(objs, batch_size=batch_size)
+
+
+def restore_timestamps(model, rows, fields=('created_at',), batch_size=1000):
+    """
+    Set timestamp fields on already inserted rows, without per-row queries.
+
+    Args:
+        model: Model class
+        rows: Iterable of (pk, {field: value}) - fields missing or None keep their current value
+        fields: Fields that can be restored
+        batch_size: Rows per UPDATE statement
+
+    PostgreSQL: one UPDATE ... FROM (VALUES ...) per batch. Other databases: bulk_update
+    per batch, grouped by the set of fields present.
+    """
+    rows = [
+        (pk, {field: value for field, value in values.items() if field in fields and value is not None})
+        for pk, values in rows
+    ]
+    rows = [(pk, values) for pk, values in rows if values]
+    if not rows:
+        return 0
+
+    if connection.vendor != 'postgresql':
+        by_fields = {}
+        for pk, values in rows:
+            by_fields.setdefault(tuple(sorted(values)), []).append(model(pk=pk, **values))
+        for field_names, objs in by_fields.items():
+            model.objects.bulk_update(objs, list(field_names), batch_size=batch_size)
+        return len(rows)
+
+    opts = model._meta
+    model_fields = [opts.get_field(field) for field in fields]
+    table = connection.ops.quote_name(opts.db_table)
+    pk_column = connection.ops.quote_name(opts.pk.column)
+    value_columns = ', '.join(connection.ops.quote_name(field.column) for field in model_fields)
+    assignments = ', '.join(
+        f"{connection.ops.quote_name(field.column)} = COALESCE(v.{connection.ops.quote_name(field.column)}, t.{connection.ops.quote_name(field.column)})"
+        for field in model_fields
+    )
+    placeholder = '(' + ', '.join(
+        [f"%s::{opts.pk.db_type(connection)}"] + [f"%s::{field.db_type(connection)}" for field in model_fields]
+    ) + ')'
+
+    with connection.cursor() as cursor:
+        for i in range(0, len(rows), batch_size):
+            batch = rows[i:i + batch_size]
+            params = []
+            for pk, values in batch:
+                params.append(pk)
+                for field in model_fields:
+                    value = values.get(field.name)
+                    params.append(field.get_db_prep_save(value, connection) if value is not None else None)
+            cursor.execute(
+                f"UPDATE {table} AS t SET {assignments} "
+                f"FROM (VALUES {', '.join([placeholder] * len(batch))}) AS v({pk_column}, {value_columns}) "
+                f"WHERE t.{pk_column} = v.{pk_column}",
+                params,
+            )
+    return len(rows)
@@ -1,8 +1,17 @@
 """
 Email verification utility using DNS MX record check
+
+Results are cached per domain (positive and negative answers) so a bulk import
+only resolves each distinct domain once, and verify_email_domains() resolves
+the uncached domains of a whole batch concurrently.
 """
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 import dns.resolver
-from typing import Tuple, Optional
+from typing import Dict, Iterable, Tuple, Optional
 
 # Email verification status choices
 EMAIL_VERIFICATION_STATUS_CHOICES = [
@@ -11,86 +20,216 @@ EMAIL_VERIFICATION_STATUS_CHOICES = [
     ('invalid', 'Invalid'),
 ]
 
-def verify_email_domain(email: str, timeout: int = 5) -> Tuple[str, Optional[str]]:
-    """
-    Verify if email domain has MX records (accepts email)
-    
-    Args:
-        email: Email address to verify
-        timeout: DNS query timeout in seconds
-        
-    Returns:
-        Tuple of (status, message)
-        status: 'valid', 'invalid', or 'not_verified'
-        message: Human-readable message (None if valid)
-    """
+# Domain cache configuration
+DOMAIN_CACHE_MAX_SIZE = 10000
+DOMAIN_CACHE_TTL_VALID = 6 * 3600  # Domains with MX records
+DOMAIN_CACHE_TTL_INVALID = 3600  # Domains without MX records / not existing
+# 'not_verified' (timeouts, no nameservers...) is transient and never cached
+
+# Maximum number of DNS lookups running at the same time for a batch
+MAX_CONCURRENT_LOOKUPS = 16
+
+
+class DomainCache:
+    """Thread-safe LRU cache of (status, message) per domain, with a TTL per entry"""
+
+    def __init__(self, max_size=DOMAIN_CACHE_MAX_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, domain):
+        with self._lock:
+            entry = self._entries.get(domain)
+            if entry is None:
+                return None
+            expires_at, result = entry
+            if expires_at < time.monotonic():
+                del self._entries[domain]
+                return None
+            self._entries.move_to_end(domain)
+            return result
+
+    def set(self, domain, result, ttl):
+        with self._lock:
+            self._entries[domain] = (time.monotonic() + ttl, result)
+            self._entries.move_to_end(domain)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+domain_cache = DomainCache()
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def _get_resolver():
+    """Resolver shared by all lookups (reading /etc/resolv.conf once)"""
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = dns.resolver.Resolver()
+    return _resolver
+
+
+def _extract_domain(email):
+    """Return (domain, None) or (None, (status, message)) when the email cannot be checked"""
     if not email or not isinstance(email, str):
-        return 'not_verified', None
-    
+        return None, ('not_verified', None)
+
     email = email.strip()
     if not email:
-        return 'not_verified', None
-    
+        return None, ('not_verified', None)
+
+    if '@' not in email:
+        return None, ('invalid', 'Invalid email format')
+
+    domain = email.split('@')[1].strip().lower()
+    if not domain:
+        return None, ('invalid', 'Invalid email format')
+
+    return domain, None
+
+
+def _lookup_domain(domain: str, timeout: float) -> Tuple[str, Optional[str]]:
+    """DNS MX lookup for a domain (no cache)"""
+    resolver = _get_resolver()
     try:
-        # Extract domain from email
-        if '@' not in email:
-            return 'invalid', 'Invalid email format'
-        
-        domain = email.split('@')[1]
-        if not domain:
-            return 'invalid', 'Invalid email format'
-        
-        # Check MX records
+        mx_records = resolver.resolve(domain, 'MX', lifetime=timeout)
+
+        # Check if mx_records exists and has records
+        # mx_records is a dns.resolver.Answer object, which supports len()
+        if mx_records is None:
+            return 'invalid', 'Domain does not accept email (no MX records)'
+
+        # Safely get the length
         try:
-            resolver = dns.resolver.Resolver()
-            resolver.timeout = timeout
-            resolver.lifetime = timeout
-            mx_records = resolver.resolve(domain, 'MX')
-            
-            # Check if mx_records exists and has records
-            # mx_records is a dns.resolver.Answer object, which supports len()
-            if mx_records is None:
-                return 'invalid', 'Domain does not accept email (no MX records)'
-            
-            # Safely get the length
+            record_count = len(mx_records)
+            if isinstance(record_count, int) and record_count > 0:
+                return 'valid', None
+        except (TypeError, AttributeError):
+            # If len() fails, try to iterate to check if there are records
             try:
-                record_count = len(mx_records)
-                if isinstance(record_count, int) and record_count > 0:
+                if any(True for _ in mx_records):
                     return 'valid', None
-            except (TypeError, AttributeError):
-                # If len() fails, try to iterate to check if there are records
-                try:
-                    if any(True for _ in mx_records):
-                        return 'valid', None
-                except:
-                    pass
-            
-            return 'invalid', 'Domain does not accept email (no MX records)'
-                
-        except dns.resolver.NXDOMAIN:
-            return 'invalid', 'Domain does not exist'
-        except dns.resolver.NoAnswer:
-            # Some domains might use A records for email (rare but possible)
-            # Try to check if domain exists at least
-            try:
-                resolver.resolve(domain, 'A')
-                return 'invalid', 'Domain exists but does not accept email (no MX records)'
             except:
-                return 'invalid', 'Domain does not exist'
-        except dns.resolver.Timeout:
-            return 'not_verified', 'DNS query timeout'
-        except dns.resolver.NoNameservers:
-            return 'not_verified', 'No nameservers found'
-        except Exception as e:
-            # Log the error but don't fail - return not_verified
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.warning(f"Email verification error for {email}: {str(e)}")
-            return 'not_verified', f'DNS lookup error: {str(e)}'
-            
+                pass
+
+        return 'invalid', 'Domain does not accept email (no MX records)'
+
+    except dns.resolver.NXDOMAIN:
+        return 'invalid', 'Domain does not exist'
+    except dns.resolver.NoAnswer:
+        # Some domains might use A records for email (rare but possible)
+        # Try to check if domain exists at least
+        try:
+            resolver.resolve(domain, 'A', lifetime=timeout)
+            return 'invalid', 'Domain exists but does not accept email (no MX records)'
+        except:
+            return 'invalid', 'Domain does not exist'
+    except dns.resolver.Timeout:
+        return 'not_verified', 'DNS query timeout'
+    except dns.resolver.NoNameservers:
+        return 'not_verified', 'No nameservers found'
+    except Exception as e:
+        # Log the error but don't fail - return not_verified
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.warning(f"Email verification error for domain {domain}: {str(e)}")
+        return 'not_verified', f'DNS lookup error: {str(e)}'
+
+
+def verify_domain(domain: str, timeout: float = 5) -> Tuple[str, Optional[str]]:
+    """
+    Verify a domain, using the domain cache
+
+    Returns:
+        Tuple of (status, message) - see verify_email_domain
+    """
+    cached = domain_cache.get(domain)
+    if cached is not None:
+        return cached
+
+    try:
+        result = _lookup_domain(domain, timeout)
     except Exception as e:
         import logging
         logger = logging.getLogger(__name__)
-        logger.error(f"Unexpected error during email verification for {email}: {str(e)}")
+        logger.error(f"Unexpected error during email verification for domain {domain}: {str(e)}")
         return 'not_verified', f'Error: {str(e)}'
 
+    if result[0] == 'valid':
+        domain_cache.set(domain, result, DOMAIN_CACHE_TTL_VALID)
+    elif result[0] == 'invalid':
+        domain_cache.set(domain, result, DOMAIN_CACHE_TTL_INVALID)
+    return result
+
+
+def verify_email_domain(email: str, timeout: int = 5) -> Tuple[str, Optional[str]]:
+    """
+    Verify if email domain has MX records (accepts email)
+
+    Args:
+        email: Email address to verify
+        timeout: DNS query timeout in seconds
+
+    Returns:
+        Tuple of (status, message)
+        status: 'valid', 'invalid', or 'not_verified'
+        message: Human-readable message (None if valid)
+    """
+    domain, result = _extract_domain(email)
+    if result is not None:
+        return result
+    return verify_domain(domain, timeout)
+
+
+def verify_email_domains(emails: Iterable[str], timeout: float = 5, max_workers: int = MAX_CONCURRENT_LOOKUPS) -> Dict[str, Tuple[str, Optional[str]]]:
+    """
+    Verify a batch of emails, resolving each distinct uncached domain once and concurrently
+
+    Args:
+        emails: Email addresses to verify
+        timeout: DNS query timeout in seconds (per domain)
+        max_workers: Maximum number of concurrent DNS lookups
+
+    Returns:
+        Dict mapping each email to its (status, message) tuple
+    """
+    results = {}
+    emails_by_domain = {}
+    for email in emails:
+        if email in results:
+            continue
+        domain, result = _extract_domain(email)
+        if result is not None:
+            results[email] = result
+        else:
+            emails_by_domain.setdefault(domain, []).append(email)
+
+    domain_results = {}
+    to_lookup = []
+    for domain in emails_by_domain:
+        cached = domain_cache.get(domain)
+        if cached is not None:
+            domain_results[domain] = cached
+        else:
+            to_lookup.append(domain)
+
+    if len(to_lookup) == 1:
+        domain_results[to_lookup[0]] = verify_domain(to_lookup[0], timeout)
+    elif to_lookup:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(to_lookup))) as executor:
+            for domain, result in zip(to_lookup, executor.map(lambda d: verify_domain(d, timeout), to_lookup)):
+                domain_results[domain] = result
+
+    for domain, domain_emails in emails_by_domain.items():
+        for email in domain_emails:
+            results[email] = domain_results[domain]
+    return results
@@ -0,0 +1,152 @@
+"""
+Background email verification queue.
+
+Contacts are enqueued when they are created or their email changes (and by
+imports for rows whose domain could not be verified). The worker
+(`python manage.py process_email_verifications`) verifies due entries in
+batches, grouped by domain, so list views never wait on DNS. A status is only
+written while the contact still has the email that was verified: an entry
+whose email changed meanwhile stays queued for the new address.
+"""
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from api.models import Contact, EmailVerificationQueue
+from api.utils.email_verification import verify_email_domains, domain_cache
+from api.utils.ids import new_ids
+
+logger = logging.getLogger(__name__)
+
+# Entries processed per worker iteration
+VERIFICATION_BATCH_SIZE = 500
+
+# DNS timeout used by the worker (it does not block any request, so it can be longer than in imports)
+VERIFICATION_TIMEOUT = 5
+
+# Lookups ending with not_verified are retried with an exponential backoff, then dropped
+MAX_VERIFICATION_ATTEMPTS = 6
+RETRY_BASE_DELAY = timedelta(minutes=5)
+RETRY_MAX_DELAY = timedelta(hours=12)
+
+
+def cached_email_status(email):
+    """Status of the email domain if it is already in the domain cache, else None (no DNS query)"""
+    if not email or '@' not in email:
+        return None
+    domain = email.strip().split('@')[1].strip().lower()
+    cached = domain_cache.get(domain) if domain else None
+    return cached[0] if cached else None
+
+
+def enqueue_email_verification(contact_ids):
+    """Add contacts to the verification queue (contacts already queued are left as they are)"""
+    contact_ids = [contact_id for contact_id in contact_ids if contact_id]
+    if not contact_ids:
+        return 0
+    now = timezone.now()
+    entries = [
+        EmailVerificationQueue(id=entry_id, contact_id=contact_id, next_attempt_at=now)
+        for entry_id, contact_id in zip(new_ids(len(contact_ids)), contact_ids)
+    ]
+    EmailVerificationQueue.objects.bulk_create(entries, batch_size=1000, ignore_conflicts=True)
+    return len(entries)
+
+
+def enqueue_unverified_contacts(batch_size=5000):
+    """Queue every contact with an email still in not_verified status (backfill)"""
+    queued = 0
+    contact_ids = (
+        Contact.objects.filter(email_verification_status='not_verified', email_verification_queue__isnull=True)
+        .exclude(email='')
+        .values_list('id', flat=True)
+    )
+    batch = []
+    for contact_id in contact_ids.iterator(chunk_size=batch_size):
+        batch.append(contact_id)
+        if len(batch) >= batch_size:
+            queued += enqueue_email_verification(batch)
+            batch = []
+    queued += enqueue_email_verification(batch)
+    return queued
+
+
+def _retry_delay(attempts):
+    return min(RETRY_BASE_DELAY * (2 ** (attempts - 1)), RETRY_MAX_DELAY)
+
+
+def process_email_verification_batch(batch_size=VERIFICATION_BATCH_SIZE, timeout=VERIFICATION_TIMEOUT):
+    """
+    Verify one batch of due queue entries.
+
+    Returns a dict with the number of processed entries and the resulting statuses.
+    """
+    now = timezone.now()
+    entries = list(
+        EmailVerificationQueue.objects.filter(next_attempt_at__lte=now)
+        .select_related('contact')
+        .order_by('next_attempt_at')[:batch_size]
+    )
+    stats = {'processed': len(entries), 'valid': 0, 'invalid': 0, 'retried': 0, 'dropped': 0, 'requeued': 0}
+    if not entries:
+        return stats
+
+    # verify_email_domains groups the emails by domain and resolves each domain once
+    emails = [entry.contact.email.strip() for entry in entries if entry.contact.email and entry.contact.email.strip()]
+    verification_results = verify_email_domains(emails, timeout=timeout) if emails else {}
+
+    # (entry id, email read with it): entries leaving the queue, kept if the email changed meanwhile
+    entries_to_delete = []
+    entries_to_retry = []
+    entries_to_requeue = []
+    with transaction.atomic():
+        for entry in entries:
+            contact = entry.contact
+            email = (contact.email or '').strip()
+            if not email:
+                # Nothing to verify anymore (email removed since the contact was queued)
+                entries_to_delete.append((entry.id, contact.email))
+                continue
+
+            verification_status = verification_results.get(email, ('not_verified', None))[0]
+            if verification_status in ('valid', 'invalid'):
+                stats[verification_status] += 1
+                # Only if the contact still has the verified email: the entry queued for a new address
+                # was dropped by ignore_conflicts, this entry has to verify it
+                updated = Contact.objects.filter(id=contact.id, email=contact.email).update(
+                    email_verification_status=verification_status
+                )
+                if updated:
+                    entries_to_delete.append((entry.id, contact.email))
+                else:
+                    entries_to_requeue.append(entry.id)
+                continue
+
+            entry.attempts += 1
+            if entry.attempts >= MAX_VERIFICATION_ATTEMPTS:
+                stats['dropped'] += 1
+                entries_to_delete.append((entry.id, contact.email))
+            else:
+                stats['retried'] += 1
+                entry.next_attempt_at = now + _retry_delay(entry.attempts)
+                entries_to_retry.append(entry)
+
+        if entries_to_retry:
+            EmailVerificationQueue.objects.bulk_update(entries_to_retry, ['attempts', 'next_attempt_at'], batch_size=1000)
+        if entries_to_requeue:
+            EmailVerificationQueue.objects.filter(id__in=entries_to_requeue).update(attempts=0, next_attempt_at=now)
+        for entry_id, email in entries_to_delete:
+            deleted, _ = EmailVerificationQueue.objects.filter(id=entry_id, contact__email=email).delete()
+            if not deleted:
+                entries_to_requeue.append(entry_id)
+                EmailVerificationQueue.objects.filter(id=entry_id).update(attempts=0, next_attempt_at=now)
+    stats['requeued'] = len(entries_to_requeue)
+
+    logger.info(
+        f"[EmailVerification] Processed {stats['processed']} entries: {stats['valid']} valid, "
+        f"{stats['invalid']} invalid, {stats['retried']} retried, {stats['dropped']} dropped, "
+        f"{stats['requeued']} requeued (email changed)"
+    )
+    return stats
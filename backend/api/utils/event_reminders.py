@@ -0,0 +1,170 @@
+"""
+Event reminder scheduler.
+
+The scheduler (run_event_reminders command, a long-running process) keeps the
+reminders of the upcoming events in a heap ordered by the time they are due:
+
+- the events entering the lookahead window are loaded incrementally with a
+  range query on Event.datetime, from where the previous load stopped;
+- the events created or moved since the previous load are found with
+  Event.updated_at and (re)scheduled;
+- the process sleeps until the next reminder is due (or the next load) and
+  sends it at its offset before the event.
+
+Each reminder is claimed through EventReminder, unique per (event,
+reminder_type), before being sent: a reminder is never sent twice, even with
+several schedulers or after a restart, except when the event is moved to
+another time. Reminders due while the scheduler was down are sent as soon as
+it starts if the event has not started yet.
+"""
+import heapq
+import logging
+import time
+from datetime import timedelta
+
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Reminder type -> minutes before the event (send_event_notification also knows 10min_before and 30min_before)
+REMINDER_OFFSETS = {
+    '5min_before': 5,
+}
+
+# Events loaded ahead of their first reminder
+LOOKAHEAD = timedelta(minutes=30)
+
+# Seconds between two loads (new or moved events are picked up within this delay)
+REFRESH_SECONDS = 30
+
+
+def claim_reminder(event, reminder_type):
+    """Record the reminder of an event, returns False if it was already sent for the event's current time"""
+    from api.models import EventReminder
+    from api.utils.ids import new_id
+
+    try:
+        with transaction.atomic():
+            EventReminder.objects.create(
+                id=new_id(),
+                event=event,
+                reminder_type=reminder_type,
+                event_datetime=event.datetime,
+            )
+        return True
+    except IntegrityError:
+        # Already sent, unless the event was moved since
+        return bool(
+            EventReminder.objects.filter(event=event, reminder_type=reminder_type)
+            .exclude(event_datetime=event.datetime)
+            .update(event_datetime=event.datetime, sent_at=timezone.now())
+        )
+
+
+class ReminderScheduler:
+    """Heap of the upcoming reminders of one process (see module docstring)"""
+
+    def __init__(self, offsets=None, lookahead=LOOKAHEAD, refresh_seconds=REFRESH_SECONDS):
+        self.offsets = dict(offsets or REMINDER_OFFSETS)
+        self.lookahead = lookahead
+        self.refresh_seconds = refresh_seconds
+        self.max_offset = timedelta(minutes=max(self.offsets.values()))
+        self._heap = []
+        # (event id, reminder type) -> event time of the queued reminder (older heap entries are stale)
+        self._scheduled = {}
+        self._loaded_until = None
+        self._changes_since = None
+        self.sent = 0
+
+    def _schedule(self, event_id, event_datetime, now):
+        if event_datetime <= now:
+            return
+        for reminder_type, minutes in self.offsets.items():
+            key = (event_id, reminder_type)
+            if self._scheduled.get(key) == event_datetime:
+                continue
+            self._scheduled[key] = event_datetime
+            fire_at = event_datetime - timedelta(minutes=minutes)
+            heapq.heappush(self._heap, (fire_at, event_id, reminder_type, event_datetime))
+
+    def load(self, now):
+        """Queue the events entering the window and the events created or moved since the last load"""
+        from api.models import Event
+
+        horizon = now + self.max_offset + self.lookahead
+        start = self._loaded_until or now
+        events = Event.objects.filter(datetime__gt=start, datetime__lte=horizon).order_by('datetime')
+        for event_id, event_datetime in events.values_list('id', 'datetime'):
+            self._schedule(event_id, event_datetime, now)
+
+        if self._changes_since is not None:
+            changed = Event.objects.filter(
+                updated_at__gte=self._changes_since,
+                datetime__gt=now,
+                datetime__lte=horizon,
+            )
+            for event_id, event_datetime in changed.values_list('id', 'datetime'):
+                self._schedule(event_id, event_datetime, now)
+
+        self._loaded_until = max(horizon, self._loaded_until or horizon)
+        # Overlap the next change query a little: updated_at comes from the web processes' clocks
+        self._changes_since = now - timedelta(seconds=self.refresh_seconds)
+
+    def next_due(self):
+        return self._heap[0][0] if self._heap else None
+
+    def run_pending(self, now):
+        """Send the reminders due at `now`, returns the number sent"""
+        sent = 0
+        while self._heap and self._heap[0][0] <= now:
+            _fire_at, event_id, reminder_type, event_datetime = heapq.heappop(self._heap)
+            key = (event_id, reminder_type)
+            if self._scheduled.get(key) != event_datetime:
+                continue  # Superseded by a newer entry (event moved)
+            del self._scheduled[key]
+            try:
+                if self._send(event_id, reminder_type, event_datetime, now):
+                    sent += 1
+            except Exception:
+                logger.exception(f"Could not send the {reminder_type} reminder of event {event_id}")
+        self.sent += sent
+        return sent
+
+    def _send(self, event_id, reminder_type, event_datetime, now):
+        from api.models import Event
+        from api.views import send_event_notification
+
+        event = Event.objects.select_related('userId', 'contactId').filter(id=event_id).first()
+        # Deleted, moved (queued again by the next load) or already started
+        if event is None or event.datetime != event_datetime or event.datetime <= now:
+            return False
+        if not event.userId or not claim_reminder(event, reminder_type):
+            return False
+        send_event_notification(event, notification_type=reminder_type, minutes_before=self.offsets[reminder_type])
+        logger.info(f"Sent {reminder_type} reminder for event {event.id} to user {event.userId.id}")
+        return True
+
+    def run_once(self):
+        """Send the reminders due now (catch-up of a scheduler that was not running)"""
+        now = timezone.now()
+        self.load(now)
+        return self.run_pending(now)
+
+    def run_forever(self):
+        next_load = None
+        while True:
+            close_old_connections()
+            now = timezone.now()
+            if next_load is None or now >= next_load:
+                self.load(now)
+                next_load = now + timedelta(seconds=self.refresh_seconds)
+            self.run_pending(now)
+
+            wake_at = next_load
+            next_due = self.next_due()
+            if next_due is not None and next_due < wake_at:
+                wake_at = next_due
+            delay = (wake_at - timezone.now()).total_seconds()
+            if delay > 0:
+                time.sleep(delay)
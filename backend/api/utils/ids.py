@@ -0,0 +1,130 @@
+"""
+12-character, time-sortable IDs generated without database round trips.
+
+Snowflake-style layout (62 bits) encoded in base 36 (0-9a-z, zero padded, so
+the IDs sort in creation order as strings):
+
+    41 bits  milliseconds since ID_EPOCH (until 2094)
+     8 bits  node: identifies the process generating the IDs
+    13 bits  sequence within the millisecond
+
+Within a process the (timestamp, sequence) pair never repeats: the sequence is
+incremented under a lock and, once exhausted (or if the clock goes backwards),
+the timestamp is taken from the last issued ID. Processes get a random node
+(new one after fork, so forked workers do not share it) unless settings.ID_NODE
+pins it.
+
+Random nodes can be shared (about 6% of the time with 6 processes), so the
+sequence of each millisecond starts at a random offset in the lower half of the
+range (at least 4096 IDs per ms and process): two processes sharing a node and
+a millisecond only collide if their sequence ranges overlap as well (about 1 in
+2 million for two single IDs). Set a distinct ID_NODE per process to rule out
+collisions entirely. The IDs fit the existing CharField(max_length=12) primary
+keys next to the older uuid4().hex[:12] values.
+"""
+import os
+import random
+import threading
+import time
+
+ID_LENGTH = 12
+
+# 2025-01-01 00:00:00 UTC, in milliseconds
+ID_EPOCH = 1735689600000
+
+NODE_BITS = 8
+SEQUENCE_BITS = 13
+MAX_NODE = (1 << NODE_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+ALPHABET = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def _encode(number):
+    chars = []
+    while number:
+        number, remainder = divmod(number, 36)
+        chars.append(ALPHABET[remainder])
+    return ''.join(reversed(chars)).rjust(ID_LENGTH, '0')
+
+
+def _configured_node():
+    try:
+        from django.conf import settings
+        node = getattr(settings, 'ID_NODE', None)
+    except Exception:
+        node = None
+    if node is None or node == '':
+        return random.SystemRandom().randint(0, MAX_NODE)
+    return int(node) & MAX_NODE
+
+
+class IdGenerator:
+    """Issue IDs for one process - use new_id() / new_ids() rather than instances"""
+
+    def __init__(self, node=None):
+        self._lock = threading.Lock()
+        self._node = node
+        self._last_timestamp = -1
+        self._sequence = 0
+        self._random = random.Random(os.urandom(16))
+
+    def reset(self, node=None):
+        """Forget the state (called in forked children so they get their own node and random offsets)"""
+        with self._lock:
+            self._node = node
+            self._last_timestamp = -1
+            self._sequence = 0
+            self._random = random.Random(os.urandom(16))
+
+    def _first_sequence(self):
+        """Random start of a millisecond's sequence (lower half, see module docstring)"""
+        return self._random.getrandbits(SEQUENCE_BITS - 1)
+
+    def _reserve(self, count):
+        """Reserve `count` consecutive sequence numbers, returns [(timestamp, first sequence, size), ...]"""
+        ranges = []
+        with self._lock:
+            if self._node is None:
+                self._node = _configured_node()
+            while count > 0:
+                timestamp = int(time.time() * 1000) - ID_EPOCH
+                if timestamp > self._last_timestamp:
+                    self._last_timestamp = timestamp
+                    self._sequence = self._first_sequence()
+                elif self._sequence > MAX_SEQUENCE:
+                    # Sequence exhausted for this millisecond (or clock moved back): move to the next one
+                    self._last_timestamp += 1
+                    self._sequence = self._first_sequence()
+                size = min(count, MAX_SEQUENCE + 1 - self._sequence)
+                ranges.append((self._last_timestamp, self._sequence, size))
+                self._sequence += size
+                count -= size
+            node = self._node
+        return node, ranges
+
+    def new_ids(self, count):
+        node, ranges = self._reserve(count)
+        ids = []
+        for timestamp, first, size in ranges:
+            prefix = (timestamp << (NODE_BITS + SEQUENCE_BITS)) | (node << SEQUENCE_BITS)
+            ids.extend(_encode(prefix | sequence) for sequence in range(first, first + size))
+        return ids
+
+
+_generator = IdGenerator()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_generator.reset)
+
+
+def new_id():
+    """New 12-character ID (no database check needed)"""
+    return _generator.new_ids(1)[0]
+
+
+def new_ids(count):
+    """`count` new IDs in increasing order, allocated at once for bulk inserts"""
+    if count <= 0:
+        return []
+    return _generator.new_ids(count)
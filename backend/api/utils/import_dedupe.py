@@ -0,0 +1,176 @@
+"""
+Duplicate detection for contact imports.
+
+Each parsed contact gets blocking keys (normalized email, phone digits in
+E.164 form, old_contact_id). Keys are resolved per importer batch against the
+existing contacts with one IN query per key type, and against the rows already
+seen in the file.
+
+The existing contacts are only read for the keys of the current batch, but the
+keys seen in the file (DuplicateDetector.seen and file_contact_ids) are kept
+for the whole import: they grow with the number of rows of the file.
+"""
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from api.models import Contact
+
+# What happens to a row matching an existing contact (or an earlier row of the file)
+# - create: the contact is still created, the duplicate is only reported
+# - skip: the row is not imported
+# - update: the existing contact is updated with the row's values (rows duplicating an earlier row are skipped)
+DUPLICATE_POLICIES = ('create', 'skip', 'update')
+DEFAULT_DUPLICATE_POLICY = 'create'
+
+DUPLICATE_KEY_TYPES = ('email', 'phone', 'oldContactId')
+
+# Country code added to national numbers (9 digits once the trunk 0 is dropped)
+DEFAULT_COUNTRY_CODE = '33'
+
+
+def normalize_email(email):
+    email = (email or '').strip().lower()
+    return email or None
+
+
+def normalize_phone(value):
+    """Phone number as E.164 digits (no +), None when it is too short to be a phone number"""
+    if value is None:
+        return None
+    # Leading zeros (trunk 0, 00 international prefix) are not significant - phones are stored as integers
+    digits = ''.join(c for c in str(value) if '0' <= c <= '9').lstrip('0')
+    if len(digits) < 6:
+        return None
+    if len(digits) == 9:
+        digits = DEFAULT_COUNTRY_CODE + digits
+    return digits
+
+
+def _stored_phone_values(phone_key):
+    """Integer values a normalized phone can be stored as (with and without country code)"""
+    values = {int(phone_key)}
+    if phone_key.startswith(DEFAULT_COUNTRY_CODE) and len(phone_key) == len(DEFAULT_COUNTRY_CODE) + 9:
+        values.add(int(phone_key[len(DEFAULT_COUNTRY_CODE):]))
+    return values
+
+
+def parse_duplicate_keys(value):
+    """Key types from a comma separated request parameter (all key types by default)"""
+    if not value:
+        return DUPLICATE_KEY_TYPES
+    if isinstance(value, str):
+        value = value.split(',')
+    key_types = tuple(key.strip() for key in value if key and key.strip() in DUPLICATE_KEY_TYPES)
+    return key_types or DUPLICATE_KEY_TYPES
+
+
+class DuplicateDetector:
+    """Find duplicates of parsed contacts, chunk by chunk, keeping track of the rows already seen in the file"""
+
+    def __init__(self, key_types=DUPLICATE_KEY_TYPES):
+        self.key_types = key_types
+        self.seen = {}  # (key type, key) -> row number of the first occurrence in the file
+        # (key type, key) -> ids of the contacts of the file having it: the chunks are inserted as they are
+        # checked, the contacts of earlier chunks are reported as earlier rows, not as existing contacts
+        self.file_contact_ids = {}
+
+    def blocking_keys(self, contact):
+        keys = []
+        if 'email' in self.key_types:
+            email = normalize_email(contact.email)
+            if email:
+                keys.append(('email', email))
+        if 'phone' in self.key_types:
+            for number in (contact.phone, contact.mobile):
+                phone = normalize_phone(number)
+                if phone and ('phone', phone) not in keys:
+                    keys.append(('phone', phone))
+        if 'oldContactId' in self.key_types and contact.old_contact_id:
+            keys.append(('oldContactId', str(contact.old_contact_id).strip()))
+        return keys
+
+    def _existing_contacts(self, keys_by_type):
+        """Map (key type, key) -> ids of the existing contacts, one query per key type"""
+        existing = {}
+
+        emails = keys_by_type.get('email')
+        if emails:
+            rows = (
+                Contact.objects.annotate(email_lower=Lower('email'))
+                .filter(email_lower__in=emails)
+                .values_list('email_lower', 'id')
+            )
+            for email, contact_id in rows:
+                existing.setdefault(('email', email), set()).add(contact_id)
+
+        phones = keys_by_type.get('phone')
+        if phones:
+            stored_values = set()
+            for phone in phones:
+                stored_values |= _stored_phone_values(phone)
+            rows = Contact.objects.filter(
+                Q(phone__in=stored_values) | Q(mobile__in=stored_values)
+            ).values_list('phone', 'mobile', 'id')
+            for phone, mobile, contact_id in rows:
+                for number in (phone, mobile):
+                    key = normalize_phone(number)
+                    if key in phones:
+                        existing.setdefault(('phone', key), set()).add(contact_id)
+
+        old_ids = keys_by_type.get('oldContactId')
+        if old_ids:
+            rows = Contact.objects.filter(old_contact_id__in=old_ids).values_list('old_contact_id', 'id')
+            for old_id, contact_id in rows:
+                existing.setdefault(('oldContactId', str(old_id).strip()), set()).add(contact_id)
+
+        return existing
+
+    def check(self, contacts, row_numbers):
+        """
+        Check a chunk of (unsaved) contacts.
+
+        Args:
+            contacts: Contact instances of the chunk
+            row_numbers: {contact.id: row number in the file}
+
+        Returns:
+            {contact.id: [match, ...]} for the contacts having duplicates, each match being
+            {'field', 'value', 'existingContactId'} or {'field', 'value', 'row'} (earlier row of the file)
+        """
+        keys_by_contact = {contact.id: self.blocking_keys(contact) for contact in contacts}
+        keys_by_type = {}
+        for keys in keys_by_contact.values():
+            for key_type, key in keys:
+                keys_by_type.setdefault(key_type, set()).add(key)
+
+        existing = self._existing_contacts(keys_by_type)
+
+        matches = {}
+        for contact in contacts:
+            contact_matches = []
+            for key in keys_by_contact[contact.id]:
+                key_type, value = key
+                existing_ids = existing.get(key, set()) - self.file_contact_ids.get(key, set())
+                if existing_ids:
+                    contact_matches.append({'field': key_type, 'value': value, 'existingContactId': min(existing_ids)})
+                self.file_contact_ids.setdefault(key, set()).add(contact.id)
+                if key in self.seen:
+                    contact_matches.append({'field': key_type, 'value': value, 'row': self.seen[key]})
+                else:
+                    self.seen[key] = row_numbers[contact.id]
+            if contact_matches:
+                matches[contact.id] = contact_matches
+        return matches
+
+
+def describe_duplicate(matches):
+    """Human readable reason for the import report"""
+    labels = {'email': "L'email", 'phone': 'Le téléphone', 'oldContactId': "L'ancien ID"}
+    reasons = []
+    for match in matches:
+        label = labels.get(match['field'], match['field'])
+        if 'existingContactId' in match:
+            reasons.append(f"{label} {match['value']} existe déjà dans la base de données")
+        else:
+            reasons.append(f"{label} {match['value']} apparaît plusieurs fois dans le fichier (première occurrence à la ligne {match['row']})")
+    return ' et '.join(reasons)
@@ -0,0 +1,401 @@
+"""
+Background import jobs.
+
+The import endpoints (contacts, notes, logs, integration update) can queue an
+ImportJob instead of processing the file inside the HTTP request. The worker
+(`python manage.py process_import_jobs`) runs the same parse/validate/insert
+pipeline as the synchronous endpoints and pushes progress and the final report
+to the user's `notifications_{user_id}` WebSocket group.
+
+Large files can be sent as a chunked upload (job in 'uploading' state until all
+parts are received). Jobs commit their inserts batch by batch together with a
+checkpoint (last committed file row), so a retried job - failed, or requeued
+after its worker died - resumes after the checkpoint instead of importing the
+same rows twice.
+"""
+import contextlib
+import threading
+import time
+from datetime import timedelta
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from api.models import ImportJob
+from api.utils import import_storage
+from api.utils.ids import new_id
+
+logger = logging.getLogger(__name__)
+
+# Pipeline function (in api.views) for each job kind
+IMPORT_PIPELINES = {
+    'contacts': 'run_csv_import_contacts',
+    'notes': 'run_csv_import_notes',
+    'logs': 'run_csv_import_logs',
+    'integration_update': 'run_contacts_integration_update',
+}
+
+# Request headers kept on the job so the bulk import log still records IP and browser
+REQUEST_META_KEYS = [
+    'HTTP_X_FORWARDED_FOR',
+    'HTTP_X_REAL_IP',
+    'HTTP_CF_CONNECTING_IP',
+    'REMOTE_ADDR',
+    'HTTP_USER_AGENT',
+]
+
+# Maximum number of entries kept per result list (success, errors, duplicates) in the stored report
+REPORT_LIST_LIMIT = 1000
+
+# Minimum delay between two progress updates (database write + WebSocket push)
+PROGRESS_INTERVAL_SECONDS = 1.0
+
+# A running job without any progress for this long is considered abandoned (worker restarted or crashed)
+STALE_JOB_SECONDS = 15 * 60
+
+# Abandoned jobs are requeued until they have been picked up this many times
+MAX_IMPORT_JOB_ATTEMPTS = 3
+
+
+def wants_background_import(request):
+    """True when the client asked for the upload to be processed as a background job"""
+    value = request.data.get('background') or request.query_params.get('background')
+    return str(value).strip().lower() in ('true', '1', 'yes')
+
+
+def generate_import_job_id():
+    return new_id()
+
+
+def _request_params(request, exclude=()):
+    """Form fields sent with the upload, kept on the job for the pipeline"""
+    return {
+        key: request.data.get(key)
+        for key in request.data.keys()
+        if key not in request.FILES and key != 'background' and key not in exclude
+    }
+
+
+def _request_meta(request):
+    return {key: request.META[key] for key in REQUEST_META_KEYS if request.META.get(key)}
+
+
+def _start_import_job(job):
+    """IMPORT_JOB_RUNNER='thread': run the job in a thread once the transaction is committed"""
+    if settings.IMPORT_JOB_RUNNER == 'thread':
+        transaction.on_commit(
+            lambda: threading.Thread(target=_run_import_job_in_thread, args=(job.id,), daemon=True).start()
+        )
+
+
+def enqueue_import_job(request, kind):
+    """Store the uploaded file and create a pending ImportJob for it"""
+    uploaded_file = request.FILES['file']
+
+    job = ImportJob.objects.create(
+        id=generate_import_job_id(),
+        user=request.user,
+        kind=kind,
+        file_name=uploaded_file.name,
+        file_path=import_storage.save_import_file(uploaded_file, request.user.id),
+        params=_request_params(request),
+        request_meta=_request_meta(request),
+    )
+    logger.info(f"[ImportJob] Queued {kind} import {job.id} for user {request.user.id} ({uploaded_file.name})")
+
+    _start_import_job(job)
+    return job
+
+
+def create_chunked_import_job(request, kind, file_name):
+    """Create an ImportJob waiting for the parts of a chunked upload"""
+    job_id = generate_import_job_id()
+    job = ImportJob.objects.create(
+        id=job_id,
+        user=request.user,
+        kind=kind,
+        status='uploading',
+        file_name=file_name,
+        file_path=import_storage.import_parts_prefix(request.user.id, job_id),
+        params=_request_params(request, exclude=('kind', 'fileName')),
+        request_meta=_request_meta(request),
+    )
+    logger.info(f"[ImportJob] Started chunked {kind} upload {job.id} for user {request.user.id} ({file_name})")
+    return job
+
+
+def check_import_parts(job, total_parts):
+    """
+    Compare the stored parts of a chunked upload with 1 to total_parts.
+
+    Returns (missing, unexpected): part numbers not received yet, and stored parts numbered
+    above total_parts (they would be read as part of the file).
+    """
+    received = set(import_storage.list_import_parts(job.file_path))
+    missing = [part_number for part_number in range(1, total_parts + 1) if part_number not in received]
+    unexpected = sorted(part_number for part_number in received if part_number > total_parts)
+    return missing, unexpected
+
+
+def complete_chunked_upload(job):
+    """All parts are stored: queue the job (returns False if it is not waiting for parts anymore)"""
+    queued = ImportJob.objects.filter(id=job.id, status='uploading').update(
+        status='pending',
+        updated_at=timezone.now(),
+    )
+    if not queued:
+        return False
+    job.refresh_from_db()
+    logger.info(f"[ImportJob] Queued chunked {job.kind} import {job.id} for user {job.user_id}")
+    _start_import_job(job)
+    return True
+
+
+def retry_import_job(job):
+    """Queue a failed job again - it resumes after its checkpoint (returns False if the job did not fail)"""
+    queued = ImportJob.objects.filter(id=job.id, status='failed').update(
+        status='pending',
+        error='',
+        finished_at=None,
+        updated_at=timezone.now(),
+    )
+    if not queued:
+        return False
+    job.refresh_from_db()
+    logger.info(f"[ImportJob] Retrying {job.kind} import {job.id} from row {job.checkpoint_row}")
+    _start_import_job(job)
+    return True
+
+
+def requeue_stale_import_jobs(stale_after=STALE_JOB_SECONDS):
+    """
+    Requeue the running jobs abandoned by a worker (no progress for stale_after seconds).
+
+    Jobs already picked up MAX_IMPORT_JOB_ATTEMPTS times are marked failed instead.
+    Returns the number of requeued jobs.
+    """
+    stale = ImportJob.objects.filter(
+        status='running',
+        updated_at__lt=timezone.now() - timedelta(seconds=stale_after),
+    )
+    now = timezone.now()
+    stale.filter(attempts__gte=MAX_IMPORT_JOB_ATTEMPTS).update(
+        status='failed',
+        error='Import interrupted too many times',
+        finished_at=now,
+        updated_at=now,
+    )
+    requeued = stale.filter(attempts__lt=MAX_IMPORT_JOB_ATTEMPTS).update(status='pending', updated_at=now)
+    if requeued:
+        logger.warning(f"[ImportJob] Requeued {requeued} abandoned import jobs")
+    return requeued
+
+
+def serialize_import_job(job):
+    from api.serializer import ImportJobSerializer
+    return dict(ImportJobSerializer(job).data)
+
+
+def push_import_job_event(job, event_type):
+    """Send the job state to the user's notification group - errors are logged, never raised"""
+    try:
+        channel_layer = get_channel_layer()
+        if not channel_layer:
+            return
+        async_to_sync(channel_layer.group_send)(
+            f'notifications_{job.user_id}',
+            {
+                'type': event_type,
+                'job': serialize_import_job(job),
+            }
+        )
+    except Exception as e:
+        logger.warning(f"[ImportJob] Could not push {event_type} for job {job.id}: {e}")
+
+
+class ImportJobRequest:
+    """Minimal stand-in for the DRF request so the import pipelines can run in the worker"""
+
+    def __init__(self, job, file):
+        self.user = job.user
+        self.data = dict(job.params or {})
+        self.query_params = {}
+        self.FILES = {'file': file}
+        self.META = dict(job.request_meta or {})
+
+
+class ImportJobProgress:
+    """
+    Progress callback given to the import pipelines, throttled to one update per interval.
+
+    Also carries the job checkpoint: pipelines skip the rows already committed by a
+    previous attempt (is_committed) and record a checkpoint with every committed batch.
+    """
+
+    def __init__(self, job):
+        self.job = job
+        self._last_update = 0.0
+        self.resumed_from = job.checkpoint_row
+        self.resumed_imported = job.checkpoint_imported
+        self.resumed_failed = job.checkpoint_failed
+
+    def is_committed(self, row_num):
+        """True when the row was imported (or rejected) by a previous attempt of the job"""
+        return row_num <= self.resumed_from
+
+    def checkpoint(self, row_num, results):
+        """
+        Record that every row up to row_num is committed.
+
+        Called inside the transaction of the batch, so the checkpoint and the
+        inserted rows are committed (or rolled back) together.
+        """
+        failed = sum(
+            1 for error in results.get('errors', [])
+            if isinstance(error.get('row'), int) and error['row'] <= row_num
+        )
+        self.job.checkpoint_row = max(self.job.checkpoint_row, row_num)
+        self.job.checkpoint_imported = self.resumed_imported + results.get('imported', 0)
+        self.job.checkpoint_failed = self.resumed_failed + failed
+        ImportJob.objects.filter(id=self.job.id).update(
+            checkpoint_row=self.job.checkpoint_row,
+            checkpoint_imported=self.job.checkpoint_imported,
+            checkpoint_failed=self.job.checkpoint_failed,
+            updated_at=timezone.now(),
+        )
+
+    def update(self, processed_rows, total_rows=None, force=False):
+        self.job.processed_rows = processed_rows
+        if total_rows is not None:
+            self.job.total_rows = total_rows
+
+        now = time.monotonic()
+        if not force and now - self._last_update < PROGRESS_INTERVAL_SECONDS:
+            return
+        self._last_update = now
+
+        ImportJob.objects.filter(id=self.job.id).update(
+            processed_rows=self.job.processed_rows,
+            total_rows=self.job.total_rows,
+            updated_at=timezone.now(),
+        )
+        push_import_job_event(self.job, 'import_job_progress')
+
+
+def import_transaction(progress):
+    """
+    Transaction around the insert phase of an import pipeline.
+
+    Synchronous imports stay all-or-nothing. Jobs (progress given) commit batch by
+    batch with their checkpoint, so a retried job does not import the same rows again.
+    """
+    if progress is None:
+        return transaction.atomic()
+    return contextlib.nullcontext()
+
+
+def build_import_report(results):
+    """Copy of the pipeline results with each row list capped to REPORT_LIST_LIMIT entries"""
+    report = {}
+    truncated = False
+    for key, value in (results or {}).items():
+        if isinstance(value, list) and len(value) > REPORT_LIST_LIMIT:
+            report[key] = value[:REPORT_LIST_LIMIT]
+            report[f'{key}Count'] = len(value)
+            truncated = True
+        else:
+            report[key] = value
+    if truncated:
+        report['truncated'] = True
+    return report
+
+
+def claim_next_import_job():
+    """Atomically move the oldest pending job to 'running' and return it (None if the queue is empty)"""
+    pending_ids = ImportJob.objects.filter(status='pending').order_by('created_at').values_list('id', flat=True)[:10]
+    for job_id in pending_ids:
+        now = timezone.now()
+        # Conditional update: only one worker can win the pending -> running transition
+        claimed = ImportJob.objects.filter(id=job_id, status='pending').update(
+            status='running',
+            attempts=F('attempts') + 1,
+            started_at=now,
+            updated_at=now,
+        )
+        if claimed:
+            return ImportJob.objects.select_related('user').get(id=job_id)
+    return None
+
+
+def run_import_job(job):
+    """Run a claimed job through its import pipeline and store the final report"""
+    from api import views
+
+    pipeline = getattr(views, IMPORT_PIPELINES[job.kind])
+    progress = ImportJobProgress(job)
+    push_import_job_event(job, 'import_job_progress')
+
+    file = None
+    try:
+        file = import_storage.open_import_file(job.file_path, job.file_name)
+        response = pipeline(ImportJobRequest(job, file), progress=progress)
+        results = response.data or {}
+        if response.status_code >= 400:
+            job.status = 'failed'
+            job.error = str(results.get('error', ''))
+            # Validation errors return the partial results under 'results'
+            results = results.get('results', results)
+        else:
+            job.status = 'completed'
+        job.report = build_import_report(results)
+        job.total_rows = results.get('total', job.processed_rows) or 0
+        job.imported = results.get('imported', results.get('updated', 0)) or 0
+        job.failed = results.get('failed', 0) or 0
+        if progress.resumed_from:
+            # Rows up to the checkpoint were handled by the previous attempts (their details are not in the report)
+            job.imported += progress.resumed_imported
+            job.failed += progress.resumed_failed
+            job.report['resumedFromRow'] = progress.resumed_from
+        job.processed_rows = job.total_rows
+    except Exception as e:
+        import traceback
+        logger.error(f"[ImportJob] Job {job.id} failed: {e}\n{traceback.format_exc()}")
+        job.status = 'failed'
+        job.error = str(e)
+    finally:
+        if file is not None:
+            file.close()
+
+    job.finished_at = timezone.now()
+    job.save()
+
+    # Keep the file of failed jobs so they can be inspected or retried
+    if job.status == 'completed':
+        import_storage.delete_import_file(job.file_path)
+
+    push_import_job_event(job, 'import_job_finished')
+    logger.info(f"[ImportJob] Job {job.id} {job.status}: {job.imported} imported, {job.failed} failed")
+    return job
+
+
+def _run_import_job_in_thread(job_id):
+    """IMPORT_JOB_RUNNER='thread': claim and run one job from a web process thread"""
+    try:
+        now = timezone.now()
+        claimed = ImportJob.objects.filter(id=job_id, status='pending').update(
+            status='running',
+            attempts=F('attempts') + 1,
+            started_at=now,
+            updated_at=now,
+        )
+        if claimed:
+            run_import_job(ImportJob.objects.select_related('user').get(id=job_id))
+    except Exception as e:
+        logger.error(f"[ImportJob] Error running job {job_id} in thread: {e}")
+    finally:
+        connection.close()
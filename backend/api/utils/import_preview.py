@@ -0,0 +1,103 @@
+"""
+Sampled preview of import files.
+
+The preview only reads the first rows of the file (the sample). The number of
+rows is estimated from the average size of the sampled rows - the exact count
+is given by the import job once the file is processed, or on demand with
+exact=True. Per-column type and fill rate are computed from the same sample.
+"""
+import re
+from datetime import datetime
+
+from api.utils.column_mapping import to_date, to_naive_datetime
+
+# Rows read for the preview and the column statistics
+DEFAULT_SAMPLE_SIZE = 500
+MAX_SAMPLE_SIZE = 5000
+
+# Rows returned to the frontend as preview
+PREVIEW_ROWS = 5
+
+EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+PHONE_RE = re.compile(r'^\+?[\d\s.\-()]{6,20}$')
+INTEGER_RE = re.compile(r'^[+-]?\d+$')
+NUMBER_RE = re.compile(r'^[+-]?\d+([.,]\d+)?$')
+
+
+def parse_sample_size(value):
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_SAMPLE_SIZE
+    return max(PREVIEW_ROWS, min(size, MAX_SAMPLE_SIZE))
+
+
+def sniff_value_type(value):
+    """Type of a non empty cell value: integer, number, phone, email, date, datetime or text"""
+    if isinstance(value, bool):
+        return 'text'
+    if isinstance(value, int):
+        return 'integer'
+    if isinstance(value, float):
+        return 'number'
+    if isinstance(value, datetime):
+        return 'datetime'
+    text = str(value).strip()
+    if EMAIL_RE.match(text):
+        return 'email'
+    if INTEGER_RE.match(text):
+        # Long numbers or numbers starting with 0/+ are phone numbers rather than quantities
+        if len(text) >= 9 or text.startswith(('0', '+')):
+            return 'phone'
+        return 'integer'
+    if NUMBER_RE.match(text):
+        return 'number'
+    # Dates before phones: 2021-01-31 also looks like a phone number.
+    # Same formats as the import converters: a column is a date here only if the import can parse it
+    if to_date(text) is not None:
+        return 'date'
+    if to_naive_datetime(text) is not None:
+        return 'datetime'
+    if PHONE_RE.match(text) and sum(c.isdigit() for c in text) >= 6:
+        return 'phone'
+    return 'text'
+
+
+def column_stats(headers, rows):
+    """
+    Type and fill rate of each column computed from the sampled rows.
+
+    Returns {header: {'type', 'fillRate', 'filled'}} - the type is the most frequent
+    type of the filled cells ('empty' when no cell is filled).
+    """
+    sample_count = len(rows)
+    stats = {}
+    for index, header in enumerate(headers):
+        type_counts = {}
+        filled = 0
+        for row in rows:
+            value = row[index] if index < len(row) else None
+            if value is None or (isinstance(value, str) and not value.strip()):
+                continue
+            filled += 1
+            value_type = sniff_value_type(value)
+            type_counts[value_type] = type_counts.get(value_type, 0) + 1
+        stats[header] = {
+            'type': max(type_counts, key=type_counts.get) if type_counts else 'empty',
+            'fillRate': round(filled / sample_count, 3) if sample_count else 0,
+            'filled': filled,
+        }
+    return stats
+
+
+def estimate_row_count(file_size, header_bytes, sampled_bytes, sample_count):
+    """Number of data rows estimated from the average size of the sampled rows"""
+    if not sample_count or not sampled_bytes or not file_size:
+        return sample_count
+    average = sampled_bytes / sample_count
+    return max(sample_count, int(round((file_size - header_bytes) / average)))
+
+
+def csv_row_bytes(row):
+    """Approximate size of a CSV row in the file (values + separators + line break)"""
+    return sum(len(value.encode('utf-8')) for value in row) + len(row)
@@ -0,0 +1,133 @@
+"""
+Incremental readers for CSV/XLSX import files.
+
+Uploads are never loaded in memory as a whole: CSV files are decoded chunk by
+chunk through a text stream and Excel files are opened with openpyxl in
+read-only mode and walked with iter_rows(), so peak memory does not depend on
+the size of the file.
+"""
+import codecs
+import csv
+import io
+
+# Number of bytes read to detect the actual file type (magic bytes)
+SNIFF_SIZE = 2048
+
+
+def _utf8_or_latin1(error):
+    """Codec error handler: bytes that are not valid UTF-8 are decoded as latin-1"""
+    bad_bytes = error.object[error.start:error.end]
+    return bad_bytes.decode('latin-1'), error.end
+
+
+codecs.register_error('leadflow_latin1_fallback', _utf8_or_latin1)
+
+
+class UploadChunkStream(io.RawIOBase):
+    """Read-only binary stream over the chunks of a Django uploaded file"""
+
+    def __init__(self, file):
+        file.seek(0)
+        self._chunks = file.chunks()
+        self._pending = b''
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending:
+            try:
+                self._pending = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def sniff_upload(file, size=SNIFF_SIZE):
+    """Return the first bytes of the upload and rewind it"""
+    file.seek(0)
+    head = file.read(size)
+    file.seek(0)
+    if isinstance(head, str):
+        head = head.encode('latin-1')
+    return head
+
+
+def looks_like_excel(head):
+    """Excel files (.xlsx) are ZIP archives and start with PK"""
+    return len(head) >= 2 and head[:2] == b'PK'
+
+
+def looks_like_csv(head):
+    first_line = head[:100].decode('utf-8', errors='ignore')
+    return ',' in first_line or ';' in first_line
+
+
+def open_text_stream(file):
+    """
+    Decode the upload incrementally as text.
+
+    UTF-8 (with or without BOM) is expected; bytes that are not valid UTF-8 are
+    read as latin-1, so latin-1 exports from Excel still import correctly.
+    """
+    return io.TextIOWrapper(
+        io.BufferedReader(UploadChunkStream(file)),
+        encoding='utf-8-sig',
+        errors='leadflow_latin1_fallback',
+        newline='',
+    )
+
+
+def csv_row_reader(file, include_first_row=False):
+    """
+    csv.reader streaming over the upload, rows are plain lists.
+
+    When include_first_row is True the first line is data and columns are
+    named Column1, Column2... (same format as the frontend mapping).
+    Returns (reader, headers).
+    """
+    stream = open_text_stream(file)
+    reader = csv.reader(stream)
+    first_row = next(reader, None)
+    if first_row is None:
+        return iter(()), []
+    if not include_first_row:
+        return reader, [h.strip().strip('"') for h in first_row]
+
+    headers = [f'Column{i+1}' for i in range(len(first_row))]
+
+    def rows():
+        yield first_row
+        yield from reader
+
+    return rows(), headers
+
+
+def load_workbook_streaming(file):
+    """Open an .xlsx upload with openpyxl in read-only mode (rows are read lazily from the file)"""
+    from openpyxl import load_workbook
+    file.seek(0)
+    return load_workbook(file, read_only=True, data_only=True)
+
+
+def excel_headers(sheet, include_first_row=False, placeholder='Column{}'):
+    """Headers of the sheet read from its first row (or generated when the first row is data)"""
+    first_row = next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+    if include_first_row:
+        return [placeholder.format(i + 1) for i in range(len(first_row))]
+    headers = []
+    for i, value in enumerate(first_row):
+        if value is not None and str(value).strip():
+            headers.append(str(value).strip())
+        else:
+            headers.append(placeholder.format(i + 1))
+    return headers
+
+
+def excel_row_reader(sheet, include_first_row=False, max_row=None):
+    """Rows of a read-only worksheet as tuples of cell values (header row skipped unless include_first_row)"""
+    return sheet.iter_rows(min_row=1 if include_first_row else 2, max_row=max_row, values_only=True)
+
@@ -0,0 +1,246 @@
+"""
+Storage for uploaded import files waiting to be processed by the import worker.
+
+Files are kept on Impossible Cloud (S3) when IMPORT_STORAGE_BACKEND is 's3' so a
+separate worker dyno can read them, and under MEDIA_ROOT otherwise.
+
+Chunked uploads store each part under a prefix ending with '/' (the job's
+file_path). Parts are never assembled on upload: CSV files are read part after
+part when the job runs, Excel files (which need random access) are copied to a
+temporary file first.
+"""
+import io
+import os
+import shutil
+import tempfile
+import uuid
+import logging
+
+from django.conf import settings
+from django.core.files import File
+
+logger = logging.getLogger(__name__)
+
+IMPORT_KEY_PREFIX = 'imports'
+
+# Extensions of the files read with openpyxl (need a seekable file)
+RANDOM_ACCESS_EXTENSIONS = ('.xlsx', '.xls')
+
+
+def _get_s3_client():
+    """S3 client for Impossible Cloud (same configuration as document uploads)"""
+    import boto3
+    return boto3.client(
+        's3',
+        endpoint_url=os.getenv('IMPOSSIBLE_CLOUD_ENDPOINT', 'https://eu-central-2.storage.impossibleapi.net'),
+        aws_access_key_id=os.getenv('IMPOSSIBLE_CLOUD_ACCESS_KEY'),
+        aws_secret_access_key=os.getenv('IMPOSSIBLE_CLOUD_SECRET_KEY'),
+        region_name=os.getenv('IMPOSSIBLE_CLOUD_REGION', 'eu-central-2'),
+    )
+
+
+def _get_bucket_name():
+    return os.getenv('IMPOSSIBLE_CLOUD_BUCKET', 'leadflow-documents')
+
+
+def _use_s3():
+    return settings.IMPORT_STORAGE_BACKEND == 's3'
+
+
+def _local_path(key):
+    return os.path.join(settings.MEDIA_ROOT, key)
+
+
+def save_import_file(uploaded_file, user_id):
+    """
+    Persist an uploaded import file and return its storage key.
+
+    The file is copied chunk by chunk, it is never loaded in memory as a whole.
+    """
+    extension = os.path.splitext(uploaded_file.name)[1].lower()
+    key = f"{IMPORT_KEY_PREFIX}/{user_id}/{uuid.uuid4().hex[:12]}{extension}"
+
+    uploaded_file.seek(0)
+    if _use_s3():
+        _get_s3_client().upload_fileobj(uploaded_file, _get_bucket_name(), key)
+    else:
+        path = _local_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as destination:
+            for chunk in uploaded_file.chunks():
+                destination.write(chunk)
+    return key
+
+
+def is_chunked_key(key):
+    return bool(key) and key.endswith('/')
+
+
+def import_parts_prefix(user_id, job_id):
+    """Storage prefix of the parts of a chunked upload"""
+    return f"{IMPORT_KEY_PREFIX}/{user_id}/{job_id}.parts/"
+
+
+def _part_key(prefix, part_number):
+    return f"{prefix}{part_number:05d}"
+
+
+def save_import_part(prefix, part_number, uploaded_file):
+    """Store one part of a chunked upload - uploading the same part again replaces it"""
+    key = _part_key(prefix, part_number)
+    uploaded_file.seek(0)
+    if _use_s3():
+        _get_s3_client().upload_fileobj(uploaded_file, _get_bucket_name(), key)
+    else:
+        path = _local_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so an interrupted upload never leaves a truncated part
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as destination:
+            for chunk in uploaded_file.chunks():
+                destination.write(chunk)
+        os.replace(temp_path, path)
+    return key
+
+
+def list_import_parts(prefix):
+    """Part numbers already stored for a chunked upload, in order"""
+    part_numbers = []
+    if _use_s3():
+        paginator = _get_s3_client().get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=_get_bucket_name(), Prefix=prefix):
+            for item in page.get('Contents', []):
+                name = item['Key'][len(prefix):]
+                if name.isdigit():
+                    part_numbers.append(int(name))
+    else:
+        path = _local_path(prefix)
+        if os.path.isdir(path):
+            part_numbers = [int(name) for name in os.listdir(path) if name.isdigit()]
+    return sorted(part_numbers)
+
+
+def import_parts_size(prefix, part_numbers):
+    """Total size in bytes of the given parts of a chunked upload"""
+    wanted = set(part_numbers)
+    if _use_s3():
+        total = 0
+        paginator = _get_s3_client().get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=_get_bucket_name(), Prefix=prefix):
+            for item in page.get('Contents', []):
+                name = item['Key'][len(prefix):]
+                if name.isdigit() and int(name) in wanted:
+                    total += item['Size']
+        return total
+    return sum(os.path.getsize(_local_path(_part_key(prefix, part_number))) for part_number in wanted)
+
+
+def _open_part(prefix, part_number):
+    key = _part_key(prefix, part_number)
+    if _use_s3():
+        return _get_s3_client().get_object(Bucket=_get_bucket_name(), Key=key)['Body']
+    return open(_local_path(key), 'rb')
+
+
+class ImportPartsStream(io.RawIOBase):
+    """Read-only binary stream over the parts of a chunked upload, opened one after the other"""
+
+    def __init__(self, prefix, part_numbers):
+        self.prefix = prefix
+        self.part_numbers = list(part_numbers)
+        self._index = 0
+        self._current = None
+        self._size = None
+
+    @property
+    def size(self):
+        """Sum of the part sizes (django File.size would seek to the end, which the stream cannot do)"""
+        if self._size is None:
+            self._size = import_parts_size(self.prefix, self.part_numbers)
+        return self._size
+
+    def readable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        # Only rewinding is supported (Django File.chunks() and the file sniffing rewind the upload)
+        if offset != 0 or whence != io.SEEK_SET:
+            raise io.UnsupportedOperation('seek')
+        self._close_current()
+        self._index = 0
+        return 0
+
+    def readinto(self, buffer):
+        while self._index < len(self.part_numbers):
+            if self._current is None:
+                self._current = _open_part(self.prefix, self.part_numbers[self._index])
+            data = self._current.read(len(buffer))
+            if data:
+                buffer[:len(data)] = data
+                return len(data)
+            self._close_current()
+            self._index += 1
+        return 0
+
+    def _close_current(self):
+        if self._current is not None:
+            self._current.close()
+            self._current = None
+
+    def close(self):
+        self._close_current()
+        super().close()
+
+
+def _open_chunked_import_file(prefix, name):
+    part_numbers = list_import_parts(prefix)
+    # Completion checks that the parts are exactly 1 to totalParts (no part can be added afterwards)
+    if part_numbers != list(range(1, len(part_numbers) + 1)):
+        raise ValueError(f"The parts of {prefix} are not numbered 1 to {len(part_numbers)}: {part_numbers}")
+    stream = ImportPartsStream(prefix, part_numbers)
+    if os.path.splitext(name)[1].lower() in RANDOM_ACCESS_EXTENSIONS:
+        temp_file = tempfile.NamedTemporaryFile(suffix=os.path.splitext(name)[1])
+        shutil.copyfileobj(stream, temp_file)
+        stream.close()
+        temp_file.seek(0)
+        return File(temp_file, name=name)
+    return File(stream, name=name)
+
+
+def open_import_file(key, name):
+    """
+    Open a stored import file as a Django File named like the original upload.
+
+    S3 objects are downloaded to a temporary file (removed when the File is closed).
+    Chunked uploads are streamed part by part.
+    """
+    if is_chunked_key(key):
+        return _open_chunked_import_file(key, name)
+    if _use_s3():
+        temp_file = tempfile.NamedTemporaryFile(suffix=os.path.splitext(key)[1])
+        _get_s3_client().download_fileobj(_get_bucket_name(), key, temp_file)
+        temp_file.seek(0)
+        return File(temp_file, name=name)
+    return File(open(_local_path(key), 'rb'), name=name)
+
+
+def delete_import_file(key):
+    """Delete a stored import file - errors are logged, never raised"""
+    if not key:
+        return
+    try:
+        if is_chunked_key(key):
+            if _use_s3():
+                client = _get_s3_client()
+                for part_number in list_import_parts(key):
+                    client.delete_object(Bucket=_get_bucket_name(), Key=_part_key(key, part_number))
+            else:
+                shutil.rmtree(_local_path(key), ignore_errors=True)
+        elif _use_s3():
+            _get_s3_client().delete_object(Bucket=_get_bucket_name(), Key=key)
+        else:
+            path = _local_path(key)
+            if os.path.exists(path):
+                os.remove(path)
+    except Exception as e:
+        logger.warning(f"Could not delete import file {key}: {e}")
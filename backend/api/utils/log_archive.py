@@ -0,0 +1,346 @@
+"""
+Monthly partitions of the Log table and archival of old months.
+
+On PostgreSQL api_log is partitioned by range of created_at (migration 0111):
+one partition per month named api_log_pYYYYMM, plus api_log_default for rows
+outside the created partitions (e.g. imported historical logs). The primary key
+is (id, created_at) since PostgreSQL requires the partition key in it; ids stay
+unique as they are generated by api/utils/ids.py.
+
+Months older than the retention window are archived: the month's partition is
+detached, its rows are written as gzipped NDJSON to the archive storage (S3 or
+MEDIA_ROOT, like import files) and the partition is dropped. Rows of old months
+that are not in a dedicated partition (default partition, or the whole table
+on other databases) are exported the same way then deleted.
+
+Archive files are split into CONTACT_BUCKETS buckets by contact id, so the logs
+of one contact are read back (contact_logs?includeArchived=true) by downloading
+a single bucket per archived month. Rows rewritten in place (compact_contact_logs)
+are copied to the same storage under log-backup/ first.
+"""
+import gzip
+import json
+import logging
+import os
+import re
+import tempfile
+import zlib
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils.dateparse import parse_datetime
+
+from api.utils.import_storage import _get_bucket_name, _get_s3_client
+
+logger = logging.getLogger(__name__)
+
+LOG_TABLE = 'api_log'
+DEFAULT_PARTITION = 'api_log_default'
+PARTITION_RE = re.compile(r'^api_log_p(\d{4})(\d{2})$')
+
+ARCHIVE_KEY_PREFIX = 'log-archive'
+
+# Copies of rows taken before they are rewritten in place (compact_contact_logs)
+BACKUP_KEY_PREFIX = 'log-backup'
+
+# Files per archived month, logs are assigned to a file by a hash of their contact id
+CONTACT_BUCKETS = 64
+NO_CONTACT_BUCKET = 'none'
+
+# Columns exported for each log, in this order
+ARCHIVE_COLUMNS = ('id', 'event_type', 'user_id_id', 'contact_id_id', 'created_at', 'details', 'old_value', 'new_value', 'old_logs')
+
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_bounds(month):
+    """[start, end) of a month as UTC datetimes"""
+    start = datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc)
+    end_month = add_months(month, 1)
+    return start, datetime(end_month.year, end_month.month, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_name(month):
+    return f'{LOG_TABLE}_p{month:%Y%m}'
+
+
+def contact_bucket(contact_id):
+    if not contact_id:
+        return NO_CONTACT_BUCKET
+    return f'{zlib.crc32(str(contact_id).encode("utf-8")) % CONTACT_BUCKETS:02d}'
+
+
+# --- Partitions (PostgreSQL) ---
+
+def is_partitioned():
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [LOG_TABLE])
+        row = cursor.fetchone()
+    return bool(row) and row[0] == 'p'
+
+
+def monthly_partitions():
+    """{month: partition name} of the monthly partitions attached to api_log"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(%s)",
+            [LOG_TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = {}
+    for name in names:
+        match = PARTITION_RE.match(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+def ensure_partitions(months_ahead=3, today=None):
+    """Create the partitions of the current month and the next months_ahead months, returns the created names"""
+    if not is_partitioned():
+        return []
+    existing = monthly_partitions()
+    current = month_start(today or datetime.now(dt_timezone.utc).date())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if month not in existing:
+            create_partition(month)
+            created.append(partition_name(month))
+    return created
+
+
+def create_partition(month):
+    """Create the partition of a month, moving the rows of that month out of the default partition if any"""
+    name = connection.ops.quote_name(partition_name(month))
+    table = connection.ops.quote_name(LOG_TABLE)
+    default = connection.ops.quote_name(DEFAULT_PARTITION)
+    start, end = month_bounds(month)
+    bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"SELECT 1 FROM {default} WHERE created_at >= %s AND created_at < %s LIMIT 1", [start, end])
+        if cursor.fetchone() is None:
+            cursor.execute(f"CREATE TABLE {name} PARTITION OF {table} {bounds}")
+            return
+        # Attaching a range the default partition holds rows for would fail: move them first
+        cursor.execute(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)")
+        cursor.execute(f"INSERT INTO {name} SELECT * FROM {default} WHERE created_at >= %s AND created_at < %s", [start, end])
+        cursor.execute(f"DELETE FROM {default} WHERE created_at >= %s AND created_at < %s", [start, end])
+        cursor.execute(f"ALTER TABLE {table} ATTACH PARTITION {name} {bounds}")
+
+
+# --- Archive storage ---
+
+def _use_s3():
+    backend = getattr(settings, 'LOG_ARCHIVE_STORAGE_BACKEND', None) or settings.IMPORT_STORAGE_BACKEND
+    return backend == 's3'
+
+
+def _local_path(key):
+    return os.path.join(settings.MEDIA_ROOT, key)
+
+
+def _store_file(path, key):
+    if _use_s3():
+        _get_s3_client().upload_file(path, _get_bucket_name(), key, ExtraArgs={'ContentType': 'application/gzip'})
+    else:
+        destination = _local_path(key)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        with open(path, 'rb') as source, open(destination, 'wb') as target:
+            while True:
+                chunk = source.read(1024 * 1024)
+                if not chunk:
+                    break
+                target.write(chunk)
+
+
+def _open_file(key):
+    """Binary stream of a stored archive file (gzip compressed)"""
+    if _use_s3():
+        return _get_s3_client().get_object(Bucket=_get_bucket_name(), Key=key)['Body']
+    return open(_local_path(key), 'rb')
+
+
+def _bucket_key(prefix, bucket):
+    return f'{prefix}bucket-{bucket}.ndjson.gz'
+
+
+# --- Export ---
+
+def _export_rows(rows, prefix):
+    """
+    Write rows (tuples in ARCHIVE_COLUMNS order) to one gzipped NDJSON file per
+    contact bucket and store them under prefix. Returns (row count, buckets).
+    """
+    files = {}
+    row_count = 0
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            for row in rows:
+                record = dict(zip(ARCHIVE_COLUMNS, row))
+                bucket = contact_bucket(record['contact_id_id'])
+                if bucket not in files:
+                    files[bucket] = gzip.open(os.path.join(directory, f'{bucket}.ndjson.gz'), 'wt', encoding='utf-8')
+                files[bucket].write(json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n')
+                row_count += 1
+        finally:
+            for file in files.values():
+                file.close()
+        for bucket in files:
+            _store_file(os.path.join(directory, f'{bucket}.ndjson.gz'), _bucket_key(prefix, bucket))
+    return row_count, sorted(files)
+
+
+def backup_rows(rows, name):
+    """
+    Write rows (tuples in ARCHIVE_COLUMNS order) to a single gzipped NDJSON file
+    stored as BACKUP_KEY_PREFIX/<name>.ndjson.gz. Returns the key of the file.
+    """
+    key = f'{BACKUP_KEY_PREFIX}/{name}.ndjson.gz'
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'rows.ndjson.gz')
+        with gzip.open(path, 'wt', encoding='utf-8') as file:
+            for row in rows:
+                record = dict(zip(ARCHIVE_COLUMNS, row))
+                file.write(json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n')
+        _store_file(path, key)
+    return key
+
+
+def _new_archive(month, source):
+    from api.models import LogArchive
+    from api.utils.ids import new_id
+
+    archive_id = new_id()
+    return LogArchive(
+        id=archive_id,
+        month=month,
+        source=source,
+        storage_prefix=f'{ARCHIVE_KEY_PREFIX}/{month:%Y-%m}/{archive_id}/',
+    )
+
+
+def archive_partition(month, name):
+    """Detach the partition of a month, export it, record the archive and drop the partition"""
+    table = connection.ops.quote_name(LOG_TABLE)
+    quoted = connection.ops.quote_name(name)
+    start, end = month_bounds(month)
+    archive = _new_archive(month, name)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {quoted}")
+    try:
+        # The partition is no longer written to: export it with a server side cursor
+        with transaction.atomic():
+            cursor = connection.chunked_cursor()
+            try:
+                cursor.execute(f"SELECT {', '.join(ARCHIVE_COLUMNS)} FROM {quoted}")
+                archive.row_count, archive.buckets = _export_rows(_rows(cursor), archive.storage_prefix)
+            finally:
+                cursor.close()
+        with transaction.atomic():
+            archive.save(force_insert=True)
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE {quoted}")
+    except Exception:
+        logger.exception(f"Archiving {name} failed, attaching it back")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"ALTER TABLE {table} ATTACH PARTITION {quoted} FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+        raise
+    return archive
+
+
+def _rows(cursor, size=2000):
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield from rows
+
+
+def archive_rows(month):
+    """Export the rows of a month that are not in a dedicated partition, record the archive and delete them"""
+    from api.models import Log
+
+    start, end = month_bounds(month)
+    archive = _new_archive(month, 'rows')
+    with transaction.atomic():
+        rows = Log.objects.filter(created_at__gte=start, created_at__lt=end).values_list(*ARCHIVE_COLUMNS)
+        archive.row_count, archive.buckets = _export_rows(rows.iterator(chunk_size=2000), archive.storage_prefix)
+        if not archive.row_count:
+            return None
+        archive.save(force_insert=True)
+        Log.objects.filter(created_at__gte=start, created_at__lt=end).delete()
+    return archive
+
+
+def months_with_rows_before(cutoff):
+    """First day of the months having rows older than cutoff (outside the dedicated partitions on PostgreSQL)"""
+    from django.db.models.functions import TruncMonth
+    from api.models import Log
+
+    months = (
+        Log.objects.filter(created_at__lt=cutoff)
+        .annotate(month=TruncMonth('created_at', tzinfo=dt_timezone.utc))
+        .values_list('month', flat=True)
+        .distinct()
+    )
+    return sorted({month_start(month.date() if isinstance(month, datetime) else month) for month in months})
+
+
+# --- Reading archives ---
+
+def archived_logs_for_contact(contact_id):
+    """Log rows (dicts in ARCHIVE_COLUMNS) of a contact found in the archives, newest archive first"""
+    from api.models import LogArchive
+
+    bucket = contact_bucket(contact_id)
+    records = []
+    for archive in LogArchive.objects.all():
+        if bucket not in (archive.buckets or []):
+            continue
+        with _open_file(_bucket_key(archive.storage_prefix, bucket)) as raw:
+            with gzip.open(raw, 'rt', encoding='utf-8') as lines:
+                for line in lines:
+                    record = json.loads(line)
+                    if record.get('contact_id_id') == contact_id:
+                        records.append(record)
+    return records
+
+
+def archived_log_instances(contact, records):
+    """Unsaved Log instances for archived records (users fetched in one query), for LogSerializer"""
+    from django.contrib.auth.models import User as DjangoUser
+    from api.models import Log
+
+    user_ids = {record['user_id_id'] for record in records if record.get('user_id_id')}
+    users = DjangoUser.objects.in_bulk(user_ids) if user_ids else {}
+    logs = []
+    for record in records:
+        log = Log(
+            id=record['id'],
+            event_type=record.get('event_type') or '',
+            created_at=parse_datetime(record['created_at']) if record.get('created_at') else None,
+            details=record.get('details') or {},
+            old_value=record.get('old_value') or {},
+            new_value=record.get('new_value') or {},
+            old_logs=record.get('old_logs'),
+        )
+        log.contact_id = contact
+        log.user_id = users.get(record.get('user_id_id'))
+        logs.append(log)
+    return logs
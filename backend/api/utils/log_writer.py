@@ -0,0 +1,201 @@
+"""
+Buffered writer for the activity logs (Log rows).
+
+create_log_entry() builds the Log and hands it to the writer instead of
+inserting it inside the request. In 'async' mode (default) the rows are queued
+once the request transaction commits and a background thread inserts them with
+bulk_create, every LOG_WRITER_FLUSH_MS or LOG_WRITER_BATCH_SIZE rows, whichever
+comes first. created_at is taken when the entry is created and restored after
+the insert (auto_now_add would set the flush time).
+
+The queue is flushed at interpreter exit (atexit) and can be flushed
+explicitly with flush(). When the queue is full the row is written inline
+rather than dropped. LOG_WRITER_MODE='sync' inserts every row immediately in
+the caller's transaction (tests, scripts).
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_MS = 200
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_QUEUE_SIZE = 10000
+
+# Seconds given to the background thread to write the pending rows at shutdown
+SHUTDOWN_TIMEOUT = 10
+
+_STOP = object()
+
+
+def _setting(name, default):
+    value = getattr(settings, name, None)
+    return default if value in (None, '') else value
+
+
+def is_sync():
+    return str(_setting('LOG_WRITER_MODE', 'async')).lower() == 'sync'
+
+
+def insert_logs(logs):
+    """Insert Log rows with bulk_create, keeping their created_at. Rows that fail are reported and skipped."""
+    from api.models import Log
+    from api.utils.copy_loader import restore_timestamps
+
+    if not logs:
+        return 0
+    # bulk_create applies auto_now_add: keep the creation times to restore them
+    timestamps = [(log.id, {'created_at': log.created_at}) for log in logs]
+    try:
+        with transaction.atomic():
+            Log.objects.bulk_create(logs, batch_size=len(logs))
+            restore_timestamps(Log, timestamps, batch_size=len(logs))
+        return len(logs)
+    except Exception:
+        logger.exception(f"Bulk insert of {len(logs)} log entries failed, inserting them one by one")
+
+    inserted = 0
+    for log, timestamp in zip(logs, timestamps):
+        for attempt in range(2):
+            try:
+                with transaction.atomic():
+                    log._state.adding = True
+                    Log.objects.bulk_create([log])
+                    restore_timestamps(Log, [timestamp])
+                inserted += 1
+                break
+            except Exception:
+                # The contact or user may have been deleted between the request and the flush:
+                # keep the entry without it, as SET_NULL would have done
+                if attempt == 0 and _detach_deleted_references(log):
+                    continue
+                logger.exception(f"Could not insert log entry {log.id} ({log.event_type})")
+                break
+    return inserted
+
+
+def _detach_deleted_references(log):
+    """Clear the foreign keys of a Log pointing to deleted rows, returns True if one was cleared"""
+    from django.contrib.auth.models import User
+    from api.models import Contact
+
+    detached = False
+    if log.contact_id_id and not Contact.objects.filter(id=log.contact_id_id).exists():
+        log.contact_id = None
+        detached = True
+    if log.user_id_id and not User.objects.filter(id=log.user_id_id).exists():
+        log.user_id = None
+        detached = True
+    return detached
+
+
+class LogWriter:
+    """Queue + background thread of one process (use the module level log_writer)"""
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=int(_setting('LOG_WRITER_QUEUE_SIZE', DEFAULT_QUEUE_SIZE)))
+        self._thread = None
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+                self._thread.start()
+
+    def write(self, log):
+        """Write a Log row: immediately in sync mode, else queued once the current transaction commits"""
+        if is_sync():
+            insert_logs([log])
+            return
+        transaction.on_commit(lambda: self._enqueue(log))
+
+    def _enqueue(self, log):
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(log)
+        except queue.Full:
+            # Backpressure: the writer is behind, write this row inline rather than dropping it
+            insert_logs([log])
+
+    def _next_batch(self, flush_interval, batch_size):
+        """Wait for the first row, then collect rows until the batch is full or the interval elapsed"""
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + flush_interval
+        while len(batch) < batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                log = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if log is _STOP:
+                return batch, True
+            batch.append(log)
+        return batch, False
+
+    def _run(self):
+        flush_interval = int(_setting('LOG_WRITER_FLUSH_MS', DEFAULT_FLUSH_MS)) / 1000
+        batch_size = int(_setting('LOG_WRITER_BATCH_SIZE', DEFAULT_BATCH_SIZE))
+        while True:
+            batch, stop = self._next_batch(flush_interval, batch_size)
+            if batch:
+                close_old_connections()
+                try:
+                    insert_logs(batch)
+                except Exception:
+                    logger.exception(f"Log writer could not write {len(batch)} log entries")
+            if stop:
+                return
+
+    def _drain(self):
+        batch = []
+        while True:
+            try:
+                log = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if log is not _STOP:
+                batch.append(log)
+        return batch
+
+    def flush(self, timeout=SHUTDOWN_TIMEOUT):
+        """Write every queued row before returning (stops the background thread, the next write restarts it)"""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.warning('Log writer did not finish in time, writing the remaining log entries inline')
+        # Rows queued after the stop marker (or left by a thread that did not finish)
+        remaining = self._drain()
+        if remaining:
+            insert_logs(remaining)
+
+    def pending(self):
+        return self._queue.qsize()
+
+
+log_writer = LogWriter()
+
+atexit.register(log_writer.flush)
+
+if hasattr(os, 'register_at_fork'):
+    # The child gets its own queue and thread (the parent's rows stay with the parent)
+    os.register_at_fork(after_in_child=log_writer._reset)
@@ -0,0 +1,133 @@
+"""
+Reconciliation of a migration file against the contacts already imported.
+
+The file is read twice as a stream, never as a whole:
+
+1. The old IDs of the file are collected with their row number into sorted
+   runs (RUN_SIZE entries sorted in memory, spilled to temporary files when
+   the file is larger). The runs are merged into one sorted stream and its
+   distinct IDs are checked against Contact.old_contact_id chunk by chunk,
+   in key order, with indexed IN lookups. Rows whose ID is not in the
+   database are marked in a bitmap (one bit per row).
+2. missing_rows() reads the file again and yields the marked rows in file
+   order.
+
+Memory is bounded by RUN_SIZE, LOOKUP_CHUNK_SIZE and the bitmap, whatever the
+size of the file or of the contacts table. Stored old IDs are stripped (on save
+and by migration 0117), so the stripped IDs of the file match them exactly.
+"""
+import csv
+import heapq
+import tempfile
+
+from api.models import Contact
+from api.utils.import_readers import open_text_stream
+
+# (old ID, row) entries sorted in memory before being spilled to a temporary file
+RUN_SIZE = 100000
+
+# Distinct old IDs checked per database query
+LOOKUP_CHUNK_SIZE = 1000
+
+
+def _read_run(run_file):
+    run_file.seek(0)
+    for old_id, row_index in csv.reader(run_file):
+        yield old_id, int(row_index)
+
+
+class MigrationReconciliation:
+    """Old IDs of a migration CSV that are not in the database (see module docstring)"""
+
+    def __init__(self, file, old_id_column):
+        self.file = file
+        self.old_id_column = old_id_column
+        self.total_rows = 0
+        self.rows_with_old_ids = 0
+        self.ids_in_database = 0
+        self.rows_missing = 0
+        self._missing = bytearray()
+        self._runs = []
+
+    def _reader(self):
+        return csv.DictReader(open_text_stream(self.file))
+
+    def _spill(self, entries):
+        entries.sort()
+        run_file = tempfile.TemporaryFile(mode='w+', newline='', encoding='utf-8')
+        csv.writer(run_file).writerows(entries)
+        self._runs.append(run_file)
+
+    def _sorted_entries(self):
+        """(old ID, row) of every row having an old ID, sorted by old ID"""
+        entries = []
+        for row_index, row in enumerate(self._reader()):
+            self.total_rows += 1
+            old_id = str(row.get(self.old_id_column) or '').strip()
+            if not old_id:
+                continue
+            self.rows_with_old_ids += 1
+            entries.append((old_id, row_index))
+            if len(entries) >= RUN_SIZE:
+                self._spill(entries)
+                entries = []
+        if not self._runs:
+            entries.sort()
+            return iter(entries)
+        if entries:
+            self._spill(entries)
+        return heapq.merge(*(_read_run(run_file) for run_file in self._runs))
+
+    def _check_chunk(self, rows_by_id):
+        found = set(
+            Contact.objects.filter(old_contact_id__in=list(rows_by_id)).values_list('old_contact_id', flat=True)
+        )
+        for old_id, row_indexes in rows_by_id.items():
+            if old_id in found:
+                self.ids_in_database += 1
+                continue
+            for row_index in row_indexes:
+                self._missing[row_index >> 3] |= 1 << (row_index & 7)
+                self.rows_missing += 1
+
+    def run(self):
+        """First pass: count the rows and mark the rows whose old ID is missing"""
+        try:
+            entries = self._sorted_entries()
+            self._missing = bytearray((self.total_rows + 7) // 8)
+
+            rows_by_id = {}
+            for old_id, row_index in entries:
+                if old_id not in rows_by_id and len(rows_by_id) >= LOOKUP_CHUNK_SIZE:
+                    self._check_chunk(rows_by_id)
+                    rows_by_id = {}
+                rows_by_id.setdefault(old_id, []).append(row_index)
+            if rows_by_id:
+                self._check_chunk(rows_by_id)
+        finally:
+            for run_file in self._runs:
+                run_file.close()
+            self._runs = []
+        return self
+
+    def is_missing(self, row_index):
+        return bool(self._missing[row_index >> 3] & (1 << (row_index & 7)))
+
+    def missing_rows(self):
+        """Second pass: yield (row index, row dict) of the missing rows, in file order"""
+        if not self.rows_missing:
+            return
+        for row_index, row in enumerate(self._reader()):
+            if row_index >= self.total_rows:
+                return
+            if self.is_missing(row_index):
+                yield row_index, row
+
+    @property
+    def statistics(self):
+        return {
+            'totalRows': self.total_rows,
+            'rowsWithOldIds': self.rows_with_old_ids,
+            'rowsInDatabase': self.ids_in_database,
+            'rowsMissing': self.rows_missing,
+        }
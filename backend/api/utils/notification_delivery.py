@@ -0,0 +1,215 @@
+"""
+Coalesced WebSocket delivery of the notifications.
+
+push_notifications() hands the notifications to the delivery instead of sending
+one group_send per notification. In 'async' mode (default) a background thread
+collects them for NOTIFICATION_COALESCE_MS after the first one and sends, per
+user, one frame: 'send_notification' for a single notification, or
+'notifications_batch' (NotificationConsumer.notifications_batch) with the list
+of notifications and the latest unread count. A bulk action notifying the same
+users hundreds of times then costs one Redis publish and one WebSocket frame
+per user and window.
+
+Each process coalesces its own notifications. The pending notifications are
+sent at interpreter exit (atexit) and can be sent explicitly with flush(). At
+exit async_to_sync can no longer start its executor, so the last frames are
+sent from a fresh event loop (asyncio.run).
+NOTIFICATION_DELIVERY_MODE='sync' sends them immediately (tests, scripts).
+"""
+import asyncio
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COALESCE_MS = 250
+DEFAULT_QUEUE_SIZE = 10000
+
+# Notifications per notifications_batch frame
+MAX_BATCH_SIZE = 200
+
+# Seconds given to the background thread to send the pending notifications at shutdown
+SHUTDOWN_TIMEOUT = 5
+
+_STOP = object()
+
+
+def _setting(name, default):
+    value = getattr(settings, name, None)
+    return default if value in (None, '') else value
+
+
+def is_sync():
+    return str(_setting('NOTIFICATION_DELIVERY_MODE', 'async')).lower() == 'sync'
+
+
+def build_frames(items):
+    """
+    Group (user_id, notification payload, unread count) items into one channel layer message per user
+    (and per MAX_BATCH_SIZE notifications), in the order the users were first notified.
+    """
+    by_user = {}
+    for user_id, payload, unread_count in items:
+        notifications, _count = by_user.get(user_id, ([], None))
+        notifications.append(payload)
+        # The items are queued in order: the last count is the latest
+        by_user[user_id] = (notifications, unread_count)
+
+    frames = []
+    for user_id, (notifications, unread_count) in by_user.items():
+        group = f'notifications_{user_id}'
+        for start in range(0, len(notifications), MAX_BATCH_SIZE):
+            chunk = notifications[start:start + MAX_BATCH_SIZE]
+            if len(chunk) == 1:
+                message = {'type': 'send_notification', 'notification': chunk[0], 'unread_count': unread_count}
+            else:
+                message = {'type': 'notifications_batch', 'notifications': chunk, 'unread_count': unread_count}
+            frames.append((group, message))
+    return frames
+
+
+async def _group_send_all(channel_layer, messages):
+    results = await asyncio.gather(
+        *(channel_layer.group_send(group, message) for group, message in messages),
+        return_exceptions=True,
+    )
+    for (group, _message), result in zip(messages, results):
+        if isinstance(result, Exception):
+            logger.error(f"[notification_delivery] Could not send to {group}: {result}")
+
+
+def send_items(items, fresh_loop=False):
+    """
+    Send (user_id, notification payload, unread count) items now, coalesced per user.
+    fresh_loop=True sends them from a new event loop instead of async_to_sync (interpreter exit).
+    """
+    if not items:
+        return
+    channel_layer = get_channel_layer()
+    if not channel_layer:
+        logger.warning("[notification_delivery] No channel layer available")
+        return
+    frames = build_frames(items)
+    if fresh_loop:
+        asyncio.run(_group_send_all(channel_layer, frames))
+    else:
+        async_to_sync(_group_send_all)(channel_layer, frames)
+    logger.info(f"[notification_delivery] Sent {len(items)} notifications in {len(frames)} frames")
+
+
+class NotificationDelivery:
+    """Queue + background thread of one process (use the module level notification_delivery)"""
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=int(_setting('NOTIFICATION_DELIVERY_QUEUE_SIZE', DEFAULT_QUEUE_SIZE)))
+        self._thread = None
+        self._at_exit = False
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='notification-delivery', daemon=True)
+                self._thread.start()
+
+    def deliver(self, items):
+        """Send (user_id, notification payload, unread count) items: immediately in sync mode, else coalesced"""
+        if is_sync():
+            send_items(items)
+            return
+        self._ensure_thread()
+        for index, item in enumerate(items):
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                # Backpressure: the thread is behind, send the rest inline rather than dropping them
+                send_items(items[index:])
+                return
+
+    def _next_window(self, window):
+        """Wait for the first item, then collect items until the coalescing window elapsed"""
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        items = [first]
+        deadline = time.monotonic() + window
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return items, True
+            items.append(item)
+        return items, False
+
+    def _run(self):
+        window = int(_setting('NOTIFICATION_COALESCE_MS', DEFAULT_COALESCE_MS)) / 1000
+        while True:
+            items, stop = self._next_window(window)
+            if items:
+                try:
+                    send_items(items, fresh_loop=self._at_exit)
+                except Exception:
+                    logger.exception(f"Notification delivery could not send {len(items)} notifications")
+            if stop:
+                return
+
+    def _drain(self):
+        items = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                items.append(item)
+        return items
+
+    def flush(self, timeout=SHUTDOWN_TIMEOUT):
+        """Send every queued notification before returning (stops the background thread, the next delivery restarts it)"""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.warning('Notification delivery did not finish in time, sending the remaining notifications inline')
+        remaining = self._drain()
+        if remaining:
+            try:
+                send_items(remaining, fresh_loop=self._at_exit)
+            except Exception:
+                logger.exception(f"Notification delivery could not send {len(remaining)} notifications")
+
+    def flush_at_exit(self):
+        """flush() for atexit: the executor used by async_to_sync is already shut down"""
+        self._at_exit = True
+        self.flush()
+
+    def pending(self):
+        return self._queue.qsize()
+
+
+notification_delivery = NotificationDelivery()
+
+atexit.register(notification_delivery.flush_at_exit)
+
+if hasattr(os, 'register_at_fork'):
+    # The child gets its own queue and thread
+    os.register_at_fork(after_in_child=notification_delivery._reset)
@@ -0,0 +1,223 @@
+"""
+Notification audiences, bulk creation and WebSocket fan-out.
+
+contact_audience_user_ids() resolves the users who can see a contact with one
+query, following the data_access rules of the contact lists: 'all' roles, the
+contact's teleoperator/confirmateur/creator, and 'team_only' users whose team
+(first membership, as in the access checks) contains one of them.
+
+create_notifications() inserts one Notification per user with bulk_create and
+pushes them once the transaction commits. bulk_create does not send post_save,
+so push_notifications() does what the signal does for single notifications, for
+the whole batch: one read of the unread counters, then the notifications go to
+the coalesced delivery (api/utils/notification_delivery.py), which sends one
+frame per user and window.
+
+Unread counters: the number of unread notifications of each user (message
+notifications excluded, as everywhere) is kept in the cache (Redis, or locmem in
+local dev). It is incremented when notifications are created and decremented
+when they are marked as read, so connecting to the WebSocket and marking as read
+do not count the table. A counter missing from the cache is rebuilt from the
+table, and counters expire after UNREAD_COUNT_TTL so drifts (rolled back
+creations, deleted notifications) do not last; the reconcile_unread_counts
+command rebuilds them all.
+"""
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, OuterRef, Q, Subquery
+
+from api.utils.notification_delivery import notification_delivery
+
+logger = logging.getLogger(__name__)
+
+# Notification types pushed by their own code path (send_event_notification, chat WebSocket)
+NOT_PUSHED_TYPES = ('event', 'message')
+
+# Notification types not included in the unread counts (handled by the chat)
+NOT_COUNTED_TYPES = ('message',)
+
+# Seconds before an unread counter is rebuilt from the table
+UNREAD_COUNT_TTL = 60 * 60
+
+
+def _unread_count_key(user_id):
+    return f'notifications:unread:{user_id}'
+
+
+def counted_unread_notifications():
+    """Notifications included in the unread counts"""
+    from api.models import Notification
+
+    return Notification.objects.filter(is_read=False).exclude(type__in=NOT_COUNTED_TYPES)
+
+
+def get_unread_counts(user_ids):
+    """Unread counts of the users from the cache, rebuilt from the table (one query) for the missing ones"""
+    user_ids = set(user_ids)
+    if not user_ids:
+        return {}
+    keys = {_unread_count_key(user_id): user_id for user_id in user_ids}
+    counts = {keys[key]: count for key, count in cache.get_many(keys).items()}
+    missing = user_ids - counts.keys()
+    if missing:
+        rebuilt = dict(
+            counted_unread_notifications().filter(user_id__in=missing)
+            .values('user_id')
+            .annotate(count=Count('id'))
+            .values_list('user_id', 'count')
+        )
+        for user_id in missing:
+            count = rebuilt.get(user_id, 0)
+            # add(): keep a counter updated by another process in the meantime
+            if not cache.add(_unread_count_key(user_id), count, UNREAD_COUNT_TTL):
+                count = cache.get(_unread_count_key(user_id), count)
+            counts[user_id] = count
+    return counts
+
+
+def get_unread_count(user_id):
+    return get_unread_counts([user_id])[user_id]
+
+
+def add_unread_count(user_id, delta):
+    """Update a cached counter, a missing counter is left to be rebuilt from the table"""
+    if not delta:
+        return
+    key = _unread_count_key(user_id)
+    try:
+        count = cache.incr(key, delta)
+    except ValueError:
+        return  # Not cached
+    if count < 0:
+        cache.delete(key)
+
+
+def count_created_notifications(notifications):
+    """Increment the counters of the users of new notifications"""
+    created = {}
+    for notification in notifications:
+        if not notification.is_read and notification.type not in NOT_COUNTED_TYPES:
+            created[notification.user_id] = created.get(notification.user_id, 0) + 1
+    for user_id, count in created.items():
+        add_unread_count(user_id, count)
+
+
+def mark_notifications_read(user_id, notification_id=None):
+    """
+    Mark one notification (any type) or all the counted notifications of the user as read.
+    Only the rows actually updated are decremented, so concurrent calls do not count twice.
+    """
+    from api.models import Notification
+
+    unread = counted_unread_notifications().filter(user_id=user_id)
+    if notification_id is not None:
+        unread = unread.filter(id=notification_id)
+    marked = unread.update(is_read=True)
+    if notification_id is not None and not marked:
+        # Not counted (message notification) or already read
+        Notification.objects.filter(id=notification_id, user_id=user_id, is_read=False).update(is_read=True)
+    add_unread_count(user_id, -marked)
+    return marked
+
+
+def reconcile_unread_counts(user_ids=None):
+    """Rebuild the counters of the users (all users by default) from the table, returns the number of users"""
+    from django.contrib.auth.models import User
+
+    if user_ids is None:
+        user_ids = User.objects.values_list('id', flat=True)
+    user_ids = list(user_ids)
+    counts = dict(
+        counted_unread_notifications().filter(user_id__in=user_ids)
+        .values('user_id')
+        .annotate(count=Count('id'))
+        .values_list('user_id', 'count')
+    )
+    cache.set_many(
+        {_unread_count_key(user_id): counts.get(user_id, 0) for user_id in user_ids},
+        UNREAD_COUNT_TTL,
+    )
+    return len(user_ids)
+
+
+def contact_audience_user_ids(contact):
+    """Django user IDs of the users who can see the contact (one query)"""
+    from api.models import TeamMember, UserDetails
+
+    contact_user_ids = [
+        user_id for user_id in (contact.teleoperator_id, contact.confirmateur_id, contact.creator_id) if user_id
+    ]
+    audience = Q(role_id__data_access='all')
+    if contact_user_ids:
+        first_team = Subquery(
+            TeamMember.objects.filter(user=OuterRef('pk')).order_by('id').values('team_id')[:1]
+        )
+        contact_teams = TeamMember.objects.filter(user__django_user_id__in=contact_user_ids).values('team_id')
+        audience |= Q(django_user_id__in=contact_user_ids)
+        audience |= Q(role_id__data_access='team_only', first_team_id__in=contact_teams)
+        queryset = UserDetails.objects.annotate(first_team_id=first_team)
+    else:
+        queryset = UserDetails.objects.all()
+    return set(
+        queryset.filter(role_id__isnull=False).filter(audience).values_list('django_user_id', flat=True)
+    )
+
+
+def notification_payload(notification):
+    """WebSocket representation of a Notification"""
+    return {
+        'id': notification.id,
+        'type': notification.type,
+        'title': notification.title,
+        'message': notification.message,
+        'message_id': notification.message_id if notification.message_id else None,
+        'email_id': notification.email_id if notification.email_id else None,
+        'contact_id': notification.contact_id if notification.contact_id else None,
+        'event_id': notification.event_id if notification.event_id else None,
+        'data': notification.data if notification.data else {},
+        'is_read': notification.is_read,
+        'created_at': notification.created_at.isoformat(),
+    }
+
+
+def push_notifications(notifications):
+    """Send saved notifications to their users over WebSocket, coalesced per user"""
+    notifications = [notification for notification in notifications if notification.type not in NOT_PUSHED_TYPES]
+    if not notifications:
+        return
+    unread_counts = get_unread_counts({notification.user_id for notification in notifications})
+    notification_delivery.deliver([
+        (notification.user_id, notification_payload(notification), unread_counts.get(notification.user_id, 0))
+        for notification in notifications
+    ])
+
+
+def create_notifications(user_ids, **fields):
+    """Create the same notification for every user (bulk_create) and push them when the transaction commits"""
+    from api.models import Notification
+    from api.utils.ids import new_ids
+
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return []
+    notifications = [
+        Notification(id=notification_id, user_id=user_id, **fields)
+        for notification_id, user_id in zip(new_ids(len(user_ids)), user_ids)
+    ]
+    Notification.objects.bulk_create(notifications)
+    try:
+        count_created_notifications(notifications)
+    except Exception as e:
+        logger.error(f"[create_notifications] Error updating unread counts: {e}")
+
+    def push():
+        try:
+            push_notifications(notifications)
+        except Exception as e:
+            # The notifications are saved, the clients get them on their next fetch
+            logger.error(f"[create_notifications] Error sending notifications via WebSocket: {e}")
+
+    transaction.on_commit(push)
+    return notifications
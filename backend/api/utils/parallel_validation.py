@@ -0,0 +1,90 @@
+"""
+Parallel row validation for large imports.
+
+Rows read from the file are grouped into shards (consecutive row ranges) and
+mapped/converted through the compiled ColumnMappingPlan in a pool of worker
+processes. Workers return one compact tuple of converted values per row (or an
+error message) and never touch the database: the importing process keeps the
+checks that need it and does all the inserts.
+
+Worker processes are started with 'spawn' (no fork of the web/worker process
+and its database connections), so the shard function and the plan converters
+only depend on the standard library.
+"""
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+logger = logging.getLogger(__name__)
+
+# Rows sent to a worker at once
+SHARD_SIZE = 5000
+
+# Shards submitted ahead of the one being consumed, per worker (bounds the memory used by pending shards)
+SHARDS_IN_FLIGHT_PER_WORKER = 2
+
+_worker_plan = None
+
+
+def _init_worker(plan):
+    global _worker_plan
+    _worker_plan = plan
+
+
+def _validate_row(plan, row):
+    try:
+        return plan.apply_tuple(row), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _validate_shard(rows):
+    return [_validate_row(_worker_plan, row) for row in rows]
+
+
+def _shards(rows, shard_size):
+    iterator = iter(rows)
+    while True:
+        shard = list(islice(iterator, shard_size))
+        if not shard:
+            return
+        yield shard
+
+
+def validate_rows(rows, plan, workers=1, shard_size=SHARD_SIZE):
+    """
+    Map and convert rows through `plan`, in file order.
+
+    Yields (values, error) for every row: values is the plan.apply_tuple() result
+    (None when the row could not be converted), error the exception message.
+    With workers > 1 the rows are validated by a pool of processes, shard by shard.
+    """
+    if workers <= 1:
+        # Row by row: the file is read as the caller consumes the results
+        for row in rows:
+            yield _validate_row(plan, row)
+        return
+
+    logger.info(f"Validating import rows with {workers} processes (shards of {shard_size} rows)")
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(plan,),
+    ) as executor:
+        pending = deque()
+        for shard in _shards(rows, shard_size):
+            pending.append(executor.submit(_validate_shard, shard))
+            if len(pending) >= workers * SHARDS_IN_FLIGHT_PER_WORKER:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def validation_workers(file_size, max_workers, min_bytes):
+    """Number of processes to use for a file: 1 (no pool) below min_bytes"""
+    if not max_workers or max_workers <= 1 or file_size is None or file_size < min_bytes:
+        return 1
+    return max_workers
@@ -11,13 +11,13 @@ from .models import Team
 from .models import Event
 from .models import TeamMember
 from .models import Log
-from .models import Role, Permission, PermissionRole, Status, Source, Platform, Document, SMTPConfig, Email, EmailSignature, ChatRoom, Message, Notification, NotificationPreference, FosseSettings, OTP, Transaction, RIB, ContactView
+from .models import Role, Permission, PermissionRole, Status, Source, Platform, Document, SMTPConfig, Email, EmailSignature, ChatRoom, Message, Notification, NotificationPreference, FosseSettings, OTP, Transaction, RIB, ContactView, ImportJob
 from .serializer import (
-    UserSerializer, ContactSerializer, ContactMigrationSerializer, NoteSerializer, NoteCategorySerializer,
+    UserSerializer, ContactSerializer, ContactMigrationSerializer, ContactMigrationLookups, NoteSerializer, NoteCategorySerializer,
     TeamSerializer, TeamDetailSerializer, UserDetailsSerializer, EventSerializer, TeamMemberSerializer,
-    RoleSerializer, PermissionSerializer, PermissionRoleSerializer, StatusSerializer, SourceSerializer, PlatformSerializer, LogSerializer, DocumentSerializer,
+    RoleSerializer, PermissionSerializer, PermissionRoleSerializer, StatusSerializer, SourceSerializer, PlatformSerializer, LogSerializer, LogSummarySerializer, DocumentSerializer,
     SMTPConfigSerializer, EmailSerializer, EmailSignatureSerializer, ChatRoomSerializer, MessageSerializer, NotificationSerializer,
-    NotificationPreferenceSerializer, FosseSettingsSerializer, TransactionSerializer, RIBSerializer, ContactViewSerializer
+    NotificationPreferenceSerializer, FosseSettingsSerializer, TransactionSerializer, RIBSerializer, ContactViewSerializer, ImportJobSerializer
 )
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.decorators import api_view, permission_classes
@@ -37,7 +37,6 @@ import os
 from django.core.files.uploadedfile import InMemoryUploadedFile
 from django.conf import settings
 from django.http import StreamingHttpResponse, HttpResponse
-from io import BytesIO
 import csv
 import io
 import smtplib
@@ -52,6 +51,33 @@ from email.header import decode_header
 import re
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
+from .utils.import_jobs import (
+    wants_background_import, enqueue_import_job, serialize_import_job, import_transaction,
+    create_chunked_import_job, check_import_parts, complete_chunked_upload, retry_import_job,
+)
+from .utils.email_verification_queue import cached_email_status, enqueue_email_verification
+from .utils.import_preview import (
+    PREVIEW_ROWS, parse_sample_size, column_stats, estimate_row_count, csv_row_bytes,
+)
+from .utils.import_readers import (
+    sniff_upload, looks_like_excel, looks_like_csv, open_text_stream, csv_row_reader,
+    load_workbook_streaming, excel_headers, excel_row_reader
+)
+from .utils.column_mapping import ColumnMappingPlan, to_digits, to_date, to_naive_datetime
+from .utils.parallel_validation import validate_rows, validation_workers
+from .utils.copy_loader import bulk_insert, restore_timestamps
+from .utils.ids import new_id, new_ids
+from .utils.log_writer import insert_logs, log_writer
+from .utils.notifications import (
+    contact_audience_user_ids,
+    create_notifications,
+    get_unread_count,
+    mark_notifications_read,
+)
+from .utils.import_dedupe import (
+    DUPLICATE_POLICIES, DEFAULT_DUPLICATE_POLICY,
+    DuplicateDetector, describe_duplicate, parse_duplicate_keys
+)
 
 
 def send_event_notification(event, notification_type='assigned', minutes_before=None):
@@ -160,9 +186,7 @@ def send_event_notification(event, notification_type='assigned', minutes_before=
         
         # Also create a database notification for persistence
         try:
-            notification_id = uuid.uuid4().hex[:12]
-            while Notification.objects.filter(id=notification_id).exists():
-                notification_id = uuid.uuid4().hex[:12]
+            notification_id = new_id()
             
             Notification.objects.create(
                 id=notification_id,
@@ -198,95 +222,26 @@ def send_contact_notification(contact, notification_type='nouveau_client'):
         notification_type: Type of notification (e.g., 'nouveau_client')
     """
     try:
-        # Get all users who can see this contact based on data_access permissions
-        users_to_notify = []
-        
-        # Get contact's assigned users
-        contact_users = []
-        if contact.teleoperator:
-            contact_users.append(contact.teleoperator)
-        if contact.confirmateur:
-            contact_users.append(contact.confirmateur)
-        if contact.creator:
-            contact_users.append(contact.creator)
-        
-        # Get all users with their roles and data_access
-        all_user_details = UserDetails.objects.select_related('role_id', 'django_user').all()
-        
-        for user_details in all_user_details:
-            user = user_details.django_user
-            if not user_details.role:
-                continue
-                
-            data_access = user_details.role.data_access
-            
-            # Check if user can see this contact
-            can_see_contact = False
-            
-            if data_access == 'all':
-                # User can see all contacts
-                can_see_contact = True
-            elif data_access == 'own_only':
-                # User can only see contacts where they are teleoperator or confirmateur
-                if user in contact_users:
-                    can_see_contact = True
-            elif data_access == 'team_only':
-                # User can see contacts from their team
-                team_member = user_details.team_memberships.select_related('team').first()
-                if team_member:
-                    team = team_member.team
-                    # Get all users in the same team
-                    team_user_ids = TeamMember.objects.filter(team=team).values_list('user__django_user__id', flat=True)
-                    # Check if contact's teleoperator/confirmateur/creator is in the same team
-                    if (contact.teleoperator and contact.teleoperator.id in team_user_ids) or \
-                       (contact.confirmateur and contact.confirmateur.id in team_user_ids) or \
-                       (contact.creator and contact.creator.id in team_user_ids) or \
-                       (user in contact_users):
-                        can_see_contact = True
-                else:
-                    # User has no team, fall back to own_only behavior
-                    if user in contact_users:
-                        can_see_contact = True
-            
-            if can_see_contact:
-                users_to_notify.append(user)
-        
-        # Remove duplicates
-        users_to_notify = list(set(users_to_notify))
-        
+        # Users who can see this contact based on data_access permissions (one query)
+        users_to_notify = contact_audience_user_ids(contact)
         if not users_to_notify:
             return  # No users to notify
         
         # Build notification message
         contact_name = f"{contact.fname} {contact.lname}".strip() or "Contact"
-        title = 'Nouveau client'
-        message = f"Le contact {contact_name} est devenu un nouveau client"
         
-        # Create database notifications for each user
-        # The signal handler will automatically send them via WebSocket
-        for user in users_to_notify:
-            try:
-                notification_id = uuid.uuid4().hex[:12]
-                while Notification.objects.filter(id=notification_id).exists():
-                    notification_id = uuid.uuid4().hex[:12]
-                
-                Notification.objects.create(
-                    id=notification_id,
-                    user=user,
-                    type='contact',
-                    title=title,
-                    message=message,
-                    contact_id=contact.id,
-                    is_read=False,
-                    data={
-                        'notification_type': notification_type,
-                    }
-                )
-            except Exception as e:
-                import traceback
-                print(f"Error creating notification for contact {contact.id} to user {user.id}: {str(e)}")
-                print(traceback.format_exc())
-                
+        # One insert for all the users, pushed over WebSocket in one batch after commit
+        create_notifications(
+            users_to_notify,
+            type='contact',
+            title='Nouveau client',
+            message=f"Le contact {contact_name} est devenu un nouveau client",
+            contact_id=contact.id,
+            is_read=False,
+            data={
+                'notification_type': notification_type,
+            }
+        )
     except Exception as e:
         import traceback
         print(f"Error sending contact notification: {str(e)}")
@@ -307,95 +262,26 @@ def send_transaction_update_notification(contact, transaction):
         if transaction.type != 'Ouverture':
             return
         
-        # Get all users who can see this contact based on data_access permissions
-        users_to_notify = []
-        
-        # Get contact's assigned users
-        contact_users = []
-        if contact.teleoperator:
-            contact_users.append(contact.teleoperator)
-        if contact.confirmateur:
-            contact_users.append(contact.confirmateur)
-        if contact.creator:
-            contact_users.append(contact.creator)
-        
-        # Get all users with their roles and data_access
-        all_user_details = UserDetails.objects.select_related('role_id', 'django_user').all()
-        
-        for user_details in all_user_details:
-            user = user_details.django_user
-            if not user_details.role:
-                continue
-                
-            data_access = user_details.role.data_access
-            
-            # Check if user can see this contact
-            can_see_contact = False
-            
-            if data_access == 'all':
-                # User can see all contacts
-                can_see_contact = True
-            elif data_access == 'own_only':
-                # User can only see contacts where they are teleoperator or confirmateur
-                if user in contact_users:
-                    can_see_contact = True
-            elif data_access == 'team_only':
-                # User can see contacts from their team
-                team_member = user_details.team_memberships.select_related('team').first()
-                if team_member:
-                    team = team_member.team
-                    # Get all users in the same team
-                    team_user_ids = TeamMember.objects.filter(team=team).values_list('user__django_user__id', flat=True)
-                    # Check if contact's teleoperator/confirmateur/creator is in the same team
-                    if (contact.teleoperator and contact.teleoperator.id in team_user_ids) or \
-                       (contact.confirmateur and contact.confirmateur.id in team_user_ids) or \
-                       (contact.creator and contact.creator.id in team_user_ids) or \
-                       (user in contact_users):
-                        can_see_contact = True
-                else:
-                    # User has no team, fall back to own_only behavior
-                    if user in contact_users:
-                        can_see_contact = True
-            
-            if can_see_contact:
-                users_to_notify.append(user)
-        
-        # Remove duplicates
-        users_to_notify = list(set(users_to_notify))
-        
+        # Users who can see this contact based on data_access permissions (one query)
+        users_to_notify = contact_audience_user_ids(contact)
         if not users_to_notify:
             return  # No users to notify
         
         # Build notification message
         contact_name = f"{contact.fname} {contact.lname}".strip() or "Contact"
-        title = 'Transaction modifiée'
-        message = f"La transaction d'ouverture a été modifiée pour le contact {contact_name}"
         
-        # Create database notifications for each user
-        # The signal handler will automatically send them via WebSocket
-        for user in users_to_notify:
-            try:
-                notification_id = uuid.uuid4().hex[:12]
-                while Notification.objects.filter(id=notification_id).exists():
-                    notification_id = uuid.uuid4().hex[:12]
-                
-                Notification.objects.create(
-                    id=notification_id,
-                    user=user,
-                    type='contact',
-                    title=title,
-                    message=message,
-                    contact_id=contact.id,
-                    is_read=False,
-                    data={
-                        'notification_type': 'transaction_updated',
-                        'transaction_id': transaction.id,
-                    }
-                )
-            except Exception as e:
-                import traceback
-                print(f"Error creating transaction update notification for contact {contact.id} to user {user.id}: {str(e)}")
-                print(traceback.format_exc())
+        create_notifications(
+            users_to_notify,
+            type='contact',
+            title='Transaction modifiée',
+            message=f"La transaction d'ouverture a été modifiée pour le contact {contact_name}",
+            contact_id=contact.id,
+            is_read=False,
+            data={
+                'notification_type': 'transaction_updated',
+                'transaction_id': transaction.id,
+            }
+        )
                 
     except Exception as e:
         import traceback
@@ -424,9 +310,7 @@ def send_confirmateur_assignment_notification(contact, confirmateur_user):
         # Create database notification
         # The signal handler will automatically send it via WebSocket
         try:
-            notification_id = uuid.uuid4().hex[:12]
-            while Notification.objects.filter(id=notification_id).exists():
-                notification_id = uuid.uuid4().hex[:12]
+            notification_id = new_id()
             
             Notification.objects.create(
                 id=notification_id,
@@ -763,15 +647,75 @@ def compute_changed_fields(old_value, new_value):
     
     return changes
 
-def create_log_entry(event_type, user_id, request, old_value=None, new_value=None, contact_id=None):
-    """Create a log entry for an activity"""
+def _user_log_name(user):
+    if not user:
+        return ''
+    return f"{getattr(user, 'first_name', '') or ''} {getattr(user, 'last_name', '') or ''}".strip()
+
+def contact_log_snapshot(contact):
+    """Contact fields kept in the logs, read from the model instead of ContactSerializer
+    Same values as clean_contact_data_for_log(ContactSerializer(contact).data) without the notes, logs and events queries
+    """
+    return clean_contact_data_for_log({
+        'firstName': contact.fname,
+        'lastName': contact.lname,
+        'mobile': str(contact.mobile) if contact.mobile is not None else '',
+        'source': contact.source.name if contact.source else '',
+        'statusName': contact.status.name if contact.status else '',
+        'teleoperatorName': _user_log_name(contact.teleoperator),
+        'creatorName': _user_log_name(contact.creator),
+        'confirmateurName': _user_log_name(contact.confirmateur),
+        'civility': contact.civility or '',
+        'email': contact.email,
+        'phone': str(contact.phone) if contact.phone is not None else '',
+        'birthDate': contact.birth_date.isoformat() if contact.birth_date else None,
+        'birthPlace': contact.birth_place or '',
+        'nationality': contact.nationality or '',
+        'address': contact.address or '',
+        'addressComplement': contact.address_complement or '',
+        'postalCode': contact.postal_code or '',
+        'city': contact.city or '',
+        'campaign': contact.campaign or '',
+    })
+
+def compact_contact_log_values(old_value, new_value):
+    """Keep only the changed fields of editContact log values
+    Returns (old_value, new_value) with the old and new values of the changed fields
+    """
+    changed_fields = compute_changed_fields(old_value or {}, new_value or {})
+    old_changes = {field: change['old'] for field, change in changed_fields.items()}
+    new_changes = {field: change['new'] for field, change in changed_fields.items()}
+    return old_changes, new_changes
+
+def reconstruct_contact_log_snapshots(contact, logs):
+    """Rebuild the full contact snapshots of editContact logs from their diffs
+    logs must be ordered from the newest to the oldest. The current state of the contact is
+    walked back log by log: returns {log id: (old snapshot, new snapshot)}. Changes made
+    without an editContact log (e.g. imports) are not known and show in the newer snapshots.
+    """
+    state = contact_log_snapshot(contact)
+    snapshots = {}
+    for log in logs:
+        if log.event_type != 'editContact':
+            continue
+        new_snapshot = dict(state)
+        new_snapshot.update({field: value for field, value in (log.new_value or {}).items() if field in new_snapshot})
+        # Fields cleared by the edit may only be in old_value
+        for field in (log.old_value or {}):
+            if field in new_snapshot and field not in (log.new_value or {}):
+                new_snapshot[field] = ''
+        old_snapshot = dict(new_snapshot)
+        old_snapshot.update({field: value for field, value in (log.old_value or {}).items() if field in old_snapshot})
+        snapshots[log.id] = (old_snapshot, new_snapshot)
+        state = old_snapshot
+    return snapshots
+
+def create_log_entry(event_type, user_id, request, old_value=None, new_value=None, contact_id=None, sync=False):
+    """
+    Create a log entry for an activity (written by the buffered log writer, see api/utils/log_writer.py).
+    sync=True inserts it right away, for responses that include the contact's logs.
+    """
     try:
-        print(f"[LOG ENTRY] Creating log entry: event_type={event_type}, contact_id={contact_id.id if contact_id else None}")
-        # Generate log ID
-        log_id = uuid.uuid4().hex[:12]
-        while Log.objects.filter(id=log_id).exists():
-            log_id = uuid.uuid4().hex[:12]
-        
         # Extract details from request
         details = {
             'ip_address': get_client_ip(request),
@@ -782,19 +726,26 @@ def create_log_entry(event_type, user_id, request, old_value=None, new_value=Non
         serialized_old_value = serialize_for_json(old_value) if old_value else {}
         serialized_new_value = serialize_for_json(new_value) if new_value else {}
         
-        print(f"[LOG ENTRY] Serialized data - old_value keys: {list(serialized_old_value.keys()) if serialized_old_value else []}, new_value keys: {list(serialized_new_value.keys()) if serialized_new_value else []}")
+        # Contact edits are stored as a diff (changed fields only), full snapshots can be rebuilt
+        # with reconstruct_contact_log_snapshots
+        if event_type == 'editContact':
+            serialized_old_value, serialized_new_value = compact_contact_log_values(serialized_old_value, serialized_new_value)
         
-        # Create log entry
-        log = Log.objects.create(
-            id=log_id,
+        # created_at is the time of the activity, not the time the writer flushes the row
+        log = Log(
+            id=new_id(),
             event_type=event_type,
             user_id=user_id if user_id else None,
             contact_id=contact_id if contact_id else None,
             details=details,
             old_value=serialized_old_value,
-            new_value=serialized_new_value
+            new_value=serialized_new_value,
+            created_at=timezone.now()
         )
-        print(f"[LOG ENTRY] Log entry created successfully: id={log.id}, event_type={log.event_type}, contact_id={log.contact_id.id if log.contact_id else None}")
+        if sync:
+            insert_logs([log])
+        else:
+            log_writer.write(log)
     except Exception as e:
         # Log the error but don't fail the request
         import traceback
@@ -966,10 +917,7 @@ class NoteListCreateView(generics.ListCreateAPIView):
         # Generate a unique ID if not provided
         if not note_id:
             # Generate a 12-character unique ID
-            note_id = uuid.uuid4().hex[:12]
-            # Ensure uniqueness (small chance of collision, but unlikely)
-            while Note.objects.filter(id=note_id).exists():
-                note_id = uuid.uuid4().hex[:12]
+            note_id = new_id()
         serializer.save(
             id=note_id,
             userId=self.request.user, 
@@ -1474,6 +1422,7 @@ class ContactView(generics.ListAPIView):
                         
                         # Get all contacts with status change logs
                         contacts_with_logs = Contact.objects.filter(
+                            contact_logs__event_type='editContact',
                             contact_logs__old_value__statusName__isnull=False,
                             contact_logs__new_value__statusName__isnull=False
                         ).exclude(
@@ -1489,6 +1438,7 @@ class ContactView(generics.ListAPIView):
                             # Get the most recent status change log where new_status matches current status
                             # This ensures we get the IMMEDIATE previous status (right before current)
                             most_recent_log = Log.objects.filter(
+                                event_type='editContact',
                                 contact_id=contact,
                                 old_value__statusName__isnull=False,
                                 new_value__statusName__isnull=False
@@ -1545,6 +1495,7 @@ class ContactView(generics.ListAPIView):
                         for teleoperator_name in regular_values:
                             # Find logs where teleoperator changed and old_value.teleoperatorName matches
                             matching_logs = Log.objects.filter(
+                                event_type='editContact',
                                 contact_id=OuterRef('pk'),
                                 old_value__teleoperatorName=teleoperator_name,
                                 new_value__teleoperatorName__isnull=False
@@ -1603,6 +1554,7 @@ class ContactView(generics.ListAPIView):
                         from .models import Log
                         # Get all contact IDs that have status change logs
                         contacts_with_status_changes = Log.objects.filter(
+                            event_type='editContact',
                             contact_id__isnull=False,
                             old_value__statusName__isnull=False,
                             new_value__statusName__isnull=False
@@ -2176,6 +2128,7 @@ class FosseContactView(generics.ListAPIView):
                                     matching_contact_ids = set()
                                     for teleoperator_name in regular_values:
                                         matching_logs = Log.objects.filter(
+                                            event_type='editContact',
                                             contact_id=OuterRef('pk'),
                                             old_value__teleoperatorName=teleoperator_name,
                                             new_value__teleoperatorName__isnull=False
@@ -2215,6 +2168,7 @@ class FosseContactView(generics.ListAPIView):
                                     # Empty previousStatus means no previous status (contact never had a status change)
                                     from .models import Log
                                     contacts_with_status_changes = Log.objects.filter(
+                                        event_type='editContact',
                                         contact_id__isnull=False,
                                         old_value__statusName__isnull=False,
                                         new_value__statusName__isnull=False
@@ -2226,6 +2180,7 @@ class FosseContactView(generics.ListAPIView):
                                     # Empty previousTeleoperator means no previous teleoperator (contact never had a teleoperator change)
                                     from .models import Log
                                     contacts_with_teleoperator_changes = Log.objects.filter(
+                                        event_type='editContact',
                                         contact_id__isnull=False,
                                         old_value__teleoperatorName__isnull=False,
                                         new_value__teleoperatorName__isnull=False
@@ -2489,6 +2444,7 @@ class FosseContactView(generics.ListAPIView):
                         from .models import Log
                         # Get all contact IDs that have status change logs
                         contacts_with_status_changes = Log.objects.filter(
+                            event_type='editContact',
                             contact_id__isnull=False,
                             old_value__statusName__isnull=False,
                             new_value__statusName__isnull=False
@@ -2504,6 +2460,7 @@ class FosseContactView(generics.ListAPIView):
                         from .models import Log
                         # Get all contact IDs that have teleoperator change logs
                         contacts_with_teleoperator_changes = Log.objects.filter(
+                            event_type='editContact',
                             contact_id__isnull=False,
                             old_value__teleoperatorName__isnull=False,
                             new_value__teleoperatorName__isnull=False
@@ -2638,6 +2595,7 @@ class FosseContactView(generics.ListAPIView):
                         for teleoperator_name in regular_values:
                             # Find logs where teleoperator changed and old_value.teleoperatorName matches
                             matching_logs = Log.objects.filter(
+                                event_type='editContact',
                                 contact_id=OuterRef('pk'),
                                 old_value__teleoperatorName=teleoperator_name,
                                 new_value__teleoperatorName__isnull=False
@@ -2980,23 +2938,14 @@ def contact_create(request):
     if email and Contact.objects.filter(email=email).exists():
         return Response({'error': 'Un contact avec cet email existe déjà'}, status=status.HTTP_400_BAD_REQUEST)
     
-    # Verify email domain (DNS MX record check)
+    # Email domain (DNS MX record check) is verified by the email verification worker,
+    # only an already cached domain result is used here so the request never waits on DNS
     email_verification_status = 'not_verified'
     if email:
-        try:
-            from api.utils.email_verification import verify_email_domain
-            email_verification_status, _ = verify_email_domain(email)
-        except Exception as e:
-            # If verification fails, default to not_verified
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.warning(f"Email verification failed for {email}: {str(e)}")
-            email_verification_status = 'not_verified'
+        email_verification_status = cached_email_status(email) or 'not_verified'
     
     # Generate contact ID
-    contact_id = uuid.uuid4().hex[:12]
-    while Contact.objects.filter(id=contact_id).exists():
-        contact_id = uuid.uuid4().hex[:12]
+    contact_id = new_id()
     
     # Helper function to safely get date
     def get_date(value):
@@ -3233,6 +3182,9 @@ def contact_create(request):
         else:
             contact = Contact.objects.create(**contact_data)
         
+        if email and email_verification_status == 'not_verified':
+            enqueue_email_verification([contact.id])
+        
         # Create log entry for contact creation
         serializer = ContactSerializer(contact, context={'request': request})
         contact_data_raw = serializer.data
@@ -3397,27 +3349,10 @@ def contacts_bulk_create(request):
             return None
     
     # Pre-fetch all related objects in bulk to avoid N+1 queries
-    status_ids = set()
-    source_ids = set()
-    teleoperator_ids = set()
-    confirmateur_ids = set()
-    platform_ids = set()
     emails_to_check = set()
     old_contact_ids_to_check = set()
     
     for contact_data in contacts_data:
-        if contact_data.get('statusId'):
-            status_ids.add(contact_data['statusId'])
-        if contact_data.get('sourceId'):
-            source_ids.add(contact_data['sourceId'])
-        if contact_data.get('teleoperatorId'):
-            # Normalize to string and strip whitespace for consistent lookup
-            teleoperator_ids.add(str(contact_data['teleoperatorId']).strip())
-        if contact_data.get('confirmateurId'):
-            # Normalize to string and strip whitespace for consistent lookup
-            confirmateur_ids.add(str(contact_data['confirmateurId']).strip())
-        if contact_data.get('platformId'):
-            platform_ids.add(contact_data['platformId'])
         email = contact_data.get('email', '').strip()
         if email:
             emails_to_check.add(email)
@@ -3426,116 +3361,20 @@ def contacts_bulk_create(request):
         if old_contact_id:
             old_contact_ids_to_check.add(old_contact_id)
     
-    # Bulk fetch all related objects
-    statuses_dict = {s.id: s for s in Status.objects.filter(id__in=status_ids)} if status_ids else {}
-    sources_dict = {s.id: s for s in Source.objects.filter(id__in=source_ids)} if source_ids else {}
-    platforms_dict = {p.id: p for p in Platform.objects.filter(id__in=platform_ids)} if platform_ids else {}
-    
-    # Fetch users (both Django User and UserDetails)
-    # IMPORTANT: Frontend sends UserDetails.id (string), not Django User.id (integer)
-    # We need to prioritize UserDetails lookup first, then fall back to Django User ID if numeric
-    teleoperator_users_dict = {}
-    confirmateur_users_dict = {}
-    if teleoperator_ids or confirmateur_ids:
-        from api.models import UserDetails
-        
-        # Step 1: Try UserDetails IDs first (strings) - this is what the frontend sends
-        # Convert all IDs to strings for UserDetails lookup (UserDetails.id is CharField)
-        user_details_id_list = [str(uid).strip() for uid in list(teleoperator_ids) + list(confirmateur_ids)]
-        user_details_list = UserDetails.objects.filter(id__in=user_details_id_list).select_related('django_user')
-        
-        # Track which IDs we found via UserDetails
-        found_via_userdetails = set()
-        
-        for ud in user_details_list:
-            if not ud.django_user:
-                continue
-                
-            ud_id_str = str(ud.id).strip()
-            ud_id_original = str(ud.id)
-            django_user = ud.django_user
-            
-            # Store in teleoperator dict if this UserDetails ID was requested for teleoperator
-            for uid in teleoperator_ids:
-                uid_str = str(uid).strip()
-                uid_original = str(uid)
-                
-                # Exact match: UserDetails ID matches the requested ID
-                if uid_str == ud_id_str or uid_original == ud_id_original or uid == ud.id:
-                    # Store with all possible key formats for reliable lookup
-                    teleoperator_users_dict[uid_str] = django_user
-                    teleoperator_users_dict[ud_id_str] = django_user
-                    if uid_original != uid_str:
-                        teleoperator_users_dict[uid_original] = django_user
-                    if ud_id_original != ud_id_str:
-                        teleoperator_users_dict[ud_id_original] = django_user
-                    found_via_userdetails.add(uid_str)
-                    found_via_userdetails.add(uid_original)
-                    break
-            
-            # Store in confirmateur dict if this UserDetails ID was requested for confirmateur
-            for uid in confirmateur_ids:
-                uid_str = str(uid).strip()
-                uid_original = str(uid)
-                
-                # Exact match: UserDetails ID matches the requested ID
-                if uid_str == ud_id_str or uid_original == ud_id_original or uid == ud.id:
-                    # Store with all possible key formats for reliable lookup
-                    confirmateur_users_dict[uid_str] = django_user
-                    confirmateur_users_dict[ud_id_str] = django_user
-                    if uid_original != uid_str:
-                        confirmateur_users_dict[uid_original] = django_user
-                    if ud_id_original != ud_id_str:
-                        confirmateur_users_dict[ud_id_original] = django_user
-                    found_via_userdetails.add(uid_str)
-                    found_via_userdetails.add(uid_original)
-                    break
-        
-        # Step 2: Fallback to Django User IDs only for IDs not found via UserDetails
-        # This handles cases where someone might send Django User ID directly
-        django_user_ids_to_try = []
-        for uid in list(teleoperator_ids) + list(confirmateur_ids):
-            uid_str = str(uid).strip()
-            # Only try Django User ID lookup if:
-            # 1. Not already found via UserDetails
-            # 2. Can be converted to integer (Django User IDs are integers)
-            if uid_str not in found_via_userdetails:
-                try:
-                    django_user_ids_to_try.append(int(uid))
-                except (ValueError, TypeError):
-                    pass
-        
-        if django_user_ids_to_try:
-            django_users = {u.id: u for u in DjangoUser.objects.filter(id__in=django_user_ids_to_try)}
-            
-            # Add Django users to dictionaries for IDs not found via UserDetails
-            for uid in teleoperator_ids:
-                uid_str = str(uid).strip()
-                if uid_str not in found_via_userdetails:
-                    try:
-                        int_uid = int(uid)
-                        if int_uid in django_users:
-                            teleoperator_users_dict[uid_str] = django_users[int_uid]
-                            teleoperator_users_dict[int_uid] = django_users[int_uid]
-                    except (ValueError, TypeError):
-                        pass
-            
-            for uid in confirmateur_ids:
-                uid_str = str(uid).strip()
-                if uid_str not in found_via_userdetails:
-                    try:
-                        int_uid = int(uid)
-                        if int_uid in django_users:
-                            confirmateur_users_dict[uid_str] = django_users[int_uid]
-                            confirmateur_users_dict[int_uid] = django_users[int_uid]
-                    except (ValueError, TypeError):
-                        pass
+    # Bulk fetch all related objects: one query per model, users resolved in memory
+    # IMPORTANT: Frontend sends UserDetails.id (string), not Django User.id (integer) - both are accepted
+    lookups = ContactMigrationLookups(contacts_data)
+    statuses_dict = lookups.statuses
+    sources_dict = lookups.sources
+    platforms_dict = lookups.platforms
+    teleoperator_users_dict = lookups.users
+    confirmateur_users_dict = lookups.users
     
     # Pre-fetch existing contacts by old_contact_id for updates
     # NOTE: We ONLY match by old_contact_id, NOT by email (duplicate emails are allowed)
     existing_contacts_by_old_id = {}
     if old_contact_ids_to_check:
-        existing_contacts = Contact.objects.filter(old_contact_id__in=old_contact_ids_to_check).exclude(old_contact_id__isnull=True).exclude(old_contact_id='')
+        existing_contacts = Contact.objects.filter(old_contact_id__in=old_contact_ids_to_check).exclude(old_contact_id__isnull=True).exclude(old_contact_id='').select_related('status')
         for contact in existing_contacts:
             if contact.old_contact_id:
                 existing_contacts_by_old_id[contact.old_contact_id.strip()] = contact
@@ -3606,15 +3445,9 @@ def contacts_bulk_create(request):
                 # Update status
                 status_id = contact_data.get('statusId')
                 if status_id and status_id in statuses_dict:
-                    # Get old status type directly from database to ensure we have the correct value
-                    old_status_type = None
-                    if existing_contact.status_id:
-                        old_status = Status.objects.filter(id=existing_contact.status_id).values_list('type', flat=True).first()
-                        if old_status:
-                            old_status_type = old_status
-                    
-                    # Get new status type directly from database
-                    new_status_type = Status.objects.filter(id=status_id).values_list('type', flat=True).first()
+                    # Status types come from the prefetched objects (no query per row)
+                    old_status_type = existing_contact.status.type if existing_contact.status_id else None
+                    new_status_type = statuses_dict[status_id].type
                     
                     # If moving from lead to client, set date_lead_to_client (only if not already set)
                     if old_status_type == 'lead' and new_status_type == 'client':
@@ -3825,9 +3658,7 @@ def contacts_bulk_create(request):
             
             # No existing contact found, proceed with creation
             # Generate contact ID
-            contact_id = uuid.uuid4().hex[:12]
-            while Contact.objects.filter(id=contact_id).exists() or any(c[0].id == contact_id for c in contacts_to_create):
-                contact_id = uuid.uuid4().hex[:12]
+            contact_id = new_id()
             
             # Build contact data
             contact_obj_data = {
@@ -3993,7 +3824,7 @@ def contacts_bulk_create(request):
                             'montant_encaisse', 'bonus', 'paiement', 'contrat',
                             'nom_de_scene', 'date_pro_tr', 'potentiel', 'produit',
                             'confirmateur_email', 'confirmateur_telephone',
-                            'created_at', 'updated_at', 'assigned_at'
+                            'created_at', 'updated_at', 'assigned_at', 'date_lead_to_client'
                         ],
                         batch_size=UPDATE_BATCH_SIZE
                     )
@@ -4036,7 +3867,7 @@ def contacts_bulk_create(request):
             with transaction.atomic():
                 for i in range(0, len(contacts_objects), BATCH_SIZE):
                     batch = contacts_objects[i:i + BATCH_SIZE]
-                    Contact.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+                    bulk_insert(Contact, batch, batch_size=BATCH_SIZE)
             
             # Note: Log entries are skipped for bulk operations to improve performance
             # If logging is needed, it can be added as a background task
@@ -4247,9 +4078,7 @@ def contacts_bulk_move_to_fosse(request):
                         # Only create log if there are actual changes (non-empty values)
                         if filtered_old_values or filtered_new_values:
                             # Generate unique log ID
-                            log_id = uuid.uuid4().hex[:12]
-                            while Log.objects.filter(id=log_id).exists():
-                                log_id = uuid.uuid4().hex[:12]
+                            log_id = new_id()
                             
                             # Serialize values for JSON storage
                             serialized_old_value = serialize_for_json(filtered_old_values) if filtered_old_values else {}
@@ -4299,11 +4128,17 @@ def contacts_bulk_move_to_fosse(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def csv_import_preview(request):
-    """Preview CSV or Excel file and return headers and sample rows"""
+    """
+    Preview CSV or Excel file and return headers, sample rows and per-column statistics.
+    Only the first rows are read (sampleSize, 500 by default): totalRows is estimated
+    unless the whole file fits in the sample or exactCount=true is passed.
+    """
     if 'file' not in request.FILES:
         return Response({'error': 'No file provided'}, status=status.HTTP_400_BAD_REQUEST)
     
     file = request.FILES['file']
+    sample_size = parse_sample_size(request.data.get('sampleSize') or request.query_params.get('sampleSize'))
+    exact_count = str(request.data.get('exactCount') or request.query_params.get('exactCount') or '').lower() in ('true', '1', 'yes')
     file_name = file.name.lower()
     
     # Check file extension
@@ -4324,69 +4159,26 @@ def csv_import_preview(request):
     try:
         if is_excel:
             # Handle Excel file
-            from openpyxl import load_workbook
-            
-            # Reset file pointer and read into BytesIO buffer
-            # CRITICAL: Must read in binary mode - Django UploadedFile.read() returns bytes by default
-            # but we need to ensure we're getting raw binary data, not decoded text
-            file.seek(0)
-            
-            # Django's UploadedFile.read() should return bytes, but let's be explicit
-            # Check if file has chunks() method (more reliable for binary)
-            if hasattr(file, 'chunks'):
-                # Read file in chunks to ensure binary mode
-                file_content = b''.join(file.chunks())
-            else:
-                # Fallback: read directly
-                file_content = file.read()
-            
-            # Ensure we have bytes, not a string
-            if isinstance(file_content, str):
-                # If somehow we got a string, this is wrong - log it
-                logger.error(f"ERROR: File content is string, not bytes! First 50 chars: {file_content[:50]}")
-                # Try to get binary content properly
-                file.seek(0)
-                if hasattr(file, 'open'):
-                    try:
-                        with file.open('rb') as f:
-                            file_content = f.read()
-                    except:
-                        # Last resort: encode the string (but this is wrong)
-                        file_content = file_content.encode('latin-1')
-                else:
-                    file_content = file_content.encode('latin-1')
+            head = sniff_upload(file)
             
             # Validate file content
-            if not file_content:
+            if not head:
                 return Response({'error': 'Excel file is empty'}, status=status.HTTP_400_BAD_REQUEST)
             
-            # Ensure file_content is bytes (Django UploadedFile should return bytes, but check to be safe)
-            if isinstance(file_content, str):
-                file_content = file_content.encode('latin-1')  # Preserve binary data
-            
-            # Validate that we have actual bytes
-            if not isinstance(file_content, bytes):
-                return Response({
-                    'error': f'Invalid file content type: {type(file_content)}. Expected bytes.'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
             # Check file size
-            if len(file_content) < 100:  # Excel files should be at least a few KB
+            if file.size is not None and file.size < 100:  # Excel files should be at least a few KB
                 return Response({
-                    'error': f'File is too small ({len(file_content)} bytes). Excel files should be larger.'
+                    'error': f'File is too small ({file.size} bytes). Excel files should be larger.'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
             # Check magic bytes for debugging
             import logging
             logger = logging.getLogger(__name__)
-            logger.info(f"Excel import: file size={len(file_content)}, first 10 bytes={file_content[:10]}")
-            
-            file_buffer = BytesIO(file_content)
-            file_buffer.seek(0)  # Ensure buffer is at the start
+            logger.info(f"Excel import: file size={file.size}, first 10 bytes={head[:10]}")
             
-            # Try to load the workbook - let openpyxl handle validation
+            # Try to load the workbook in read-only mode - let openpyxl handle validation
             try:
-                workbook = load_workbook(file_buffer, read_only=True, data_only=True)
+                workbook = load_workbook_streaming(file)
             except Exception as e:
                 # If it fails, provide a helpful error message
                 error_msg = str(e)
@@ -4403,72 +4195,76 @@ def csv_import_preview(request):
             sheet = workbook.active
             
             # Get headers from first row
-            headers = []
-            if sheet.max_row > 0:
-                first_row = sheet[1]
-                for i, cell in enumerate(first_row):
-                    value = cell.value
-                    if value and str(value).strip():
-                        headers.append(str(value).strip())
-                    else:
-                        headers.append(f'Colonne_{i+1}')
+            headers = excel_headers(sheet, placeholder='Colonne_{}')
             
-            # Get first 5 rows as preview
-            preview_rows = []
-            for row_idx, row in enumerate(sheet.iter_rows(min_row=2, max_row=6, values_only=False), start=2):
-                if row_idx > 6:
-                    break
-                row_dict = {}
-                for i, cell in enumerate(row):
-                    header = headers[i] if i < len(headers) else f'Colonne_{i+1}'
-                    value = cell.value
-                    row_dict[header] = str(value) if value is not None else ''
-                preview_rows.append(row_dict)
+            # Read only the sample rows (the header is row 1)
+            sample_rows = list(excel_row_reader(sheet, max_row=sample_size + 1))
             
-            # Count total rows (excluding header)
-            total_rows = sheet.max_row - 1 if sheet.max_row > 1 else 0
+            if len(sample_rows) < sample_size:
+                total_rows = len(sample_rows)
+                total_rows_estimated = False
+            elif exact_count:
+                total_rows = sum(1 for _ in excel_row_reader(sheet))
+                total_rows_estimated = False
+            else:
+                # Row count declared in the sheet dimensions (no need to read the rows)
+                max_row = sheet.max_row
+                total_rows = max(max_row - 1, len(sample_rows)) if max_row else len(sample_rows)
+                total_rows_estimated = not max_row
             
             workbook.close()
-            
-            return Response({
-                'headers': headers,
-                'preview': preview_rows,
-                'totalRows': total_rows
-            }, status=status.HTTP_200_OK)
         else:
-            # Read CSV file - accept any CSV format
-            file_content = file.read().decode('utf-8-sig')  # Handle BOM
-            csv_reader = csv.DictReader(io.StringIO(file_content))
+            # Read CSV file - accept any CSV format, decoded as a stream
+            csv_reader = csv.reader(open_text_stream(file))
             
             # Get headers - accept any header names
-            headers = csv_reader.fieldnames or []
+            raw_headers = next(csv_reader, None) or []
             
             # Clean headers (remove whitespace, handle empty headers)
-            cleaned_headers = []
-            for i, header in enumerate(headers):
+            headers = []
+            for i, header in enumerate(raw_headers):
                 if header and header.strip():
-                    cleaned_headers.append(header.strip())
+                    headers.append(header.strip())
                 else:
                     # If header is empty, create a placeholder
-                    cleaned_headers.append(f'Colonne_{i+1}')
-            
-            # Get first 5 rows as preview
-            preview_rows = []
-            csv_reader_preview = csv.DictReader(io.StringIO(file_content))
-            for i, row in enumerate(csv_reader_preview):
-                if i >= 5:
+                    headers.append(f'Colonne_{i+1}')
+            
+            # Read only the sample rows, the total is estimated from their average size
+            sample_rows = []
+            sampled_bytes = 0
+            for row in csv_reader:
+                sample_rows.append(row)
+                sampled_bytes += csv_row_bytes(row)
+                if len(sample_rows) >= sample_size:
                     break
-                preview_rows.append(row)
-            
-            # Count total rows (excluding header)
-            file_content_for_count = io.StringIO(file_content)
-            total_rows = sum(1 for _ in csv.DictReader(file_content_for_count))
             
-            return Response({
-                'headers': cleaned_headers if cleaned_headers else headers,
-                'preview': preview_rows,
-                'totalRows': total_rows
-            }, status=status.HTTP_200_OK)
+            if len(sample_rows) < sample_size:
+                total_rows = len(sample_rows)
+                total_rows_estimated = False
+            elif exact_count:
+                total_rows = len(sample_rows) + sum(1 for _ in csv_reader)
+                total_rows_estimated = False
+            else:
+                total_rows = estimate_row_count(file.size, csv_row_bytes(raw_headers), sampled_bytes, len(sample_rows))
+                total_rows_estimated = True
+        
+        preview_rows = [
+            {
+                header: str(row[i]) if i < len(row) and row[i] is not None else ''
+                for i, header in enumerate(headers)
+            }
+            for row in sample_rows[:PREVIEW_ROWS]
+        ]
+        
+        return Response({
+            'headers': headers,
+            'preview': preview_rows,
+            'totalRows': total_rows,
+            # Estimated totals are replaced by the exact count of the import job (or pass exactCount=true)
+            'totalRowsEstimated': total_rows_estimated,
+            'sampleSize': len(sample_rows),
+            'columns': column_stats(headers, sample_rows),
+        }, status=status.HTTP_200_OK)
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -4477,6 +4273,13 @@ def csv_import_preview(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def csv_import_contacts(request):
+    """Import contacts from CSV or Excel with column mapping - pass background=true to process the file as an import job"""
+    if 'file' in request.FILES and wants_background_import(request):
+        job = enqueue_import_job(request, 'contacts')
+        return Response({'jobId': job.id, 'job': serialize_import_job(job)}, status=status.HTTP_202_ACCEPTED)
+    return run_csv_import_contacts(request)
+
+def run_csv_import_contacts(request, progress=None):
     """Import contacts from CSV or Excel with column mapping - optimized for large imports"""
     import logging
     logger = logging.getLogger(__name__)
@@ -4522,7 +4325,15 @@ def csv_import_contacts(request):
     default_teleoperator_id = request.data.get('defaultTeleoperatorId')
     include_first_row = request.data.get('includeFirstRow', 'false').lower() == 'true'
     
-    logger.info(f"CSV import: default_status_id='{default_status_id}', include_first_row={include_first_row}")
+    # Duplicate handling: create (default, duplicates are only reported), skip or update
+    duplicate_policy = str(request.data.get('duplicatePolicy') or DEFAULT_DUPLICATE_POLICY).strip().lower()
+    if duplicate_policy not in DUPLICATE_POLICIES:
+        return Response({
+            'error': f"Invalid duplicatePolicy '{duplicate_policy}'. Expected one of: {', '.join(DUPLICATE_POLICIES)}"
+        }, status=status.HTTP_400_BAD_REQUEST)
+    duplicate_keys = parse_duplicate_keys(request.data.get('duplicateKeys'))
+    
+    logger.info(f"CSV import: default_status_id='{default_status_id}', include_first_row={include_first_row}, duplicate_policy={duplicate_policy}")
     
     # Clean and validate IDs (strip whitespace, handle empty strings)
     if default_status_id:
@@ -4549,57 +4360,24 @@ def csv_import_contacts(request):
     
     workbook = None
     try:
-        # Read file content first to detect actual file type (not just extension)
-        file.seek(0)
-        
-        # Django's UploadedFile.read() should return bytes, but let's be explicit
-        # Check if file has chunks() method (more reliable for binary)
-        if hasattr(file, 'chunks'):
-            # Read file in chunks to ensure binary mode
-            file_content = b''.join(file.chunks())
-        else:
-            # Fallback: read directly
-            file_content = file.read()
+        # Read the first bytes to detect actual file type (not just extension)
+        # The file itself is read incrementally below, never loaded in memory as a whole
+        head = sniff_upload(file)
         
         # Validate file content
-        if not file_content:
+        if not head:
             return Response({'error': 'File is empty'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Ensure we have bytes, not a string
-        if isinstance(file_content, str):
-            # If somehow we got a string, this is wrong - log it
-            logger.error(f"ERROR: File content is string, not bytes! First 50 chars: {file_content[:50]}")
-            # Try to get binary content properly
-            file.seek(0)
-            if hasattr(file, 'open'):
-                try:
-                    with file.open('rb') as f:
-                        file_content = f.read()
-                except:
-                    # Last resort: encode the string (but this is wrong)
-                    file_content = file_content.encode('latin-1')
-            else:
-                file_content = file_content.encode('latin-1')
-        
-        # Validate that we have actual bytes
-        if not isinstance(file_content, bytes):
-            return Response({
-                'error': f'Invalid file content type: {type(file_content)}. Expected bytes.'
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
         # Check magic bytes to detect actual file type (not just extension)
         # Excel files (.xlsx) start with PK (ZIP signature: 0x50 0x4B)
-        actual_is_excel = len(file_content) >= 2 and file_content[:2] == b'PK'
-        actual_is_csv = False
+        actual_is_excel = looks_like_excel(head)
         
         if not actual_is_excel:
             # Check if it looks like CSV text
             try:
-                first_line = file_content[:100].decode('utf-8', errors='ignore')
-                if ',' in first_line or ';' in first_line:
-                    logger.warning(f"File appears to be CSV, not Excel. First line: {first_line[:100]}")
+                if looks_like_csv(head):
+                    logger.warning(f"File appears to be CSV, not Excel. First line: {head[:100].decode('utf-8', errors='ignore')}")
                     logger.info(f"File detected as CSV content (not Excel), despite .xlsx extension. Treating as CSV.")
-                    actual_is_csv = True
                     is_excel = False
                     is_csv = True
             except:
@@ -4607,22 +4385,17 @@ def csv_import_contacts(request):
         
         # Read file based on ACTUAL type (not just extension)
         if is_excel and actual_is_excel:
-            from openpyxl import load_workbook
-            
             # Check file size
-            if len(file_content) < 100:  # Excel files should be at least a few KB
+            if file.size is not None and file.size < 100:  # Excel files should be at least a few KB
                 return Response({
-                    'error': f'File is too small ({len(file_content)} bytes). Excel files should be larger.'
+                    'error': f'File is too small ({file.size} bytes). Excel files should be larger.'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            logger.info(f"Excel import: file size={len(file_content)}, first 10 bytes={file_content[:10]}")
-            
-            file_buffer = BytesIO(file_content)
-            file_buffer.seek(0)  # Ensure buffer is at the start
+            logger.info(f"Excel import: file size={file.size}, first 10 bytes={head[:10]}")
             
-            # Try to load the workbook - let openpyxl handle validation
+            # Try to load the workbook in read-only mode - let openpyxl handle validation
             try:
-                workbook = load_workbook(file_buffer, read_only=True, data_only=True)
+                workbook = load_workbook_streaming(file)
             except Exception as e:
                 # Log the full error for debugging
                 import traceback
@@ -4645,115 +4418,23 @@ def csv_import_contacts(request):
             
             sheet = workbook.active
             
-            # Get headers
-            headers = []
-            # Safely check max_row - handle None case
-            max_row = sheet.max_row if sheet.max_row is not None else 0
-            if max_row > 0:
-                first_row = sheet[1]
-                if include_first_row:
-                    # Generate generic column headers - must match frontend format (Column1, Column2, etc.)
-                    num_columns = len(first_row)
-                    headers = [f'Column{i+1}' for i in range(num_columns)]
-                else:
-                    # Extract headers from first row
-                    for i, cell in enumerate(first_row):
-                        value = cell.value
-                        if value and str(value).strip():
-                            headers.append(str(value).strip())
-                        else:
-                            # Use Column1, Column2 format to match frontend
-                            headers.append(f'Column{i+1}')
-            
-            # Convert Excel rows to dict-like format compatible with CSV reader
-            # Use iter_rows() instead of indexing because read_only=True doesn't support indexing
-            class ExcelDictReader:
-                def __init__(self, sheet, headers, include_first_row=False):
-                    self.sheet = sheet
-                    self.headers = headers
-                    # Start from row 1 if include_first_row is True, otherwise start from row 2 (skip header)
-                    start_row = 1 if include_first_row else 2
-                    # Handle None max_row - use sheet.max_row if available, otherwise let iter_rows find the end
-                    self.max_row = sheet.max_row if sheet.max_row is not None else None
-                    
-                    # Create iterator using iter_rows() which works with read_only=True
-                    # iter_rows() returns rows with cell objects, not values
-                    # If max_row is None, don't pass it and let iter_rows iterate until the end
-                    if self.max_row is not None:
-                        self.row_iterator = sheet.iter_rows(
-                            min_row=start_row,
-                            max_row=self.max_row,
-                            values_only=False
-                        )
-                    else:
-                        self.row_iterator = sheet.iter_rows(
-                            min_row=start_row,
-                            values_only=False
-                        )
-                    self.iterator = iter(self.row_iterator)
-                
-                def __iter__(self):
-                    return self
-                
-                def __next__(self):
-                    try:
-                        row = next(self.iterator)
-                        row_dict = {}
-                        for i, cell in enumerate(row):
-                            header = self.headers[i] if i < len(self.headers) else f'Column{i+1}'
-                            value = cell.value
-                            row_dict[header] = str(value) if value is not None else ''
-                        return row_dict
-                    except StopIteration:
-                        raise
-                    except Exception as e:
-                        # If we can't read the row, stop iteration
-                        raise StopIteration
+            # Get headers (Column1, Column2 format for generated/empty headers to match frontend)
+            headers = excel_headers(sheet, include_first_row)
             
-            file_reader = ExcelDictReader(sheet, headers, include_first_row)
+            # Excel rows are read as tuples of cell values
+            file_reader = excel_row_reader(sheet, include_first_row)
         else:
-            # Read CSV file - use already-read file_content if available, otherwise read from file
-            if 'file_content' not in locals() or file_content is None:
-                file.seek(0)
-                file_content_bytes = file.read()
-            else:
-                file_content_bytes = file_content
-            
-            # Decode CSV content from bytes to string
-            try:
-                file_content = file_content_bytes.decode('utf-8-sig')  # Handle BOM
-            except UnicodeDecodeError:
-                # Try other encodings if UTF-8 fails
-                try:
-                    file_content = file_content_bytes.decode('latin-1')
-                except:
-                    file_content = file_content_bytes.decode('utf-8', errors='ignore')
-            
-            # For CSV files, handle include_first_row setting
-            # If include_first_row is True, we need to generate headers and include first row as data
-            # If include_first_row is False, treat first row as headers
-            csv_lines = file_content.strip().split('\n')
-            if not csv_lines:
+            # Read CSV file as a text stream decoded chunk by chunk
+            # If include_first_row is True, headers are generated and the first row is included as data
+            # If include_first_row is False, the first row is used as headers
+            file_reader, headers = csv_row_reader(file, include_first_row)
+            if not headers:
                 return Response({'error': 'CSV file is empty'}, status=status.HTTP_400_BAD_REQUEST)
             
             if include_first_row:
-                # Generate generic headers and include first row as data
-                first_row_values = csv_lines[0].split(',')
-                num_columns = len(first_row_values)
-                headers = [f'Column{i+1}' for i in range(num_columns)]
-                # Create a reader that includes the first row
-                all_lines = csv_lines  # Include first row
-                logger.info(f"CSV import: Including first row as data, generated {num_columns} column headers")
+                logger.info(f"CSV import: Including first row as data, generated {len(headers)} column headers")
             else:
-                # Use first row as headers
-                first_row = csv_lines[0]
-                headers = [h.strip().strip('"') for h in first_row.split(',')]
-                all_lines = csv_lines[1:]  # Skip first row
                 logger.info(f"CSV import: Using first row as headers: {headers[:5]}...")
-            
-            # Create CSV reader with appropriate data
-            csv_content = '\n'.join(all_lines)
-            file_reader = csv.DictReader(io.StringIO(csv_content), fieldnames=headers if include_first_row else None)
         
         # Get status and source objects
         status_obj = Status.objects.filter(id=default_status_id).first()
@@ -4832,495 +4513,374 @@ def csv_import_contacts(request):
             'duplicates': [],
             'total': 0,
             'imported': 0,
+            'updated': 0,
+            'skipped': 0,
             'failed': 0
         }
         
-        # Helper function to parse date
-        def parse_date(date_str):
-            if not date_str or date_str.strip() == '':
-                return None
-            date_str = date_str.strip()
-            # Try common date formats
-            formats = ['%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y', '%Y/%m/%d']
-            for fmt in formats:
-                try:
-                    return datetime.strptime(date_str, fmt).date()
-                except ValueError:
-                    continue
-            return None
-        
-        # Helper function to parse datetime
-        def parse_datetime(datetime_str):
-            if not datetime_str or datetime_str.strip() == '':
-                return None
-            datetime_str = datetime_str.strip()
-            # Try common datetime formats
-            formats = [
-                '%Y-%m-%d %H:%M:%S',
-                '%Y-%m-%d %H:%M',
-                '%Y-%m-%dT%H:%M:%S',
-                '%Y-%m-%dT%H:%M:%S.%f',
-                '%Y-%m-%dT%H:%M',
-                '%Y-%m-%d',
-                '%d/%m/%Y %H:%M:%S',
-                '%d/%m/%Y %H:%M',
-                '%d/%m/%Y',
-                '%m/%d/%Y %H:%M:%S',
-                '%m/%d/%Y %H:%M',
-                '%m/%d/%Y',
-            ]
-            for fmt in formats:
-                try:
-                    parsed = datetime.strptime(datetime_str, fmt)
-                    from django.utils import timezone
-                    return timezone.make_aware(parsed)
-                except ValueError:
-                    continue
-            return None
+        # Resolve the column mapping against the headers once: positional index + converter per field
+        mapping_plan = ColumnMappingPlan(
+            headers,
+            {field: column for field, column in column_mapping.items() if field in field_mapping},
+            converters={
+                'birthDate': to_date,
+                'createdAt': to_naive_datetime,
+                'updatedAt': to_naive_datetime,
+                'assignedAt': to_naive_datetime,
+                'phone': to_digits,
+                'mobile': to_digits,
+            },
+            multi_column_fields=('autreInformations',),
+        )
+        mapping_plan.log_missing('CSV import')
         
-        # Batch processing configuration
+        # Rows are parsed, checked and inserted batch by batch: only the current batch is kept in memory
+        # (plus the duplicate keys of the file, see DuplicateDetector)
         BATCH_SIZE = 1000  # Process contacts in batches of 1000
-        contacts_to_create = []
-        row_data_map = {}  # Map contact_id to row number and name for results
+        pending_contacts = []  # Parsed contacts of the current batch (not saved yet)
+        row_data_map = {}  # Map contact_id to row number and name for results (current batch)
+        
+        # Duplicate detection against existing contacts and earlier rows of the file:
+        # blocking keys (email, phone/mobile, old_contact_id) resolved with one IN query per key type and batch
+        detector = DuplicateDetector(duplicate_keys)
+        merged_existing_ids = set()  # Existing contacts already updated by an earlier row (update policy)
+        
+        def save_imported_contact(contact, row_data):
+            """Create one contact (fallback of the bulk insert) with the dates of its row"""
+            # Save contact first (without custom timestamps)
+            contact.save()
+            
+            # Update custom timestamps directly in database if provided
+            update_fields = {
+                field: row_data.get(field)
+                for field in ('created_at', 'updated_at', 'assigned_at')
+                if row_data.get(field)
+            }
+            if update_fields:
+                Contact.objects.filter(id=contact.id).update(**update_fields)
         
-        # First pass: Parse all rows and collect valid contacts
+        def import_pending_contacts():
+            from django.db import transaction, IntegrityError
+            
+            batch = list(pending_contacts)
+            pending_contacts.clear()
+            
+            # Verify email domains (DNS MX record check) once per batch - each distinct domain is resolved
+            # once and concurrently, with a short timeout to avoid blocking bulk imports
+            from api.utils.email_verification import verify_email_domains
+            try:
+                verification_results = verify_email_domains(
+                    [row_data_map[contact.id]['email'] for contact in batch if row_data_map[contact.id]['email']],
+                    timeout=2
+                )
+            except Exception as e:
+                # Don't let email verification block contact creation - contacts stay not_verified
+                logger.warning(f"CSV import: email verification failed for the batch: {e}")
+                verification_results = {}
+            for contact in batch:
+                email = row_data_map[contact.id]['email']
+                if email in verification_results:
+                    contact.email_verification_status = verification_results[email][0]
+            
+            contacts_to_insert = []
+            contacts_to_merge = []  # (existing contact id, parsed contact) for the update policy
+            matches = detector.check(batch, {contact.id: row_data_map[contact.id]['row'] for contact in batch})
+            for contact in batch:
+                contact_matches = matches.get(contact.id)
+                if not contact_matches:
+                    contacts_to_insert.append(contact)
+                    continue
+                
+                existing_ids = {match['existingContactId'] for match in contact_matches if 'existingContactId' in match}
+                if duplicate_policy == 'create':
+                    action = 'created'
+                    contacts_to_insert.append(contact)
+                elif (duplicate_policy == 'update' and len(existing_ids) == 1
+                      and not any('row' in match for match in contact_matches)
+                      and not existing_ids & merged_existing_ids):
+                    action = 'updated'
+                    merged_existing_ids.update(existing_ids)
+                    contacts_to_merge.append((existing_ids.pop(), contact))
+                else:
+                    # skip policy, duplicates of an earlier row, ambiguous matches (several existing contacts)
+                    # or an existing contact already updated by an earlier row
+                    action = 'skipped'
+                    results['skipped'] += 1
+                
+                row_data = row_data_map[contact.id]
+                results['duplicates'].append({
+                    'row': row_data['row'],
+                    'email': row_data['email'],
+                    'reason': describe_duplicate(contact_matches),
+                    'matches': contact_matches,
+                    'action': action,
+                    'data': {'firstName': contact.fname, 'lastName': contact.lname}
+                })
+            
+            # The merge, the inserts, the verification queue and the job checkpoint of the batch are
+            # committed together: a job resumed after a crash never imports the same batch twice
+            merged_ids_to_verify = []
+            batch = contacts_to_insert
+            imported_from = len(results['success'])
+            with transaction.atomic():
+                # Update policy: copy the mapped values of the rows onto the matching existing contacts
+                if contacts_to_merge:
+                    existing_contacts = Contact.objects.in_bulk([existing_id for existing_id, _ in contacts_to_merge])
+                    merged_fields = set()
+                    contacts_to_update = []
+                    for existing_id, contact in contacts_to_merge:
+                        existing_contact = existing_contacts.get(existing_id)
+                        row_data = row_data_map[contact.id]
+                        if existing_contact is None:
+                            continue
+                        fields = [field for field in row_data['fields'] if field not in ('created_at', 'updated_at', 'assigned_at')]
+                        for field in fields:
+                            setattr(existing_contact, field, getattr(contact, field))
+                        if 'email' in fields:
+                            existing_contact.email_verification_status = contact.email_verification_status
+                            fields.append('email_verification_status')
+                            if contact.email_verification_status == 'not_verified':
+                                merged_ids_to_verify.append(existing_contact.id)
+                        merged_fields.update(fields)
+                        contacts_to_update.append(existing_contact)
+                        results['success'].append({
+                            'row': row_data['row'],
+                            'contactId': existing_contact.id,
+                            'name': row_data['name'],
+                            'updated': True
+                        })
+                        results['updated'] += 1
+                    if contacts_to_update and merged_fields:
+                        Contact.objects.bulk_update(contacts_to_update, sorted(merged_fields), batch_size=BATCH_SIZE)
+                
+                # Bulk create the contacts of the batch
+                if batch:
+                    # Ensure all contacts have email_verification_status set
+                    for contact in batch:
+                        if not hasattr(contact, 'email_verification_status') or contact.email_verification_status is None:
+                            contact.email_verification_status = 'not_verified'
+                    try:
+                        # Savepoint: a failed bulk insert falls back to individual creates in the same transaction
+                        with transaction.atomic():
+                            bulk_insert(Contact, batch, batch_size=BATCH_SIZE)
+                            
+                            # The insert applies auto_now/auto_now_add: restore the dates from the CSV
+                            # with one set-based update for the whole batch
+                            restore_timestamps(Contact, [
+                                (contact.id, {
+                                    'created_at': row_data_map[contact.id].get('created_at'),
+                                    'updated_at': row_data_map[contact.id].get('updated_at'),
+                                    'assigned_at': row_data_map[contact.id].get('assigned_at'),
+                                })
+                                for contact in batch
+                            ], fields=('created_at', 'updated_at', 'assigned_at'), batch_size=BATCH_SIZE)
+                        
+                        # Add to success results
+                        for contact in batch:
+                            row_data = row_data_map[contact.id]
+                            results['success'].append({
+                                'row': row_data['row'],
+                                'contactId': contact.id,
+                                'name': row_data['name']
+                            })
+                            results['imported'] += 1
+                    except Exception as e:
+                        # Log the error for debugging
+                        import traceback
+                        error_details = traceback.format_exc()
+                        logger.error(f"Error bulk creating contacts batch: {str(e)}\n{error_details}")
+                        
+                        # Handle potential ID collisions or other errors by falling back to individual creates for this batch
+                        for contact in batch:
+                            try:
+                                with transaction.atomic():
+                                    save_imported_contact(contact, row_data_map[contact.id])
+                                row_data = row_data_map[contact.id]
+                                results['success'].append({
+                                    'row': row_data['row'],
+                                    'contactId': contact.id,
+                                    'name': row_data['name']
+                                })
+                                results['imported'] += 1
+                            except IntegrityError:
+                                # ID collision - regenerate and try once more
+                                old_id = contact.id
+                                contact.id = new_id()
+                                # Update row_data_map with new ID
+                                if old_id in row_data_map:
+                                    row_data_map[contact.id] = row_data_map.pop(old_id)
+                                
+                                try:
+                                    row_data = row_data_map[contact.id]
+                                    with transaction.atomic():
+                                        save_imported_contact(contact, row_data)
+                                    results['success'].append({
+                                        'row': row_data['row'],
+                                        'contactId': contact.id,
+                                        'name': row_data['name']
+                                    })
+                                    results['imported'] += 1
+                                except Exception as e:
+                                    row_data = row_data_map.get(contact.id, {})
+                                    results['errors'].append({
+                                        'row': row_data.get('row', 'unknown'),
+                                        'error': f'Failed to create contact: {str(e)}'
+                                    })
+                                    results['failed'] += 1
+                
+                # Contacts whose domain could not be verified during the import (DNS timeouts...)
+                # are verified again later by the email verification worker
+                imported_ids = {item['contactId'] for item in results['success'][imported_from:]}
+                enqueue_email_verification([
+                    contact.id for contact in batch
+                    if contact.id in imported_ids and contact.email and contact.email_verification_status == 'not_verified'
+                ] + merged_ids_to_verify)
+                
+                # Background job: record the last committed row with the batch
+                if progress is not None and row_data_map:
+                    progress.checkpoint(max(row_data['row'] for row_data in row_data_map.values()), results)
+            
+            # Release the batch
+            row_data_map.clear()
+        
+        # Parse the rows, each full batch is imported before reading further
         row_count = 0
         
         # Debug: Log file reader info
-        import logging
-        logger = logging.getLogger(__name__)
         if is_excel:
-            logger.info(f"Excel import: sheet.max_row={sheet.max_row}, include_first_row={include_first_row}, file_reader.max_row={file_reader.max_row if hasattr(file_reader, 'max_row') else 'N/A'}, file_reader.current_row={file_reader.current_row if hasattr(file_reader, 'current_row') else 'N/A'}")
+            logger.info(f"Excel import: sheet.max_row={sheet.max_row}, include_first_row={include_first_row}")
         else:
             logger.info(f"CSV import: include_first_row={include_first_row}")
         
+        # Rows are mapped and converted (dates, phones...) by a pool of processes for large files,
+        # this process keeps the checks that need the database and does the inserts.
+        # Only in the import worker (process_import_jobs): web requests and job threads stay in this process
+        workers = 1
+        if progress is not None and settings.IMPORT_JOB_RUNNER == 'worker':
+            workers = validation_workers(file.size, settings.IMPORT_VALIDATION_WORKERS, settings.IMPORT_PARALLEL_MIN_BYTES)
+        
         # Try to iterate and log first few rows
         rows_processed = 0
-        for row in file_reader:
-            rows_processed += 1
-            row_count += 1
-            # Adjust row number: if include_first_row is False, first data row is row 2 (row 1 is header)
-            # If include_first_row is True, first data row is row 1
-            row_num = row_count + 1 if not include_first_row else row_count
-            results['total'] += 1
+        with import_transaction(progress):
+            for values, validation_error in validate_rows(file_reader, mapping_plan, workers=workers):
+                rows_processed += 1
+                row_count += 1
+                # Adjust row number: if include_first_row is False, first data row is row 2 (row 1 is header)
+                # If include_first_row is True, first data row is row 1
+                row_num = row_count + 1 if not include_first_row else row_count
+                results['total'] += 1
+                if progress is not None:
+                    progress.update(results['total'])
+                    if progress.is_committed(row_num):
+                        # Already imported by a previous attempt of this job
+                        continue
             
-            # Log first row for debugging
-            if rows_processed == 1:
-                logger.info(f"First row processed: row_num={row_num}, row_keys={list(row.keys())[:5] if row else 'empty'}")
-                logger.info(f"Column mapping: {column_mapping}")
-                logger.info(f"Row data sample: {dict(list(row.items())[:3])}")
+                # Log first row for debugging
+                if rows_processed == 1:
+                    logger.info(f"First row processed: row_num={row_num}, mapped_values={len(values) if values else 0}")
+                    logger.info(f"Column mapping: {column_mapping}")
+                    logger.info(f"Row values sample: {list(values[:3]) if values else validation_error}")
             
-            try:
-                # Build contact data from CSV row
-                contact_data = {}
+                try:
+                    # Check if column_mapping is empty
+                    if not column_mapping:
+                        if rows_processed == 1:
+                            logger.error("Column mapping is empty! No data will be imported.")
+                        results['errors'].append({
+                            'row': row_num,
+                            'error': 'Column mapping is empty. Please configure column mapping in the import interface.'
+                        })
+                        results['failed'] += 1
+                        continue
+                
+                    if validation_error is not None:
+                        results['errors'].append({
+                            'row': row_num,
+                            'error': validation_error
+                        })
+                        results['failed'] += 1
+                        continue
                 
-                # Check if column_mapping is empty
-                if not column_mapping:
+                    # Build contact data from the values converted through the compiled column mapping
+                    contact_data = {
+                        field_mapping[frontend_field]: value
+                        for frontend_field, value in mapping_plan.to_dict(values).items()
+                    }
+                    for timestamp_field in ('created_at', 'updated_at', 'assigned_at'):
+                        if timestamp_field in contact_data:
+                            contact_data[timestamp_field] = timezone.make_aware(contact_data[timestamp_field])
+                
+                    mapped_fields = list(contact_data.keys())
+                
+                    # Log mapping results for first row
                     if rows_processed == 1:
-                        logger.error("Column mapping is empty! No data will be imported.")
-                    results['errors'].append({
+                        logger.info(f"Mapped {len(contact_data)} fields. Contact data keys: {list(contact_data.keys())}")
+                        logger.info(f"Sample contact_data: {dict(list(contact_data.items())[:5])}")
+                
+                    # Validate required fields - lastName is no longer required
+                    # Only statusId is required (handled via default_status_id)
+                
+                    # Store email for bulk duplicate check
+                    email = contact_data.get('email', '').strip()
+                
+                    # Email domain is verified per batch once all rows are parsed
+                    contact_data['email_verification_status'] = 'not_verified'
+                
+                    # Generate contact ID (unique per process, no check needed)
+                    contact_id = new_id()
+                
+                    contact_data['id'] = contact_id
+                    contact_data['creator'] = request.user
+                    contact_data['status'] = status_obj
+                    # Always set source if source_obj exists (even if None, to ensure it's saved)
+                    if source_obj is not None:
+                        contact_data['source'] = source_obj
+                    # Teleoperator is optional
+                    if teleoperator_obj is not None:
+                        contact_data['teleoperator'] = teleoperator_obj
+                        # Set assigned_at only if not provided in CSV (when importing contact with teleoperator)
+                        if 'assigned_at' not in contact_data:
+                            contact_data['assigned_at'] = timezone.now()
+                
+                    # Store custom timestamps separately for later update (since auto_now_add/auto_now may override)
+                    custom_created_at = contact_data.pop('created_at', None)
+                    custom_updated_at = contact_data.pop('updated_at', None)
+                    custom_assigned_at = contact_data.pop('assigned_at', None)
+                
+                    # Store row data for results
+                    contact_name = contact_data.get('fname', '')
+                    if contact_data.get('lname'):
+                        contact_name = f"{contact_data.get('fname')} {contact_data.get('lname')}"
+                
+                    row_data_map[contact_id] = {
                         'row': row_num,
-                        'error': 'Column mapping is empty. Please configure column mapping in the import interface.'
-                    })
-                    results['failed'] += 1
-                    continue
-                
-                # Map CSV columns to contact fields
-                mapped_fields_count = 0
-                for frontend_field, csv_column in column_mapping.items():
-                    if not csv_column:
-                        continue
-                    
-                    # Special handling for autreInformations - can be a list of columns
-                    if frontend_field == 'autreInformations' and isinstance(csv_column, list):
-                        # Concatenate multiple columns with line breaks
-                        values = []
-                        for col in csv_column:
-                            if not col:
-                                continue
-                            
-                            # Normalize column names for matching
-                            normalized_csv_column = col.strip().replace('"', '').replace("'", '')
-                            
-                            # Try exact match first, then case-insensitive match, then normalized match
-                            csv_value = None
-                            if col in row:
-                                csv_value = row[col]
-                            else:
-                                # Try case-insensitive match
-                                for key in row.keys():
-                                    if not key:
-                                        continue
-                                    normalized_key = key.strip().replace('"', '').replace("'", '')
-                                    # Try exact match first
-                                    if key.strip() == col.strip():
-                                        csv_value = row[key]
-                                        break
-                                    # Try normalized match
-                                    elif normalized_key.lower() == normalized_csv_column.lower():
-                                        csv_value = row[key]
-                                        break
-                                    # Try case-insensitive match on original values
-                                    elif key.strip().lower() == col.strip().lower():
-                                        csv_value = row[key]
-                                        break
-                            
-                            if csv_value is not None:
-                                # Convert to string and strip
-                                str_value = str(csv_value).strip() if csv_value else ''
-                                
-                                # Only add non-empty values
-                                if str_value:
-                                    values.append(str_value)
-                        
-                        # Concatenate all values with line breaks
-                        if values:
-                            model_field = field_mapping.get(frontend_field)
-                            if model_field:
-                                contact_data[model_field] = '\n'.join(values)
-                                mapped_fields_count += 1
-                        continue
-                    
-                    # Handle single column mapping (existing logic)
-                    # Normalize column names for matching (remove extra spaces, quotes, etc.)
-                    normalized_csv_column = csv_column.strip().replace('"', '').replace("'", '')
-                    
-                    # Try exact match first, then case-insensitive match, then normalized match
-                    csv_value = None
-                    if csv_column in row:
-                        csv_value = row[csv_column]
-                    else:
-                        # Try case-insensitive match
-                        for key in row.keys():
-                            if not key:
-                                continue
-                            normalized_key = key.strip().replace('"', '').replace("'", '')
-                            # Try exact match first
-                            if key.strip() == csv_column.strip():
-                                csv_value = row[key]
-                                break
-                            # Try normalized match
-                            elif normalized_key.lower() == normalized_csv_column.lower():
-                                csv_value = row[key]
-                                break
-                            # Try case-insensitive match on original values
-                            elif key.strip().lower() == csv_column.strip().lower():
-                                csv_value = row[key]
-                                break
-                    
-                    if csv_value is None:
-                        # Log missing column for debugging
-                        if rows_processed == 1:
-                            logger.warning(f"Column '{csv_column}' not found in row. Available columns: {list(row.keys())[:10]}")
-                        continue
-                    
-                    # Convert to string and strip - handle None, empty strings, and whitespace
-                    if csv_value is None:
-                        value = ''
-                    else:
-                        value = str(csv_value).strip() if csv_value else ''
-                    
-                    # Log phone field mapping for debugging
-                    if rows_processed == 1 and frontend_field in ['phone', 'mobile']:
-                        logger.info(f"Phone field mapping: frontend_field='{frontend_field}', csv_column='{csv_column}', csv_value='{csv_value}', value='{value}'")
-                    
-                    # Skip empty values for most fields (except where empty is meaningful)
-                    # But still process the field to count it as mapped
-                    
-                    # Map to model field name
-                    if frontend_field in field_mapping:
-                        model_field = field_mapping[frontend_field]
-                        
-                        # Handle date field
-                        if model_field == 'birth_date':
-                            parsed_date = parse_date(value)
-                            if parsed_date:
-                                contact_data[model_field] = parsed_date
-                        # Handle datetime fields - store separately for later update
-                        elif model_field in ['created_at', 'updated_at', 'assigned_at']:
-                            parsed_dt = parse_datetime(value)
-                            if parsed_dt:
-                                contact_data[model_field] = parsed_dt
-                        # Handle phone number fields - convert to integer
-                        elif model_field in ['phone', 'mobile']:
-                            if value:
-                                try:
-                                    # Remove all whitespace, dashes, parentheses, and other non-digit characters
-                                    cleaned = ''.join(c for c in value if c.isdigit())
-                                    if cleaned:
-                                        contact_data[model_field] = int(cleaned)
-                                        # Log for debugging first row
-                                        if rows_processed == 1:
-                                            logger.info(f"Phone field '{model_field}' mapped: original='{value}', cleaned='{cleaned}', final={contact_data[model_field]}")
-                                    else:
-                                        if rows_processed == 1:
-                                            logger.warning(f"Phone field '{model_field}' value '{value}' resulted in empty string after cleaning")
-                                except (ValueError, TypeError) as e:
-                                    # Log error but don't fail - phone is optional
-                                    if rows_processed == 1:
-                                        logger.warning(f"Error converting phone field '{model_field}' value '{value}' to int: {e}")
-                                    pass  # Skip invalid phone numbers
-                            else:
-                                if rows_processed == 1:
-                                    logger.info(f"Phone field '{model_field}' has empty value, skipping")
-                        # Handle old_contact_id - convert empty strings to None
-                        elif model_field == 'old_contact_id':
-                            if value:
-                                contact_data[model_field] = value
-                        # For other string fields, only set if value is not empty
-                        else:
-                            if value:
-                                contact_data[model_field] = value
-                        
-                        mapped_fields_count += 1
-                
-                # Log mapping results for first row
-                if rows_processed == 1:
-                    logger.info(f"Mapped {mapped_fields_count} fields. Contact data keys: {list(contact_data.keys())}")
-                    logger.info(f"Sample contact_data: {dict(list(contact_data.items())[:5])}")
-                
-                # Validate required fields - lastName is no longer required
-                # Only statusId is required (handled via default_status_id)
-                
-                # Store email for bulk duplicate check
-                email = contact_data.get('email', '').strip()
-                
-                # Verify email domain (DNS MX record check) - with short timeout to avoid blocking import
-                email_verification_status = 'not_verified'
-                if email:
-                    try:
-                        from api.utils.email_verification import verify_email_domain
-                        # Use short timeout (2 seconds) to avoid blocking bulk imports
-                        email_verification_status, _ = verify_email_domain(email, timeout=2)
-                    except Exception as e:
-                        # If verification fails for any reason, default to not_verified
-                        # Don't let email verification block contact creation
-                        email_verification_status = 'not_verified'
-                
-                contact_data['email_verification_status'] = email_verification_status
-                
-                # Generate contact ID (UUID collisions are extremely rare, so we'll handle them during bulk_create if needed)
-                contact_id = uuid.uuid4().hex[:12]
-                # Check uniqueness only against pending contacts in this batch
-                existing_ids = {c.id for c in contacts_to_create}
-                while contact_id in existing_ids:
-                    contact_id = uuid.uuid4().hex[:12]
-                
-                contact_data['id'] = contact_id
-                contact_data['creator'] = request.user
-                contact_data['status'] = status_obj
-                # Always set source if source_obj exists (even if None, to ensure it's saved)
-                if source_obj is not None:
-                    contact_data['source'] = source_obj
-                # Teleoperator is optional
-                if teleoperator_obj is not None:
-                    contact_data['teleoperator'] = teleoperator_obj
-                    # Set assigned_at only if not provided in CSV (when importing contact with teleoperator)
-                    if 'assigned_at' not in contact_data:
-                        from django.utils import timezone
-                        contact_data['assigned_at'] = timezone.now()
-                
-                # Store custom timestamps separately for later update (since auto_now_add/auto_now may override)
-                custom_created_at = contact_data.pop('created_at', None)
-                custom_updated_at = contact_data.pop('updated_at', None)
-                custom_assigned_at = contact_data.pop('assigned_at', None)
-                
-                # Store row data for results
-                contact_name = contact_data.get('fname', '')
-                if contact_data.get('lname'):
-                    contact_name = f"{contact_data.get('fname')} {contact_data.get('lname')}"
-                
-                row_data_map[contact_id] = {
-                    'row': row_num,
-                    'name': contact_name,
-                    'email': email,
-                    'created_at': custom_created_at,
-                    'updated_at': custom_updated_at,
-                    'assigned_at': custom_assigned_at,
-                }
+                        'name': contact_name,
+                        'email': email,
+                        'created_at': custom_created_at,
+                        'updated_at': custom_updated_at,
+                        'assigned_at': custom_assigned_at,
+                        'fields': mapped_fields,
+                    }
                 
-                # Create Contact instance (not saved yet)
-                contact = Contact(**contact_data)
-                contacts_to_create.append(contact)
+                    # Create Contact instance (not saved yet), imported with its batch
+                    pending_contacts.append(Contact(**contact_data))
+                    if len(pending_contacts) >= BATCH_SIZE:
+                        import_pending_contacts()
                 
-            except Exception as e:
-                import traceback
-                error_details = traceback.format_exc()
-                results['errors'].append({
-                    'row': row_num,
-                    'error': str(e),
-                    'details': error_details
-                })
-                results['failed'] += 1
-        
-        # Bulk check for duplicate emails - track but don't remove
-        emails_to_check = [row_data['email'] for row_data in row_data_map.values() if row_data['email']]
-        emails_seen_in_batch = {}  # Track emails within the CSV batch
-        if emails_to_check:
-            # Get existing emails and normalize to lowercase for comparison
-            existing_emails_lower = set()
-            existing_contacts_query = Contact.objects.filter(email__in=emails_to_check).exclude(email__isnull=True).exclude(email='')
-            for contact in existing_contacts_query:
-                if contact.email:
-                    existing_emails_lower.add(contact.email.lower())
-            
-            # Track duplicates but don't remove them - they will still be inserted
-            for contact in contacts_to_create:
-                email = row_data_map[contact.id]['email']
-                if email:
-                    email_lower = email.lower()
-                    is_duplicate = False
-                    duplicate_reason = None
-                    
-                    # Check if email exists in database (case-insensitive)
-                    if email_lower in existing_emails_lower:
-                        is_duplicate = True
-                        duplicate_reason = f'L\'email {email} existe déjà dans la base de données'
-                    
-                    # Check if email appears multiple times in this CSV batch
-                    if email_lower in emails_seen_in_batch:
-                        is_duplicate = True
-                        if duplicate_reason:
-                            duplicate_reason += f' et apparaît plusieurs fois dans le CSV (ligne {emails_seen_in_batch[email_lower]})'
-                        else:
-                            duplicate_reason = f'L\'email {email} apparaît plusieurs fois dans le CSV (première occurrence à la ligne {emails_seen_in_batch[email_lower]})'
-                    else:
-                        emails_seen_in_batch[email_lower] = row_data_map[contact.id]['row']
-                    
-                    if is_duplicate:
-                        row_num = row_data_map[contact.id]['row']
-                        results['duplicates'].append({
-                            'row': row_num,
-                            'email': email,
-                            'reason': duplicate_reason,
-                            'data': {'firstName': contact.fname, 'lastName': contact.lname}
-                        })
-        
-        # Bulk create contacts in batches
-        from django.db import transaction, IntegrityError
-        
-        with transaction.atomic():
-            for i in range(0, len(contacts_to_create), BATCH_SIZE):
-                batch = contacts_to_create[i:i + BATCH_SIZE]
-                try:
-                    # Ensure all contacts have email_verification_status set
-                    for contact in batch:
-                        if not hasattr(contact, 'email_verification_status') or contact.email_verification_status is None:
-                            contact.email_verification_status = 'not_verified'
-                    
-                    Contact.objects.bulk_create(batch, batch_size=BATCH_SIZE)
-                    
-                    # Update custom timestamps directly in database for contacts that have them from CSV
-                    for contact in batch:
-                        row_data = row_data_map[contact.id]
-                        custom_created_at = row_data.get('created_at')
-                        custom_updated_at = row_data.get('updated_at')
-                        custom_assigned_at = row_data.get('assigned_at')
-                        
-                        # Update timestamps directly in database if provided in CSV
-                        update_fields = {}
-                        if custom_created_at:
-                            update_fields['created_at'] = custom_created_at
-                        if custom_updated_at:
-                            update_fields['updated_at'] = custom_updated_at
-                        if custom_assigned_at:
-                            update_fields['assigned_at'] = custom_assigned_at
-                        
-                        if update_fields:
-                            Contact.objects.filter(id=contact.id).update(**update_fields)
-                    
-                    # Add to success results
-                    for contact in batch:
-                        row_data = row_data_map[contact.id]
-                        results['success'].append({
-                            'row': row_data['row'],
-                            'contactId': contact.id,
-                            'name': row_data['name']
-                        })
-                        results['imported'] += 1
                 except Exception as e:
-                    # Log the error for debugging
-                    import logging
                     import traceback
-                    logger = logging.getLogger(__name__)
                     error_details = traceback.format_exc()
-                    logger.error(f"Error bulk creating contacts batch: {str(e)}\n{error_details}")
-                    
-                    # Handle potential ID collisions or other errors by falling back to individual creates for this batch
-                    for contact in batch:
-                        try:
-                            row_data = row_data_map[contact.id]
-                            custom_created_at = row_data.get('created_at')
-                            custom_updated_at = row_data.get('updated_at')
-                            custom_assigned_at = row_data.get('assigned_at')
-                            
-                            # Ensure email_verification_status is set
-                            if not hasattr(contact, 'email_verification_status') or contact.email_verification_status is None:
-                                contact.email_verification_status = 'not_verified'
-                            
-                            # Save contact first (without custom timestamps)
-                            contact.save()
-                            
-                            # Update custom timestamps directly in database if provided
-                            update_fields = {}
-                            if custom_created_at:
-                                update_fields['created_at'] = custom_created_at
-                            if custom_updated_at:
-                                update_fields['updated_at'] = custom_updated_at
-                            if custom_assigned_at:
-                                update_fields['assigned_at'] = custom_assigned_at
-                            
-                            if update_fields:
-                                Contact.objects.filter(id=contact.id).update(**update_fields)
-                            
-                            results['success'].append({
-                                'row': row_data['row'],
-                                'contactId': contact.id,
-                                'name': row_data['name']
-                            })
-                            results['imported'] += 1
-                        except IntegrityError:
-                            # ID collision - regenerate and try once more
-                            old_id = contact.id
-                            contact.id = uuid.uuid4().hex[:12]
-                            # Update row_data_map with new ID
-                            if old_id in row_data_map:
-                                row_data_map[contact.id] = row_data_map.pop(old_id)
-                            
-                            try:
-                                row_data = row_data_map[contact.id]
-                                custom_created_at = row_data.get('created_at')
-                                custom_updated_at = row_data.get('updated_at')
-                                custom_assigned_at = row_data.get('assigned_at')
-                                
-                                # Save contact first (without custom timestamps)
-                                contact.save()
-                                
-                                # Update custom timestamps directly in database if provided
-                                update_fields = {}
-                                if custom_created_at:
-                                    update_fields['created_at'] = custom_created_at
-                                if custom_updated_at:
-                                    update_fields['updated_at'] = custom_updated_at
-                                if custom_assigned_at:
-                                    update_fields['assigned_at'] = custom_assigned_at
-                                
-                                if update_fields:
-                                    Contact.objects.filter(id=contact.id).update(**update_fields)
-                                
-                                results['success'].append({
-                                    'row': row_data['row'],
-                                    'contactId': contact.id,
-                                    'name': row_data['name']
-                                })
-                                results['imported'] += 1
-                            except Exception as e:
-                                row_data = row_data_map.get(contact.id, {})
-                                results['errors'].append({
-                                    'row': row_data.get('row', 'unknown'),
-                                    'error': f'Failed to create contact: {str(e)}'
-                                })
-                                results['failed'] += 1
+                    results['errors'].append({
+                        'row': row_num,
+                        'error': str(e),
+                        'details': error_details
+                    })
+                    results['failed'] += 1
+        
+            
+            # Last (incomplete) batch
+            if pending_contacts:
+                import_pending_contacts()
         
         # Create a single bulk log entry for the import (more efficient than individual logs)
         # This logs the import action itself rather than each individual contact
@@ -5334,9 +4894,7 @@ def csv_import_contacts(request):
                     'failed_count': results['failed'],
                 }
                 
-                log_id = uuid.uuid4().hex[:12]
-                while Log.objects.filter(id=log_id).exists():
-                    log_id = uuid.uuid4().hex[:12]
+                log_id = new_id()
                 
                 Log.objects.create(
                     id=log_id,
@@ -5387,6 +4945,13 @@ def csv_import_contacts(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def contacts_integration_update(request):
+    """Update existing contacts from CSV using old_contact_id mapping - pass background=true to process the file as an import job"""
+    if 'file' in request.FILES and wants_background_import(request):
+        job = enqueue_import_job(request, 'integration_update')
+        return Response({'jobId': job.id, 'job': serialize_import_job(job)}, status=status.HTTP_202_ACCEPTED)
+    return run_contacts_integration_update(request)
+
+def run_contacts_integration_update(request, progress=None):
     """
     Update existing contacts with timestamp fields from CSV using old_contact_id mapping.
     
@@ -5448,15 +5013,17 @@ def contacts_integration_update(request):
         }, status=status.HTTP_400_BAD_REQUEST)
     
     try:
-        import csv
-        import io
         from datetime import datetime
         from django.utils import timezone
         import pytz
         
         # Read CSV file
-        csv_content = csv_file.read().decode('utf-8-sig')  # Handle BOM
-        csv_reader = csv.DictReader(io.StringIO(csv_content))
+        # Decode the CSV as a stream (the upload is never loaded in memory as a whole)
+        csv_reader, headers = csv_row_reader(csv_file)
+        
+        # Resolve the column mapping against the headers once (positional index per field)
+        mapping_plan = ColumnMappingPlan(headers, column_mapping)
+        mapping_plan.log_missing('Integration update')
         
         # Helper function to parse datetime
         def parse_datetime(datetime_str):
@@ -5515,24 +5082,6 @@ def contacts_integration_update(request):
                     continue
             return None
         
-        # Pre-load all contacts with old_contact_id into a dictionary for fast lookup
-        # IMPORTANT: Only match by old_contact_id, NEVER by email
-        contacts_by_old_id = {}
-        contacts_with_old_id = Contact.objects.filter(old_contact_id__isnull=False).exclude(old_contact_id='')
-        duplicate_old_ids = set()
-        for contact in contacts_with_old_id:
-            old_id_key = str(contact.old_contact_id).strip()
-            if old_id_key in contacts_by_old_id:
-                # Track duplicate old_contact_id values (shouldn't happen but handle gracefully)
-                duplicate_old_ids.add(old_id_key)
-            contacts_by_old_id[old_id_key] = contact
-        
-        # Log warning if duplicates found
-        if duplicate_old_ids:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.warning(f"Found {len(duplicate_old_ids)} duplicate old_contact_id values: {list(duplicate_old_ids)[:10]}")
-        
         # Pre-load users and sources for efficient lookup
         from api.models import UserDetails, Source
         users_by_userdetails_id = {}
@@ -5561,9 +5110,89 @@ def contacts_integration_update(request):
             'failed': 0
         }
         
+        # Rows are matched and written per chunk: one query resolves the old_contact_id of the
+        # whole chunk (indexed lookup) and the changes are written with bulk_update
+        BATCH_SIZE = 1000
+        pending_updates = []  # (row_num, old_contact_id, {field: value}, updated field names)
+        
+        def apply_pending_updates():
+            from django.db import transaction
+            
+            # IMPORTANT: Only match by old_contact_id, NEVER by email
+            old_ids = {old_id for _, old_id, _, _ in pending_updates}
+            contact_ids_by_old_id = {}
+            duplicate_old_ids = set()
+            for old_id, contact_id in Contact.objects.filter(old_contact_id__in=old_ids).values_list('old_contact_id', 'id'):
+                if old_id in contact_ids_by_old_id and contact_ids_by_old_id[old_id] != contact_id:
+                    # Track duplicate old_contact_id values (shouldn't happen but handle gracefully)
+                    duplicate_old_ids.add(old_id)
+                contact_ids_by_old_id[old_id] = contact_id
+            
+            if duplicate_old_ids:
+                import logging
+                logger = logging.getLogger(__name__)
+                logger.warning(f"Found {len(duplicate_old_ids)} duplicate old_contact_id values: {list(duplicate_old_ids)[:10]}")
+            
+            values_by_contact = {}  # contact id -> values, a later row for the same contact overrides earlier ones
+            matched_rows = []
+            for row_num, old_contact_id_value, values, updated_field_names in pending_updates:
+                # If duplicate old_contact_id values exist, reject the update to prevent wrong contact updates
+                if old_contact_id_value in duplicate_old_ids:
+                    results['errors'].append({
+                        'row': row_num,
+                        'error': f'Multiple contacts found with old_contact_id: {old_contact_id_value}. Please ensure old_contact_id values are unique in the database before importing.'
+                    })
+                    results['failed'] += 1
+                    continue
+                
+                contact_id = contact_ids_by_old_id.get(old_contact_id_value)
+                if not contact_id:
+                    results['errors'].append({
+                        'row': row_num,
+                        'error': f'Contact not found with old_contact_id: {old_contact_id_value}'
+                    })
+                    results['failed'] += 1
+                    continue
+                
+                values_by_contact.setdefault(contact_id, {}).update(values)
+                matched_rows.append((row_num, old_contact_id_value, contact_id, updated_field_names))
+            pending_updates.clear()
+            
+            # bulk_update writes the given values as they are (auto_now and auto_now_add are not applied),
+            # contacts are grouped by the set of fields they update
+            contacts_by_fields = {}
+            for contact_id, values in values_by_contact.items():
+                contacts_by_fields.setdefault(tuple(sorted(values)), []).append(Contact(id=contact_id, **values))
+            try:
+                with transaction.atomic():
+                    for field_names, contacts in contacts_by_fields.items():
+                        Contact.objects.bulk_update(contacts, list(field_names), batch_size=BATCH_SIZE)
+            except Exception as update_error:
+                import traceback
+                error_details = traceback.format_exc()
+                for row_num, _, _, _ in matched_rows:
+                    results['errors'].append({
+                        'row': row_num,
+                        'error': f'Error updating contact: {str(update_error)}',
+                        'details': error_details
+                    })
+                    results['failed'] += 1
+                return
+            
+            for row_num, old_contact_id_value, contact_id, updated_field_names in matched_rows:
+                results['success'].append({
+                    'row': row_num,
+                    'contactId': contact_id,
+                    'oldContactId': old_contact_id_value,
+                    'updatedFields': updated_field_names
+                })
+                results['updated'] += 1
+        
         # Process CSV rows
         for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (row 1 is header)
             results['total'] += 1
+            if progress is not None:
+                progress.update(results['total'])
             try:
                 # Get old_contact_id from CSV
                 old_contact_id_col = column_mapping.get('oldContactId', '')
@@ -5575,16 +5204,7 @@ def contacts_integration_update(request):
                     results['failed'] += 1
                     continue
                 
-                # Try exact match first, then case-insensitive match
-                old_contact_id_value = None
-                if old_contact_id_col in row:
-                    old_contact_id_value = row[old_contact_id_col]
-                else:
-                    # Try case-insensitive match
-                    for key in row.keys():
-                        if key and key.strip().lower() == old_contact_id_col.strip().lower():
-                            old_contact_id_value = row[key]
-                            break
+                old_contact_id_value = mapping_plan.get(row, 'oldContactId')
                 
                 if not old_contact_id_value or not old_contact_id_value.strip():
                     results['errors'].append({
@@ -5596,37 +5216,7 @@ def contacts_integration_update(request):
                 
                 old_contact_id_value = str(old_contact_id_value).strip()
                 
-                # Find contact by old_contact_id ONLY - NEVER use email for matching
-                # This ensures we update the correct contact based on old_contact_id
-                # If duplicate old_contact_id values exist, reject the update to prevent wrong contact updates
-                if old_contact_id_value in duplicate_old_ids:
-                    results['errors'].append({
-                        'row': row_num,
-                        'error': f'Multiple contacts found with old_contact_id: {old_contact_id_value}. Please ensure old_contact_id values are unique in the database before importing.'
-                    })
-                    results['failed'] += 1
-                    continue
-                
-                contact = contacts_by_old_id.get(old_contact_id_value)
-                if not contact:
-                    results['errors'].append({
-                        'row': row_num,
-                        'error': f'Contact not found with old_contact_id: {old_contact_id_value}'
-                    })
-                    results['failed'] += 1
-                    continue
-                
-                # Helper function to get CSV value
-                def get_csv_value(column_name):
-                    if not column_name:
-                        return None
-                    if column_name in row:
-                        return row[column_name]
-                    # Try case-insensitive match
-                    for key in row.keys():
-                        if key and key.strip().lower() == column_name.strip().lower():
-                            return row[key]
-                    return None
+                # The contact is matched by old_contact_id ONLY (never by email) when the chunk is applied
                 
                 # Parse timestamp fields and other fields
                 update_fields = {}
@@ -5634,7 +5224,7 @@ def contacts_integration_update(request):
                 
                 # Handle created_at
                 if 'createdAt' in column_mapping and column_mapping['createdAt']:
-                    created_at_value = get_csv_value(column_mapping['createdAt'])
+                    created_at_value = mapping_plan.get(row, 'createdAt')
                     if created_at_value and str(created_at_value).strip():
                         parsed_dt = parse_datetime(created_at_value)
                         if parsed_dt:
@@ -5643,7 +5233,7 @@ def contacts_integration_update(request):
                 
                 # Handle updated_at
                 if 'updatedAt' in column_mapping and column_mapping['updatedAt']:
-                    updated_at_value = get_csv_value(column_mapping['updatedAt'])
+                    updated_at_value = mapping_plan.get(row, 'updatedAt')
                     if updated_at_value and str(updated_at_value).strip():
                         parsed_dt = parse_datetime(updated_at_value)
                         if parsed_dt:
@@ -5652,7 +5242,7 @@ def contacts_integration_update(request):
                 
                 # Handle assigned_at
                 if 'assignedAt' in column_mapping and column_mapping['assignedAt']:
-                    assigned_at_value = get_csv_value(column_mapping['assignedAt'])
+                    assigned_at_value = mapping_plan.get(row, 'assignedAt')
                     if assigned_at_value and str(assigned_at_value).strip():
                         parsed_dt = parse_datetime(assigned_at_value)
                         if parsed_dt:
@@ -5661,7 +5251,7 @@ def contacts_integration_update(request):
                 
                 # Handle teleoperatorId
                 if 'teleoperatorId' in column_mapping and column_mapping['teleoperatorId']:
-                    teleoperator_value = get_csv_value(column_mapping['teleoperatorId'])
+                    teleoperator_value = mapping_plan.get(row, 'teleoperatorId')
                     if teleoperator_value and teleoperator_value.strip():
                         teleoperator_value_str = str(teleoperator_value).strip()
                         
@@ -5702,7 +5292,7 @@ def contacts_integration_update(request):
                 
                 # Handle confirmateurId
                 if 'confirmateurId' in column_mapping and column_mapping['confirmateurId']:
-                    confirmateur_value = get_csv_value(column_mapping['confirmateurId'])
+                    confirmateur_value = mapping_plan.get(row, 'confirmateurId')
                     if confirmateur_value and confirmateur_value.strip():
                         confirmateur_value_str = str(confirmateur_value).strip()
                         
@@ -5743,7 +5333,7 @@ def contacts_integration_update(request):
                 
                 # Handle sourceId
                 if 'sourceId' in column_mapping and column_mapping['sourceId']:
-                    source_value = get_csv_value(column_mapping['sourceId'])
+                    source_value = mapping_plan.get(row, 'sourceId')
                     if source_value and source_value.strip():
                         source_value_str = str(source_value).strip()
                         
@@ -5769,62 +5359,12 @@ def contacts_integration_update(request):
                         # Empty string means clear the source
                         contact_updates['source'] = None
                 
-                # Update contact if we have fields to update
+                # Queue the update, it is written with the other rows of the chunk
                 if update_fields or contact_updates:
-                    # Prepare all fields for database update
-                    # We need to update ForeignKey fields by their ID, not the object
-                    db_update_fields = {}
-                    
-                    # Add timestamp fields
-                    if update_fields:
-                        db_update_fields.update(update_fields)
-                    
-                    # Convert ForeignKey objects to IDs for database update
-                    if contact_updates:
-                        if 'teleoperator' in contact_updates:
-                            # teleoperator is a DjangoUser object, so .id gives us the Django User ID (integer)
-                            db_update_fields['teleoperator_id'] = contact_updates['teleoperator'].id if contact_updates['teleoperator'] else None
-                        if 'confirmateur' in contact_updates:
-                            # confirmateur is a DjangoUser object, so .id gives us the Django User ID (integer)
-                            db_update_fields['confirmateur_id'] = contact_updates['confirmateur'].id if contact_updates['confirmateur'] else None
-                        if 'source' in contact_updates:
-                            # source is a Source object, so .id gives us the Source ID (string)
-                            db_update_fields['source_id'] = contact_updates['source'].id if contact_updates['source'] else None
-                    
-                    # Use direct database update to bypass auto_now and auto_now_add
-                    # This ensures our CSV values are preserved
-                    # Note: .update() bypasses Django's save() method, so auto_now and auto_now_add are ignored
-                    if db_update_fields:
-                        try:
-                            # Use update() which bypasses auto_now and auto_now_add
-                            rows_updated = Contact.objects.filter(id=contact.id).update(**db_update_fields)
-                            if rows_updated == 0:
-                                results['errors'].append({
-                                    'row': row_num,
-                                    'error': f'Contact update failed - no rows updated'
-                                })
-                                results['failed'] += 1
-                                continue
-                            contact.refresh_from_db()
-                        except Exception as update_error:
-                            import traceback
-                            error_details = traceback.format_exc()
-                            results['errors'].append({
-                                'row': row_num,
-                                'error': f'Error updating contact: {str(update_error)}',
-                                'details': error_details
-                            })
-                            results['failed'] += 1
-                            continue
-                    
                     updated_field_names = list(update_fields.keys()) + list(contact_updates.keys())
-                    results['success'].append({
-                        'row': row_num,
-                        'contactId': contact.id,
-                        'oldContactId': old_contact_id_value,
-                        'updatedFields': updated_field_names
-                    })
-                    results['updated'] += 1
+                    pending_updates.append((row_num, old_contact_id_value, {**update_fields, **contact_updates}, updated_field_names))
+                    if len(pending_updates) >= BATCH_SIZE:
+                        apply_pending_updates()
                 else:
                     results['errors'].append({
                         'row': row_num,
@@ -5842,6 +5382,9 @@ def contacts_integration_update(request):
                 })
                 results['failed'] += 1
         
+        if pending_updates:
+            apply_pending_updates()
+        
         return Response(results, status=status.HTTP_200_OK)
         
     except Exception as e:
@@ -5869,64 +5412,41 @@ def contacts_by_old_ids(request):
         if not normalized_ids:
             return Response({'contacts': []}, status=status.HTTP_200_OK)
         
-        # Build query conditions for exact matches (try both string and numeric versions)
-        from django.db.models import Q
-        q_conditions = Q()
-        
+        # Exact matches, plus the numeric version of numeric IDs (for cases where DB has "123" and CSV has "0123")
+        candidate_ids = set(normalized_ids)
         for old_id in normalized_ids:
-            # Exact string match
-            q_conditions |= Q(old_contact_id=old_id)
-            # Also try numeric match if applicable (for cases where DB has "123" and CSV has "123")
             try:
-                # If it's numeric, also try matching the numeric string version
-                numeric_id = str(int(old_id))
-                if numeric_id != old_id:
-                    q_conditions |= Q(old_contact_id=numeric_id)
+                candidate_ids.add(str(int(old_id)))
             except (ValueError, TypeError):
                 pass
         
-        # Query contacts with matching old_contact_ids
+        # Query contacts with matching old_contact_ids (indexed IN lookup)
         # Use select_related to optimize teleoperator access
         contacts = Contact.objects.filter(
-            old_contact_id__isnull=False
-        ).filter(q_conditions).select_related(
+            old_contact_id__in=candidate_ids
+        ).select_related(
             'teleoperator',
             'teleoperator__user_details'
-        ).distinct()
+        )
         
         # Build response with contactId and teleoperatorId
         result = []
         for contact in contacts:
             # Normalize old_contact_id for matching
             contact_old_id = str(contact.old_contact_id).strip() if contact.old_contact_id else None
+            if contact_old_id not in candidate_ids:
+                continue
             
-            # Check if this contact matches any of the requested IDs
-            matches = False
-            for requested_id in normalized_ids:
-                # Exact match
-                if contact_old_id == requested_id:
-                    matches = True
-                    break
-                # Numeric match (for cases where DB has "123" and CSV has "123")
-                try:
-                    numeric_requested = str(int(requested_id))
-                    if contact_old_id == numeric_requested:
-                        matches = True
-                        break
-                except (ValueError, TypeError):
-                    pass
+            # Get teleoperatorId (UserDetails ID, not Django User ID)
+            teleoperator_id = None
+            if contact.teleoperator and contact.teleoperator.user_details:
+                teleoperator_id = contact.teleoperator.user_details.id
             
-            if matches:
-                # Get teleoperatorId (UserDetails ID, not Django User ID)
-                teleoperator_id = None
-                if contact.teleoperator and contact.teleoperator.user_details:
-                    teleoperator_id = contact.teleoperator.user_details.id
-                
-                result.append({
-                    'oldContactId': contact.old_contact_id,
-                    'contactId': contact.id,
-                    'teleoperatorId': teleoperator_id
-                })
+            result.append({
+                'oldContactId': contact.old_contact_id,
+                'contactId': contact.id,
+                'teleoperatorId': teleoperator_id
+            })
         
         return Response({'contacts': result}, status=status.HTTP_200_OK)
         
@@ -5939,24 +5459,28 @@ def contacts_by_old_ids(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def contacts_migration_missing(request):
-    """Check CSV file for old IDs not in database and return missing rows as CSV"""
+    """
+    Check CSV file for old IDs not in database and return the missing rows.
+    
+    format=json (default): statistics + missing rows as CSV content.
+    format=csv / format=ndjson: the missing rows are streamed (statistics in the X-Migration-Statistics header).
+    """
     if 'file' not in request.FILES:
         return Response({'error': 'No file provided'}, status=status.HTTP_400_BAD_REQUEST)
     
     csv_file = request.FILES['file']
     old_id_column = request.data.get('oldIdColumn', None)
+    output_format = (request.data.get('format') or request.query_params.get('format') or 'json').lower()
+    if output_format not in ('json', 'csv', 'ndjson'):
+        return Response({'error': f"Invalid format '{output_format}'. Expected one of: json, csv, ndjson"}, status=status.HTTP_400_BAD_REQUEST)
     
     try:
-        # Read CSV file
-        csv_content = csv_file.read().decode('utf-8-sig')  # Handle BOM
-        csv_reader = csv.DictReader(io.StringIO(csv_content))
-        rows = list(csv_reader)
-        
-        if not rows:
-            return Response({'error': 'CSV file is empty'}, status=status.HTTP_400_BAD_REQUEST)
+        import json
+        from .utils.migration_reconcile import MigrationReconciliation
         
         # Get column names
-        fieldnames = csv_reader.fieldnames
+        # Decode the CSV as a stream (the upload is never loaded in memory as a whole)
+        fieldnames = csv.DictReader(open_text_stream(csv_file)).fieldnames
         if not fieldnames:
             return Response({'error': 'CSV file has no headers'}, status=status.HTTP_400_BAD_REQUEST)
         
@@ -5990,85 +5514,62 @@ def contacts_migration_missing(request):
                 'message': 'Please specify the column name using oldIdColumn parameter'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Extract all old IDs from CSV
-        old_ids_in_csv = []
-        for i, row in enumerate(rows):
-            old_id = str(row.get(old_id_column, '')).strip()
-            if old_id:
-                old_ids_in_csv.append((i, old_id, row))
+        # Stream the file: old IDs are sorted in runs and checked against the database chunk by chunk
+        reconciliation = MigrationReconciliation(csv_file, old_id_column).run()
         
-        if not old_ids_in_csv:
+        if not reconciliation.total_rows:
+            return Response({'error': 'CSV file is empty'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if not reconciliation.rows_with_old_ids:
             return Response({
                 'error': 'No old IDs found in CSV file',
                 'detectedColumn': old_id_column
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Query database for existing old IDs in batches
-        # Normalize both CSV values and database values to handle whitespace differences
-        existing_old_ids = set()
-        old_id_values = [old_id for _, old_id, _ in old_ids_in_csv]
-        # Create a set of normalized CSV values for efficient lookup
-        normalized_csv_ids = {old_id.strip() for old_id in old_id_values}
-        batch_size = 1000
-        
-        for i in range(0, len(old_id_values), batch_size):
-            batch = old_id_values[i:i + batch_size]
-            # Build a Q object to query contacts where old_contact_id could match
-            # This includes exact matches and potential matches with whitespace
-            # We use Q objects to check if old_contact_id contains any batch value
-            # (to catch cases like " 123 " matching "123")
-            q_conditions = Q()
-            for batch_id in batch:
-                batch_id_str = str(batch_id).strip()
-                # Check for exact match
-                q_conditions |= Q(old_contact_id=batch_id)
-                # Also check if old_contact_id contains the batch value (to catch whitespace variations)
-                # This will match " 123 ", "123 ", " 123", etc.
-                # We'll filter more precisely in Python to avoid false positives
-                if batch_id_str:
-                    q_conditions |= Q(old_contact_id__contains=batch_id_str)
-            
-            # Query contacts that could potentially match
-            existing = Contact.objects.filter(
-                old_contact_id__isnull=False
-            ).filter(q_conditions).values_list('old_contact_id', flat=True).distinct()
-            
-            # Normalize database values and check if they match any normalized CSV value
-            # This ensures we only match values that, when stripped, exactly match the CSV value
-            for db_id in existing:
-                if db_id:
-                    normalized_db_id = str(db_id).strip()
-                    # Only add if normalized database ID exactly matches a normalized CSV ID
-                    # This prevents false positives from __contains (e.g., "123" matching "1234")
-                    if normalized_db_id in normalized_csv_ids:
-                        existing_old_ids.add(normalized_db_id)
-        
-        # Find rows with old IDs NOT in database
-        missing_rows = []
-        for row_index, old_id, row in old_ids_in_csv:
-            old_id_stripped = old_id.strip()
-            if old_id_stripped not in existing_old_ids:
-                missing_rows.append(row)
+        filename = f'missing_contacts_{datetime.now().strftime("%Y%m%d_%H%M%S")}'
+        
+        if output_format != 'json':
+            def stream_missing_rows():
+                output = io.StringIO()
+                writer = csv.DictWriter(output, fieldnames=fieldnames)
+                if output_format == 'csv':
+                    writer.writeheader()
+                for row_index, row in reconciliation.missing_rows():
+                    if output_format == 'csv':
+                        writer.writerow(row)
+                    else:
+                        output.write(json.dumps({
+                            'row': row_index + 2,  # Row number in the file (header is row 1)
+                            'oldId': str(row.get(old_id_column) or '').strip(),
+                            'data': row,
+                        }, ensure_ascii=False) + '\n')
+                    yield output.getvalue()
+                    output.seek(0)
+                    output.truncate(0)
+                if output.tell():
+                    yield output.getvalue()
+            
+            content_type = 'text/csv; charset=utf-8' if output_format == 'csv' else 'application/x-ndjson'
+            response = StreamingHttpResponse(stream_missing_rows(), content_type=content_type)
+            response['Content-Disposition'] = f'attachment; filename="{filename}.{output_format}"'
+            response['X-Migration-Statistics'] = json.dumps(reconciliation.statistics)
+            response['X-Detected-Column'] = old_id_column
+            return response
         
         # Create CSV content with missing rows
         output = io.StringIO()
         writer = csv.DictWriter(output, fieldnames=fieldnames)
         writer.writeheader()
-        writer.writerows(missing_rows)
+        writer.writerows(row for _, row in reconciliation.missing_rows())
         csv_output = output.getvalue()
         
         # Return JSON response with statistics and CSV content
         return Response({
             'success': True,
-            'statistics': {
-                'totalRows': len(rows),
-                'rowsWithOldIds': len(old_ids_in_csv),
-                'rowsInDatabase': len(existing_old_ids),
-                'rowsMissing': len(missing_rows),
-            },
+            'statistics': reconciliation.statistics,
             'detectedColumn': old_id_column,
             'csvContent': csv_output,
-            'filename': f'missing_contacts_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+            'filename': f'{filename}.csv'
         }, status=status.HTTP_200_OK)
         
     except Exception as e:
@@ -6079,6 +5580,13 @@ def contacts_migration_missing(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def csv_import_notes(request):
+    """Import notes from CSV with column mapping - pass background=true to process the file as an import job"""
+    if 'file' in request.FILES and wants_background_import(request):
+        job = enqueue_import_job(request, 'notes')
+        return Response({'jobId': job.id, 'job': serialize_import_job(job)}, status=status.HTTP_202_ACCEPTED)
+    return run_csv_import_notes(request)
+
+def run_csv_import_notes(request, progress=None):
     """Import notes from CSV with column mapping - optimized for large imports"""
     if 'file' not in request.FILES:
         return Response({'error': 'No file provided'}, status=status.HTTP_400_BAD_REQUEST)
@@ -6119,13 +5627,15 @@ def csv_import_notes(request):
                 return Response({'error': 'Default category not found'}, status=status.HTTP_400_BAD_REQUEST)
     
     try:
-        import csv
-        import io
         from datetime import datetime
         
         # Read CSV file
-        csv_content = csv_file.read().decode('utf-8-sig')  # Handle BOM
-        csv_reader = csv.DictReader(io.StringIO(csv_content))
+        # Decode the CSV as a stream (the upload is never loaded in memory as a whole)
+        csv_reader, headers = csv_row_reader(csv_file)
+        
+        # Resolve the column mapping against the headers once (positional index per field)
+        mapping_plan = ColumnMappingPlan(headers, column_mapping)
+        mapping_plan.log_missing('Notes import')
         
         # Field mapping from frontend names to model field names
         field_mapping = {
@@ -6168,106 +5678,40 @@ def csv_import_notes(request):
             return None
         
         # Batch processing configuration
+        # Rows are parsed and inserted batch by batch: only the current batch is kept in memory, the
+        # contacts and the existing note IDs it references are fetched with one IN query per batch
         BATCH_SIZE = 1000  # Process notes in batches of 1000
-        notes_to_create = []
-        row_data_map = {}  # Map note_id to row number and details for results
+        pending_rows = []  # (row number, note data, old contact ID) of the current batch
         
-        # Pre-load all contacts with old_contact_id into a dictionary for fast lookup
-        # This avoids N+1 query problem when processing CSV rows
-        contacts_by_old_id = {}
-        contacts_with_old_id = Contact.objects.filter(old_contact_id__isnull=False).exclude(old_contact_id='')
-        for contact in contacts_with_old_id:
-            contacts_by_old_id[contact.old_contact_id] = contact
-        
-        # Pre-load existing note IDs to check for duplicates
-        # This avoids N+1 query problem when checking if note IDs already exist
-        existing_note_ids = set(Note.objects.values_list('id', flat=True))
+        from django.db import transaction, IntegrityError
         
-        # First pass: Parse all rows and collect valid notes
-        for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (row 1 is header)
-            results['total'] += 1
-            try:
-                # Build note data from CSV row
-                note_data = {}
-                old_contact_id = None
-                
-                # Map CSV columns to note fields
-                for frontend_field, csv_column in column_mapping.items():
-                    if not csv_column:
-                        continue
-                    
-                    # Try exact match first, then case-insensitive match
-                    csv_value = None
-                    if csv_column in row:
-                        csv_value = row[csv_column]
-                    else:
-                        # Try case-insensitive match
-                        for key in row.keys():
-                            if key and key.strip().lower() == csv_column.strip().lower():
-                                csv_value = row[key]
-                                break
-                    
-                    if csv_value is None:
-                        continue
-                    
-                    value = csv_value.strip() if csv_value else ''
-                    
-                    # Map to model field name
-                    if frontend_field in field_mapping:
-                        model_field = field_mapping[frontend_field]
-                        
-                        # Handle datetime field
-                        if model_field == 'created_at':
-                            parsed_dt = parse_datetime(value)
-                            if parsed_dt:
-                                from django.utils import timezone
-                                note_data[model_field] = timezone.make_aware(parsed_dt)
-                            else:
-                                note_data[model_field] = None
-                        # Handle old contact ID (store separately for lookup)
-                        elif model_field == 'old_contact_id':
-                            old_contact_id = value if value else None
-                        else:
-                            note_data[model_field] = value
-                
-                # Validate required fields - text is required
-                if not note_data.get('text'):
-                    results['errors'].append({
-                        'row': row_num,
-                        'error': 'Text is required'
-                    })
-                    results['failed'] += 1
-                    continue
-                
-                # Handle contact ID mapping by old_contact_id only
+        def import_pending_notes():
+            batch_rows = list(pending_rows)
+            pending_rows.clear()
+            
+            old_contact_ids = {old_contact_id for _, _, old_contact_id in batch_rows}
+            contacts_by_old_id = {
+                contact.old_contact_id: contact
+                for contact in Contact.objects.filter(old_contact_id__in=old_contact_ids)
+            }
+            csv_note_ids = {str(note_data['id']).strip()[:12] for _, note_data, _ in batch_rows if note_data.get('id')}
+            existing_note_ids = set(Note.objects.filter(id__in=csv_note_ids).values_list('id', flat=True)) if csv_note_ids else set()
+            batch_note_ids = set()
+            notes = []
+            row_data_map = {}  # Map note_id to row number and details for results
+            
+            for row_num, note_data, old_contact_id in batch_rows:
                 # Only import notes where the old contact ID was found in the contact table
-                contact_obj = None
-                if old_contact_id:
-                    # Use pre-loaded dictionary for fast lookup (O(1) instead of database query)
-                    contact_obj = contacts_by_old_id.get(old_contact_id)
-                    if not contact_obj:
-                        # Contact not found - skip this note
-                        results['errors'].append({
-                            'row': row_num,
-                            'error': f'Contact not found with old_contact_id: {old_contact_id}'
-                        })
-                        results['failed'] += 1
-                        continue
-                else:
-                    # No old_contact_id provided - skip this note
+                contact_obj = contacts_by_old_id.get(old_contact_id)
+                if not contact_obj:
+                    # Contact not found - skip this note
                     results['errors'].append({
                         'row': row_num,
-                        'error': 'old_contact_id is required for note import'
+                        'error': f'Contact not found with old_contact_id: {old_contact_id}'
                     })
                     results['failed'] += 1
                     continue
                 
-                # Always use current user
-                user_obj = default_user_obj
-                
-                # Use default category if provided
-                category_obj = default_category_obj
-                
                 # Handle note ID - use from CSV if provided, otherwise generate
                 note_id = None
                 if 'id' in note_data and note_data['id']:
@@ -6276,7 +5720,7 @@ def csv_import_notes(request):
                     if len(note_id) > 12:
                         note_id = note_id[:12]  # Truncate to 12 characters if longer
                     
-                    # Check if ID already exists in database
+                    # Check if ID already exists in database (notes of earlier batches included)
                     if note_id in existing_note_ids:
                         results['errors'].append({
                             'row': row_num,
@@ -6286,8 +5730,7 @@ def csv_import_notes(request):
                         continue
                     
                     # Check uniqueness against pending notes in this batch
-                    existing_ids = {n.id for n in notes_to_create}
-                    if note_id in existing_ids:
+                    if note_id in batch_note_ids:
                         results['errors'].append({
                             'row': row_num,
                             'error': f'Duplicate ID {note_id} found in CSV'
@@ -6296,22 +5739,16 @@ def csv_import_notes(request):
                         continue
                 else:
                     # Generate new note ID
-                    note_id = uuid.uuid4().hex[:12]
-                    # Check uniqueness against pending notes in this batch
-                    existing_ids = {n.id for n in notes_to_create}
-                    while note_id in existing_ids or note_id in existing_note_ids:
-                        note_id = uuid.uuid4().hex[:12]
+                    note_id = new_id()
                 
                 note_data['id'] = note_id
-                note_data['userId'] = user_obj
+                # Always use current user, and the default category if provided
+                note_data['userId'] = default_user_obj
                 note_data['contactId'] = contact_obj
-                note_data['categ_id'] = category_obj
+                note_data['categ_id'] = default_category_obj
                 
-                # Add ID to existing_note_ids to prevent duplicates in the same batch
-                existing_note_ids.add(note_id)
-                
-                # Remove old_contact_id from note_data (it's not a Note field)
-                note_data.pop('old_contact_id', None)
+                # Add ID to batch_note_ids to prevent duplicates in the same batch
+                batch_note_ids.add(note_id)
                 
                 # Store created_at separately if provided (needs special handling)
                 custom_created_at = note_data.pop('created_at', None)
@@ -6330,88 +5767,129 @@ def csv_import_notes(request):
                 # Set created_at if provided (this will override auto_now_add)
                 if custom_created_at:
                     note.created_at = custom_created_at
-                notes_to_create.append(note)
-                
-            except Exception as e:
-                import traceback
-                error_details = traceback.format_exc()
-                results['errors'].append({
-                    'row': row_num,
-                    'error': str(e),
-                    'details': error_details
-                })
-                results['failed'] += 1
-        
-        # Bulk create notes in batches
-        from django.db import transaction, IntegrityError
-        
-        with transaction.atomic():
-            for i in range(0, len(notes_to_create), BATCH_SIZE):
-                batch = notes_to_create[i:i + BATCH_SIZE]
-                try:
-                    Note.objects.bulk_create(batch, batch_size=BATCH_SIZE)
-                    
-                    # Update created_at for notes that have custom timestamps from CSV
-                    # bulk_create may override created_at due to auto_now_add, so we update it afterward
-                    notes_to_update = []
-                    for note in batch:
-                        row_data = row_data_map[note.id]
-                        custom_created_at = row_data.get('created_at')
-                        if custom_created_at:
-                            note.created_at = custom_created_at
-                            notes_to_update.append(note)
-                    
-                    # Bulk update created_at for notes with custom timestamps
-                    if notes_to_update:
-                        Note.objects.bulk_update(notes_to_update, ['created_at'], batch_size=BATCH_SIZE)
-                    
-                    # Add to success results
-                    for note in batch:
-                        row_data = row_data_map[note.id]
-                        results['success'].append({
-                            'row': row_data['row'],
-                            'noteId': note.id,
-                            'text': row_data['text']
-                        })
-                        results['imported'] += 1
-                except IntegrityError as e:
-                    # Handle potential ID collisions by falling back to individual creates for this batch
-                    for note in batch:
-                        try:
-                            note.save()
-                            row_data = row_data_map[note.id]
-                            results['success'].append({
-                                'row': row_data['row'],
-                                'noteId': note.id,
-                                'text': row_data['text']
-                            })
-                            results['imported'] += 1
-                        except IntegrityError:
-                            # ID collision - regenerate and try once more
-                            note.id = uuid.uuid4().hex[:12]
+                notes.append(note)
+            
+            with transaction.atomic():
+                if notes:
+                    try:
+                        # Savepoint: a failed batch is rolled back without losing the previous ones
+                        with transaction.atomic():
                             try:
-                                note.save()
-                                row_data = row_data_map[note.id]
-                                results['success'].append({
-                                    'row': row_data['row'],
-                                    'noteId': note.id,
-                                    'text': row_data['text']
-                                })
-                                results['imported'] += 1
-                            except Exception as e:
-                                row_data = row_data_map.get(note.id, {})
-                                results['errors'].append({
-                                    'row': row_data.get('row', 'unknown'),
-                                    'error': f'Failed to create note: {str(e)}'
-                                })
-                                results['failed'] += 1
-                        except Exception as e:
+                                with transaction.atomic():
+                                    bulk_insert(Note, notes, batch_size=BATCH_SIZE)
+                            except IntegrityError:
+                                # ID collision - regenerate the IDs of the batch and try once more
+                                for note, note_id in zip(notes, new_ids(len(notes))):
+                                    old_id = note.id
+                                    note.id = note_id
+                                    row_data_map[note.id] = row_data_map.pop(old_id)
+                                bulk_insert(Note, notes, batch_size=BATCH_SIZE)
+                            
+                            # The insert applies auto_now_add to created_at: restore the dates from the CSV
+                            # with one set-based update for the whole batch
+                            restore_timestamps(Note, [
+                                (note.id, {'created_at': row_data_map[note.id].get('created_at')})
+                                for note in notes
+                            ], batch_size=BATCH_SIZE)
+                    except Exception as e:
+                        for note in notes:
                             row_data = row_data_map.get(note.id, {})
                             results['errors'].append({
                                 'row': row_data.get('row', 'unknown'),
                                 'error': f'Failed to create note: {str(e)}'
                             })
                             results['failed'] += 1
+                    else:
+                        # Add to success results
+                        for note in notes:
+                            row_data = row_data_map[note.id]
+                            results['success'].append({
+                                'row': row_data['row'],
+                                'noteId': note.id,
+                                'text': row_data['text']
+                            })
+                            results['imported'] += 1
+                
+                # Background job: record the last committed row with the batch
+                if progress is not None:
+                    progress.checkpoint(batch_rows[-1][0], results)
+        
+        # Parse the rows, each full batch is imported before reading further
+        with import_transaction(progress):
+            for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (row 1 is header)
+                results['total'] += 1
+                if progress is not None:
+                    progress.update(results['total'])
+                    if progress.is_committed(row_num):
+                        # Already imported by a previous attempt of this job
+                        continue
+                try:
+                    # Build note data from CSV row
+                    note_data = {}
+                    old_contact_id = None
+                    
+                    # Map CSV columns to note fields through the compiled column mapping
+                    for frontend_field in mapping_plan.indices:
+                        csv_value = mapping_plan.get(row, frontend_field)
+                        if csv_value is None:
+                            continue
+                        
+                        value = csv_value.strip() if csv_value else ''
+                        
+                        # Map to model field name
+                        if frontend_field in field_mapping:
+                            model_field = field_mapping[frontend_field]
+                            
+                            # Handle datetime field
+                            if model_field == 'created_at':
+                                parsed_dt = parse_datetime(value)
+                                if parsed_dt:
+                                    from django.utils import timezone
+                                    note_data[model_field] = timezone.make_aware(parsed_dt)
+                                else:
+                                    note_data[model_field] = None
+                            # Handle old contact ID (store separately for lookup)
+                            elif model_field == 'old_contact_id':
+                                old_contact_id = value if value else None
+                            else:
+                                note_data[model_field] = value
+                    
+                    # Validate required fields - text is required
+                    if not note_data.get('text'):
+                        results['errors'].append({
+                            'row': row_num,
+                            'error': 'Text is required'
+                        })
+                        results['failed'] += 1
+                        continue
+                    
+                    # Notes are mapped to their contact by old_contact_id only
+                    if not old_contact_id:
+                        # No old_contact_id provided - skip this note
+                        results['errors'].append({
+                            'row': row_num,
+                            'error': 'old_contact_id is required for note import'
+                        })
+                        results['failed'] += 1
+                        continue
+                    
+                    pending_rows.append((row_num, note_data, old_contact_id))
+                    
+                except Exception as e:
+                    import traceback
+                    error_details = traceback.format_exc()
+                    results['errors'].append({
+                        'row': row_num,
+                        'error': str(e),
+                        'details': error_details
+                    })
+                    results['failed'] += 1
+                
+                if len(pending_rows) >= BATCH_SIZE:
+                    import_pending_notes()
+            
+            if pending_rows:
+                import_pending_notes()
         
         # Create a single bulk log entry for the import
         if results['imported'] > 0:
@@ -6424,9 +5902,7 @@ def csv_import_notes(request):
                     'failed_count': results['failed'],
                 }
                 
-                log_id = uuid.uuid4().hex[:12]
-                while Log.objects.filter(id=log_id).exists():
-                    log_id = uuid.uuid4().hex[:12]
+                log_id = new_id()
                 
                 Log.objects.create(
                     id=log_id,
@@ -6474,6 +5950,13 @@ def log_event_types(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def csv_import_logs(request):
+    """Import logs from CSV with column mapping - pass background=true to process the file as an import job"""
+    if 'file' in request.FILES and wants_background_import(request):
+        job = enqueue_import_job(request, 'logs')
+        return Response({'jobId': job.id, 'job': serialize_import_job(job)}, status=status.HTTP_202_ACCEPTED)
+    return run_csv_import_logs(request)
+
+def run_csv_import_logs(request, progress=None):
     """Import logs from CSV with column mapping - optimized for large imports"""
     if 'file' not in request.FILES:
         return Response({'error': 'No file provided'}, status=status.HTTP_400_BAD_REQUEST)
@@ -6551,13 +6034,15 @@ def csv_import_logs(request):
             default_user_obj = None
     
     try:
-        import csv
-        import io
         from datetime import datetime
         
         # Read CSV file
-        csv_content = csv_file.read().decode('utf-8-sig')  # Handle BOM
-        csv_reader = csv.DictReader(io.StringIO(csv_content))
+        # Decode the CSV as a stream (the upload is never loaded in memory as a whole)
+        csv_reader, headers = csv_row_reader(csv_file)
+        
+        # Resolve the column mapping against the headers once (positional index per field)
+        mapping_plan = ColumnMappingPlan(headers, column_mapping)
+        mapping_plan.log_missing('Logs import')
         
         # Field mapping from frontend names to model field names
         field_mapping = {
@@ -6616,195 +6101,84 @@ def csv_import_logs(request):
                 return {}
         
         # Batch processing configuration
+        # Rows are parsed and inserted batch by batch: only the current batch is kept in memory, the
+        # contacts, existing log IDs and existing logs it references are fetched with IN queries per batch
         BATCH_SIZE = 1000  # Process logs in batches of 1000
-        logs_to_create = []
-        row_data_map = {}  # Map log_id to row number and details for results
-        
-        # Pre-load all contacts with old_contact_id into a dictionary for fast lookup
-        # This avoids N+1 query problem when processing CSV rows
-        contacts_by_old_id = {}
-        contacts_with_old_id = Contact.objects.filter(old_contact_id__isnull=False).exclude(old_contact_id='')
-        for contact in contacts_with_old_id:
-            # Use stripped value as key to ensure matching
-            old_id_key = str(contact.old_contact_id).strip()
-            if old_id_key:
-                contacts_by_old_id[old_id_key] = contact
-        
-        # Pre-load existing log IDs to check for duplicates
-        # This avoids N+1 query problem when checking if log IDs already exist
-        existing_log_ids = set(Log.objects.values_list('id', flat=True))
-        
-        # Pre-load existing logs to check for duplicates based on content
-        # Create a set of tuples (event_type, contact_id, user_id, created_at) for fast lookup
-        # This allows us to skip logs that are exact duplicates even if they have different IDs
-        existing_logs_signatures = set()
-        existing_logs_query = Log.objects.select_related('contact_id', 'user_id').values(
-            'event_type', 'contact_id', 'user_id', 'created_at'
-        )
-        for log in existing_logs_query:
-            # Create a signature tuple for duplicate detection
-            # Normalize created_at to minute precision to handle slight time differences
-            created_at = log['created_at']
-            if created_at:
-                # Round to minute precision to handle slight time differences from CSV imports
-                if timezone.is_aware(created_at):
-                    created_at_normalized = created_at.replace(second=0, microsecond=0)
-                else:
-                    created_at_normalized = timezone.make_aware(created_at).replace(second=0, microsecond=0)
-            else:
-                created_at_normalized = None
-            
-            signature = (
-                log['event_type'] or '',
-                log['contact_id'] or None,
-                log['user_id'] or None,
-                created_at_normalized
-            )
-            existing_logs_signatures.add(signature)
+        pending_rows = []  # (row number, log data, old contact ID, user) of the current batch
         
-        # Pre-load all users for fast lookup
-        # Use both string and integer keys to handle different ID formats
-        users_by_id = {}
-        all_users = DjangoUser.objects.all()
-        for user in all_users:
-            user_id_str = str(user.id)
-            user_id_int = user.id
-            # Store with both string and integer keys for flexible lookup
-            users_by_id[user_id_str] = user
-            if isinstance(user_id_int, int):
-                users_by_id[user_id_int] = user
+        def normalize_created_at(created_at):
+            # Round to minute precision to handle slight time differences from CSV imports
+            if not created_at:
+                return None
+            if timezone.is_aware(created_at):
+                return created_at.replace(second=0, microsecond=0)
+            return timezone.make_aware(created_at).replace(second=0, microsecond=0)
         
-        # First pass: Parse all rows and collect valid logs
-        for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (row 1 is header)
-            results['total'] += 1
-            try:
-                # Build log data from CSV row
-                log_data = {}
-                old_contact_id = None
-                
-                # Map CSV columns to log fields
-                for frontend_field, csv_column in column_mapping.items():
-                    if not csv_column:
-                        continue
-                    
-                    # Try exact match first, then case-insensitive match
-                    csv_value = None
-                    if csv_column in row:
-                        csv_value = row[csv_column]
-                    else:
-                        # Try case-insensitive match
-                        for key in row.keys():
-                            if key and key.strip().lower() == csv_column.strip().lower():
-                                csv_value = row[key]
-                                break
-                    
-                    if csv_value is None:
-                        continue
-                    
-                    value = csv_value.strip() if csv_value else ''
-                    
-                    # Map to model field name
-                    if frontend_field in field_mapping:
-                        model_field = field_mapping[frontend_field]
-                        
-                        # Handle datetime field
-                        if model_field == 'created_at':
-                            parsed_dt = parse_datetime(value)
-                            if parsed_dt:
-                                from django.utils import timezone
-                                log_data[model_field] = timezone.make_aware(parsed_dt)
-                            else:
-                                log_data[model_field] = None
-                        # Handle JSON fields
-                        elif model_field in ['details', 'old_value', 'new_value']:
-                            log_data[model_field] = parse_json(value)
-                        # Handle old_logs as text field (not JSON)
-                        elif model_field == 'old_logs':
-                            log_data[model_field] = value.strip() if value else None
-                        # Handle old contact ID (store separately for lookup)
-                        elif model_field == 'old_contact_id':
-                            old_contact_id = value.strip() if value and value.strip() else None
-                        # Handle event_type with mapping
-                        elif model_field == 'event_type':
-                            event_type_value = value if value else ''
-                            # Apply event type mapping if provided
-                            if event_type_value in event_type_mapping and event_type_mapping[event_type_value]:
-                                log_data[model_field] = str(event_type_mapping[event_type_value]).strip()
-                            else:
-                                log_data[model_field] = event_type_value.strip()
-                        else:
-                            log_data[model_field] = value
-                
-                # Validate required fields - event_type is required
-                if not log_data.get('event_type'):
-                    results['errors'].append({
-                        'row': row_num,
-                        'error': 'event_type is required'
-                    })
-                    results['failed'] += 1
-                    continue
-                
-                # Handle contact ID mapping by old_contact_id
+        def existing_signatures(candidates):
+            """
+            Signatures (event_type, contact_id, user_id, created_at to the minute) of the existing logs matching
+            the (event_type, contact, created_at) candidates of a batch, so exact duplicates are skipped even
+            if they have different IDs
+            """
+            dated = [(event_type, contact_id, created_at) for event_type, contact_id, created_at in candidates if created_at]
+            if not dated:
+                # Existing logs always have a created_at
+                return set()
+            contact_ids = {contact_id for _, contact_id, _ in dated if contact_id}
+            contact_filter = Q(contact_id__isnull=True)
+            if contact_ids:
+                contact_filter |= Q(contact_id__in=contact_ids)
+            existing_logs_query = Log.objects.filter(
+                contact_filter,
+                event_type__in={event_type for event_type, _, _ in dated},
+                created_at__gte=min(created_at for _, _, created_at in dated),
+                created_at__lt=max(created_at for _, _, created_at in dated) + timedelta(minutes=1),
+            ).values_list('event_type', 'contact_id', 'user_id', 'created_at')
+            return {
+                (event_type or '', contact_id or None, user_id or None, normalize_created_at(created_at))
+                for event_type, contact_id, user_id, created_at in existing_logs_query.iterator(chunk_size=BATCH_SIZE)
+            }
+        
+        from django.db import transaction, IntegrityError
+        
+        def import_pending_logs():
+            batch_rows = list(pending_rows)
+            pending_rows.clear()
+            
+            # Contacts of the batch by old_contact_id (values are stripped when parsed)
+            old_contact_ids = {old_contact_id for _, _, old_contact_id, _ in batch_rows if old_contact_id}
+            contacts_by_old_id = {
+                contact.old_contact_id: contact
+                for contact in Contact.objects.filter(old_contact_id__in=old_contact_ids)
+            } if old_contact_ids else {}
+            csv_log_ids = {str(log_data['id']).strip()[:12] for _, log_data, _, _ in batch_rows if log_data.get('id')}
+            existing_log_ids = set(Log.objects.filter(id__in=csv_log_ids).values_list('id', flat=True)) if csv_log_ids else set()
+            signatures = existing_signatures([
+                (
+                    log_data.get('event_type', '') or '',
+                    contacts_by_old_id[old_contact_id].id if old_contact_id in contacts_by_old_id else None,
+                    normalize_created_at(log_data.get('created_at')),
+                )
+                for _, log_data, old_contact_id, _ in batch_rows
+            ])
+            batch_log_ids = set()
+            logs = []
+            row_data_map = {}  # Map log_id to row number and details for results
+            
+            for row_num, log_data, old_contact_id, user_obj in batch_rows:
                 # If old_contact_id is provided in CSV, contact must be found, otherwise skip this log
                 contact_obj = None
                 if old_contact_id:
-                    # Strip whitespace and use pre-loaded dictionary for fast lookup (O(1) instead of database query)
-                    old_contact_id_clean = str(old_contact_id).strip()
-                    contact_obj = contacts_by_old_id.get(old_contact_id_clean)
+                    contact_obj = contacts_by_old_id.get(old_contact_id)
                     if not contact_obj:
                         # Contact not found - skip this log since old_contact_id was provided
                         results['errors'].append({
                             'row': row_num,
-                            'error': f'Contact not found with old_contact_id: {old_contact_id_clean}'
+                            'error': f'Contact not found with old_contact_id: {old_contact_id}'
                         })
                         results['failed'] += 1
                         continue
                 
-                # Handle user_id - use from CSV if provided, otherwise use default or None
-                # If userId column is mapped, user_id should not be null
-                user_obj = None
-                userId_column_mapped = 'userId' in column_mapping and column_mapping.get('userId')
-                
-                if 'user_id' in log_data and log_data['user_id']:
-                    user_id_str = str(log_data['user_id']).strip()
-                    # Apply user ID mapping if provided
-                    if user_id_str in user_id_mapping and user_id_mapping[user_id_str]:
-                        mapped_user_id = str(user_id_mapping[user_id_str]).strip()
-                        # Try to find user with mapped ID (try both string and original format)
-                        user_obj = users_by_id.get(mapped_user_id) or users_by_id.get(user_id_mapping[user_id_str])
-                        # If mapped user not found, try default user
-                        if not user_obj:
-                            user_obj = default_user_obj
-                    else:
-                        # No mapping found for this CSV value, check if CSV value itself is a valid user ID
-                        user_obj = users_by_id.get(user_id_str)
-                        # Also try integer version if user_id_str is numeric
-                        if not user_obj and user_id_str.isdigit():
-                            try:
-                                user_obj = users_by_id.get(int(user_id_str))
-                            except ValueError:
-                                pass
-                        # If CSV value is not a valid user ID, use default user
-                        if not user_obj:
-                            user_obj = default_user_obj
-                elif userId_column_mapped:
-                    # Column is mapped but value is empty/null, use default user
-                    user_obj = default_user_obj
-                else:
-                    # No userId column mapped, use default user if available (optional)
-                    user_obj = default_user_obj
-                
-                # If userId column is mapped but user_obj is still None, skip this log
-                if userId_column_mapped and not user_obj:
-                    csv_val = log_data.get('user_id', 'N/A')
-                    mapping_val = user_id_mapping.get(str(csv_val), 'N/A')
-                    results['errors'].append({
-                        'row': row_num,
-                        'error': f'User ID column is mapped but no valid user found. CSV value: "{csv_val}", Mapping: "{mapping_val}", Default user ID: "{default_user_id}"'
-                    })
-                    results['failed'] += 1
-                    continue
-                
                 # Handle log ID - use from CSV if provided, otherwise generate
                 log_id = None
                 if 'id' in log_data and log_data['id']:
@@ -6813,7 +6187,7 @@ def csv_import_logs(request):
                     if len(log_id) > 12:
                         log_id = log_id[:12]  # Truncate to 12 characters if longer
                     
-                    # Check if ID already exists in database
+                    # Check if ID already exists in database (logs of earlier batches included)
                     if log_id in existing_log_ids:
                         results['errors'].append({
                             'row': row_num,
@@ -6823,8 +6197,7 @@ def csv_import_logs(request):
                         continue
                     
                     # Check uniqueness against pending logs in this batch
-                    existing_ids = {l.id for l in logs_to_create}
-                    if log_id in existing_ids:
+                    if log_id in batch_log_ids:
                         results['errors'].append({
                             'row': row_num,
                             'error': f'Duplicate ID {log_id} found in CSV'
@@ -6833,43 +6206,23 @@ def csv_import_logs(request):
                         continue
                 else:
                     # Generate new log ID
-                    log_id = uuid.uuid4().hex[:12]
-                    # Check uniqueness against pending logs in this batch
-                    existing_ids = {l.id for l in logs_to_create}
-                    while log_id in existing_ids or log_id in existing_log_ids:
-                        log_id = uuid.uuid4().hex[:12]
+                    log_id = new_id()
                 
                 log_data['id'] = log_id
                 log_data['user_id'] = user_obj
                 
-                # Remove old_contact_id from log_data (it's not a Log field)
-                # Remove creator_id from log_data (it's not a Log field anymore)
-                log_data.pop('creator_id', None)
-                log_data.pop('old_contact_id', None)
-                
                 # Store created_at separately if provided (needs special handling)
                 custom_created_at = log_data.pop('created_at', None)
+                created_at_normalized = normalize_created_at(custom_created_at)
                 
                 # Check if log already exists in database based on content (not just ID)
-                # Create signature for duplicate detection
-                if custom_created_at:
-                    # Normalize created_at to minute precision to handle slight time differences
-                    if timezone.is_aware(custom_created_at):
-                        created_at_normalized = custom_created_at.replace(second=0, microsecond=0)
-                    else:
-                        created_at_normalized = timezone.make_aware(custom_created_at).replace(second=0, microsecond=0)
-                else:
-                    created_at_normalized = None
-                
                 log_signature = (
                     log_data.get('event_type', '') or '',
                     contact_obj.id if contact_obj else None,
                     user_obj.id if user_obj else None,
                     created_at_normalized
                 )
-                
-                # Check if this log already exists
-                if log_signature in existing_logs_signatures:
+                if log_signature in signatures:
                     results['errors'].append({
                         'row': row_num,
                         'error': f'Log already exists in database (duplicate: event_type={log_data.get("event_type")}, contact_id={contact_obj.id if contact_obj else None}, user_id={user_obj.id if user_obj else None}, created_at={created_at_normalized})'
@@ -6877,39 +6230,9 @@ def csv_import_logs(request):
                     results['failed'] += 1
                     continue
                 
-                # Also check against logs in current batch to avoid duplicates within CSV
-                batch_signature_exists = False
-                for pending_log in logs_to_create:
-                    pending_created_at = row_data_map.get(pending_log.id, {}).get('created_at')
-                    if pending_created_at:
-                        if timezone.is_aware(pending_created_at):
-                            pending_created_at_normalized = pending_created_at.replace(second=0, microsecond=0)
-                        else:
-                            pending_created_at_normalized = timezone.make_aware(pending_created_at).replace(second=0, microsecond=0)
-                    else:
-                        pending_created_at_normalized = None
-                    
-                    pending_signature = (
-                        pending_log.event_type or '',
-                        pending_log.contact_id.id if pending_log.contact_id else None,
-                        pending_log.user_id.id if pending_log.user_id else None,
-                        pending_created_at_normalized
-                    )
-                    
-                    if pending_signature == log_signature:
-                        batch_signature_exists = True
-                        break
-                
-                if batch_signature_exists:
-                    results['errors'].append({
-                        'row': row_num,
-                        'error': f'Duplicate log found in CSV (same event_type, contact_id, user_id, and created_at)'
-                    })
-                    results['failed'] += 1
-                    continue
-                
-                # Add to existing signatures set to track duplicates within batch
-                existing_logs_signatures.add(log_signature)
+                # Add to the signatures to track duplicates within the batch
+                signatures.add(log_signature)
+                batch_log_ids.add(log_id)
                 
                 # Store row data for results
                 event_type_preview = log_data.get('event_type', '')[:50] + ('...' if len(log_data.get('event_type', '')) > 50 else '')
@@ -6928,88 +6251,193 @@ def csv_import_logs(request):
                 # Set created_at if provided (this will override auto_now_add)
                 if custom_created_at:
                     log.created_at = custom_created_at
-                logs_to_create.append(log)
+                logs.append(log)
+            
+            with transaction.atomic():
+                if logs:
+                    try:
+                        # Savepoint: a failed batch is rolled back without losing the previous ones
+                        with transaction.atomic():
+                            try:
+                                with transaction.atomic():
+                                    bulk_insert(Log, logs, batch_size=BATCH_SIZE)
+                            except IntegrityError:
+                                # ID collision - regenerate the IDs of the batch and try once more
+                                for log, log_id in zip(logs, new_ids(len(logs))):
+                                    old_id = log.id
+                                    log.id = log_id
+                                    row_data_map[log.id] = row_data_map.pop(old_id)
+                                bulk_insert(Log, logs, batch_size=BATCH_SIZE)
+                            
+                            # The insert applies auto_now_add to created_at: restore the dates from the CSV
+                            # with one set-based update for the whole batch
+                            restore_timestamps(Log, [
+                                (log.id, {'created_at': row_data_map[log.id].get('created_at')})
+                                for log in logs
+                            ], batch_size=BATCH_SIZE)
+                    except Exception as e:
+                        for log in logs:
+                            row_data = row_data_map.get(log.id, {})
+                            results['errors'].append({
+                                'row': row_data.get('row', 'unknown'),
+                                'error': f'Failed to create log: {str(e)}'
+                            })
+                            results['failed'] += 1
+                    else:
+                        # Add to success results
+                        for log in logs:
+                            row_data = row_data_map[log.id]
+                            results['success'].append({
+                                'row': row_data['row'],
+                                'logId': log.id,
+                                'event_type': row_data['event_type']
+                            })
+                            results['imported'] += 1
                 
-            except Exception as e:
-                import traceback
-                error_details = traceback.format_exc()
-                results['errors'].append({
-                    'row': row_num,
-                    'error': str(e),
-                    'details': error_details
-                })
-                results['failed'] += 1
+                # Background job: record the last committed row with the batch
+                if progress is not None:
+                    progress.checkpoint(batch_rows[-1][0], results)
         
-        # Bulk create logs in batches
-        from django.db import transaction, IntegrityError
+        # Pre-load all users for fast lookup
+        # Use both string and integer keys to handle different ID formats
+        users_by_id = {}
+        all_users = DjangoUser.objects.all()
+        for user in all_users:
+            user_id_str = str(user.id)
+            user_id_int = user.id
+            # Store with both string and integer keys for flexible lookup
+            users_by_id[user_id_str] = user
+            if isinstance(user_id_int, int):
+                users_by_id[user_id_int] = user
         
-        with transaction.atomic():
-            for i in range(0, len(logs_to_create), BATCH_SIZE):
-                batch = logs_to_create[i:i + BATCH_SIZE]
+        # Parse the rows, each full batch is imported before reading further
+        with import_transaction(progress):
+            for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (row 1 is header)
+                results['total'] += 1
+                if progress is not None:
+                    progress.update(results['total'])
+                    if progress.is_committed(row_num):
+                        # Already imported by a previous attempt of this job
+                        continue
                 try:
-                    Log.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+                    # Build log data from CSV row
+                    log_data = {}
+                    old_contact_id = None
+                    
+                    # Map CSV columns to log fields through the compiled column mapping
+                    for frontend_field in mapping_plan.indices:
+                        csv_value = mapping_plan.get(row, frontend_field)
+                        if csv_value is None:
+                            continue
+                        
+                        value = csv_value.strip() if csv_value else ''
+                        
+                        # Map to model field name
+                        if frontend_field in field_mapping:
+                            model_field = field_mapping[frontend_field]
+                            
+                            # Handle datetime field
+                            if model_field == 'created_at':
+                                parsed_dt = parse_datetime(value)
+                                if parsed_dt:
+                                    log_data[model_field] = timezone.make_aware(parsed_dt)
+                                else:
+                                    log_data[model_field] = None
+                            # Handle JSON fields
+                            elif model_field in ['details', 'old_value', 'new_value']:
+                                log_data[model_field] = parse_json(value)
+                            # Handle old_logs as text field (not JSON)
+                            elif model_field == 'old_logs':
+                                log_data[model_field] = value.strip() if value else None
+                            # Handle old contact ID (store separately for lookup)
+                            elif model_field == 'old_contact_id':
+                                old_contact_id = value.strip() if value and value.strip() else None
+                            # Handle event_type with mapping
+                            elif model_field == 'event_type':
+                                event_type_value = value if value else ''
+                                # Apply event type mapping if provided
+                                if event_type_value in event_type_mapping and event_type_mapping[event_type_value]:
+                                    log_data[model_field] = str(event_type_mapping[event_type_value]).strip()
+                                else:
+                                    log_data[model_field] = event_type_value.strip()
+                            else:
+                                log_data[model_field] = value
                     
-                    # Update created_at for logs that have custom timestamps from CSV
-                    # bulk_create may override created_at due to auto_now_add, so we update it afterward
-                    logs_to_update = []
-                    for log in batch:
-                        row_data = row_data_map[log.id]
-                        custom_created_at = row_data.get('created_at')
-                        if custom_created_at:
-                            log.created_at = custom_created_at
-                            logs_to_update.append(log)
+                    # Validate required fields - event_type is required
+                    if not log_data.get('event_type'):
+                        results['errors'].append({
+                            'row': row_num,
+                            'error': 'event_type is required'
+                        })
+                        results['failed'] += 1
+                        continue
                     
-                    # Bulk update created_at for logs with custom timestamps
-                    if logs_to_update:
-                        Log.objects.bulk_update(logs_to_update, ['created_at'], batch_size=BATCH_SIZE)
+                    # Handle user_id - use from CSV if provided, otherwise use default or None
+                    # If userId column is mapped, user_id should not be null
+                    user_obj = None
+                    userId_column_mapped = 'userId' in column_mapping and column_mapping.get('userId')
                     
-                    # Add to success results
-                    for log in batch:
-                        row_data = row_data_map[log.id]
-                        results['success'].append({
-                            'row': row_data['row'],
-                            'logId': log.id,
-                            'event_type': row_data['event_type']
+                    if 'user_id' in log_data and log_data['user_id']:
+                        user_id_str = str(log_data['user_id']).strip()
+                        # Apply user ID mapping if provided
+                        if user_id_str in user_id_mapping and user_id_mapping[user_id_str]:
+                            mapped_user_id = str(user_id_mapping[user_id_str]).strip()
+                            # Try to find user with mapped ID (try both string and original format)
+                            user_obj = users_by_id.get(mapped_user_id) or users_by_id.get(user_id_mapping[user_id_str])
+                            # If mapped user not found, try default user
+                            if not user_obj:
+                                user_obj = default_user_obj
+                        else:
+                            # No mapping found for this CSV value, check if CSV value itself is a valid user ID
+                            user_obj = users_by_id.get(user_id_str)
+                            # Also try integer version if user_id_str is numeric
+                            if not user_obj and user_id_str.isdigit():
+                                try:
+                                    user_obj = users_by_id.get(int(user_id_str))
+                                except ValueError:
+                                    pass
+                            # If CSV value is not a valid user ID, use default user
+                            if not user_obj:
+                                user_obj = default_user_obj
+                    elif userId_column_mapped:
+                        # Column is mapped but value is empty/null, use default user
+                        user_obj = default_user_obj
+                    else:
+                        # No userId column mapped, use default user if available (optional)
+                        user_obj = default_user_obj
+                    
+                    # If userId column is mapped but user_obj is still None, skip this log
+                    if userId_column_mapped and not user_obj:
+                        csv_val = log_data.get('user_id', 'N/A')
+                        mapping_val = user_id_mapping.get(str(csv_val), 'N/A')
+                        results['errors'].append({
+                            'row': row_num,
+                            'error': f'User ID column is mapped but no valid user found. CSV value: "{csv_val}", Mapping: "{mapping_val}", Default user ID: "{default_user_id}"'
                         })
-                        results['imported'] += 1
-                except IntegrityError as e:
-                    # Handle potential ID collisions by falling back to individual creates for this batch
-                    for log in batch:
-                        try:
-                            log.save()
-                            row_data = row_data_map[log.id]
-                            results['success'].append({
-                                'row': row_data['row'],
-                                'logId': log.id,
-                                'event_type': row_data['event_type']
-                            })
-                            results['imported'] += 1
-                        except IntegrityError:
-                            # ID collision - regenerate and try once more
-                            log.id = uuid.uuid4().hex[:12]
-                            try:
-                                log.save()
-                                row_data = row_data_map[log.id]
-                                results['success'].append({
-                                    'row': row_data['row'],
-                                    'logId': log.id,
-                                    'event_type': row_data['event_type']
-                                })
-                                results['imported'] += 1
-                            except Exception as e:
-                                row_data = row_data_map.get(log.id, {})
-                                results['errors'].append({
-                                    'row': row_data.get('row', 'unknown'),
-                                    'error': f'Failed to create log: {str(e)}'
-                                })
-                                results['failed'] += 1
-                        except Exception as e:
-                            row_data = row_data_map.get(log.id, {})
-                            results['errors'].append({
-                                'row': row_data.get('row', 'unknown'),
-                                'error': f'Failed to create log: {str(e)}'
-                            })
-                            results['failed'] += 1
+                        results['failed'] += 1
+                        continue
+                    
+                    # Remove old_contact_id and creator_id from log_data (they're not Log fields)
+                    log_data.pop('creator_id', None)
+                    log_data.pop('old_contact_id', None)
+                    
+                    pending_rows.append((row_num, log_data, old_contact_id, user_obj))
+                    
+                except Exception as e:
+                    import traceback
+                    error_details = traceback.format_exc()
+                    results['errors'].append({
+                        'row': row_num,
+                        'error': str(e),
+                        'details': error_details
+                    })
+                    results['failed'] += 1
+                
+                if len(pending_rows) >= BATCH_SIZE:
+                    import_pending_logs()
+            
+            if pending_rows:
+                import_pending_logs()
         
         return Response(results, status=status.HTTP_200_OK)
         
@@ -7018,6 +6446,97 @@ def csv_import_logs(request):
         error_details = traceback.format_exc()
         return Response({'error': str(e), 'details': error_details}, status=status.HTTP_400_BAD_REQUEST)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def import_job_detail(request, job_id):
+    """Get the status, progress and final report of one of the current user's import jobs"""
+    job = get_object_or_404(ImportJob, id=job_id, user=request.user)
+    return Response(ImportJobSerializer(job).data)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def import_job_retry(request, job_id):
+    """Queue a failed import job again - it resumes after the last committed row"""
+    job = get_object_or_404(ImportJob, id=job_id, user=request.user)
+    if not job.file_path:
+        return Response({'error': 'The file of this import is no longer available'}, status=status.HTTP_400_BAD_REQUEST)
+    if not retry_import_job(job):
+        return Response({'error': 'Only failed imports can be retried'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'jobId': job.id, 'job': serialize_import_job(job)}, status=status.HTTP_202_ACCEPTED)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def import_upload_create(request):
+    """
+    Start a chunked upload for a large import file.
+    Body: kind (contacts, notes, logs, integration_update), fileName and the import parameters
+    (columnMapping, defaultStatusId...). Parts are then sent to imports/uploads/<jobId>/parts/<n>/.
+    """
+    kind = request.data.get('kind')
+    if kind not in dict(ImportJob.KIND_CHOICES):
+        return Response({'error': f'Invalid import kind: {kind}'}, status=status.HTTP_400_BAD_REQUEST)
+    file_name = (request.data.get('fileName') or '').strip()
+    if not file_name:
+        return Response({'error': 'fileName is required'}, status=status.HTTP_400_BAD_REQUEST)
+    job = create_chunked_import_job(request, kind, file_name)
+    return Response({'jobId': job.id, 'job': serialize_import_job(job)}, status=status.HTTP_201_CREATED)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def import_upload_detail(request, job_id):
+    """Parts already received for a chunked upload (to resume an interrupted upload)"""
+    job = get_object_or_404(ImportJob, id=job_id, user=request.user)
+    from .utils.import_storage import list_import_parts
+    return Response({
+        'job': serialize_import_job(job),
+        'receivedParts': list_import_parts(job.file_path) if job.status == 'uploading' else [],
+    })
+
+@api_view(['PUT', 'POST'])
+@permission_classes([IsAuthenticated])
+def import_upload_part(request, job_id, part_number):
+    """Store one part (numbered from 1) of a chunked upload - sending a part again replaces it"""
+    job = get_object_or_404(ImportJob, id=job_id, user=request.user)
+    if job.status != 'uploading':
+        return Response({'error': 'This upload is already complete'}, status=status.HTTP_400_BAD_REQUEST)
+    if part_number < 1:
+        return Response({'error': 'Part numbers start at 1'}, status=status.HTTP_400_BAD_REQUEST)
+    if 'file' not in request.FILES:
+        return Response({'error': 'No file provided'}, status=status.HTTP_400_BAD_REQUEST)
+    part = request.FILES['file']
+    from .utils.import_storage import save_import_part
+    save_import_part(job.file_path, part_number, part)
+    return Response({'partNumber': part_number, 'size': part.size})
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def import_upload_complete(request, job_id):
+    """All parts are sent: check that none is missing and queue the import job (body: totalParts)"""
+    job = get_object_or_404(ImportJob, id=job_id, user=request.user)
+    if job.status != 'uploading':
+        return Response({'error': 'This upload is already complete'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        total_parts = int(request.data.get('totalParts'))
+    except (TypeError, ValueError):
+        return Response({'error': 'totalParts is required'}, status=status.HTTP_400_BAD_REQUEST)
+    if total_parts < 1:
+        return Response({'error': 'totalParts must be at least 1'}, status=status.HTTP_400_BAD_REQUEST)
+    missing_parts, unexpected_parts = check_import_parts(job, total_parts)
+    if missing_parts:
+        return Response(
+            {'error': 'Some parts are missing', 'missingParts': missing_parts},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if unexpected_parts:
+        # The file is read from every stored part: parts above totalParts must not be imported
+        return Response(
+            {'error': f'Parts numbered above totalParts ({total_parts}) were uploaded', 'unexpectedParts': unexpected_parts},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if not complete_chunked_upload(job):
+        return Response({'error': 'This upload is already complete'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'jobId': job.id, 'job': serialize_import_job(job)}, status=status.HTTP_202_ACCEPTED)
+
 @api_view(['GET', 'PATCH'])
 @permission_classes([IsAuthenticated])
 def contact_detail(request, contact_id):
@@ -7208,13 +6727,13 @@ def contact_detail(request, contact_id):
         # Track if we need to send confirmateur assignment notification
         should_send_confirmateur_notification = False
         new_confirmateur_user = None
+        # Track if the email changed and must be verified again
+        email_changed = False
         
         try:
             # Get old value BEFORE any modifications
             try:
-                old_serializer = ContactSerializer(contact, context={'request': request})
-                old_value_raw = old_serializer.data
-                old_value = clean_contact_data_for_log(old_value_raw, include_created_at=False)
+                old_value = contact_log_snapshot(contact)
             except Exception as e:
                 import traceback
                 error_details = traceback.format_exc()
@@ -7289,7 +6808,12 @@ def contact_detail(request, contact_id):
                         # Invalid value - set to None (will be corrected before save if needed)
                         contact.mobile = None
             if 'email' in request.data:
-                contact.email = request.data.get('email', '') or ''
+                new_email = request.data.get('email', '') or ''
+                if new_email.strip() != (contact.email or '').strip():
+                    # New email: its domain is verified again by the email verification worker
+                    contact.email_verification_status = cached_email_status(new_email) or 'not_verified'
+                    email_changed = bool(new_email.strip()) and contact.email_verification_status == 'not_verified'
+                contact.email = new_email
             if 'birthDate' in request.data:
                 contact.birth_date = get_date(request.data.get('birthDate'))
             if 'birthPlace' in request.data:
@@ -7832,6 +7356,9 @@ def contact_detail(request, contact_id):
                 # Save all other modified fields normally
                 contact.save()
                 
+                if email_changed:
+                    enqueue_email_verification([contact.id])
+                
                 # Verify assigned_at was saved
                 contact.refresh_from_db()
                 
@@ -8006,30 +7533,25 @@ def contact_detail(request, contact_id):
                 pass
             
             # Get new value after saving
-            serializer = ContactSerializer(contact, context={'request': request})
-            new_value_raw = serializer.data
-            new_value = clean_contact_data_for_log(new_value_raw, include_created_at=False)
+            new_value = contact_log_snapshot(contact)
             
-            # Compute only changed fields
-            changed_fields = compute_changed_fields(old_value, new_value)
+            # Store only the changed fields in old_value and new_value
+            old_value_changes, new_value_changes = compact_contact_log_values(old_value, new_value)
             
             # Only create log entry if there are actual changes
-            if changed_fields:
-                # Store only the changed fields in old_value and new_value
-                # old_value will contain the old values of changed fields
-                # new_value will contain the new values of changed fields
-                old_value_changes = {field: change['old'] for field, change in changed_fields.items()}
-                new_value_changes = {field: change['new'] for field, change in changed_fields.items()}
-                
+            if new_value_changes:
+                # Written now: logsCount, logsLatestText and previousStatus of the response include this edit
                 create_log_entry(
                     event_type='editContact',
                     user_id=request.user if request.user.is_authenticated else None,
                     request=request,
                     old_value=old_value_changes,
                     new_value=new_value_changes,
-                    contact_id=contact
+                    contact_id=contact,
+                    sync=True
                 )
             
+            serializer = ContactSerializer(contact, context={'request': request})
             return Response({'contact': serializer.data})
         except Exception as e:
             # Catch any other unexpected errors during PATCH processing
@@ -8109,9 +7631,7 @@ def team_create(request):
     serializer = TeamSerializer(data=request.data)
     if serializer.is_valid():
         # Generate team ID
-        team_id = uuid.uuid4().hex[:12]
-        while Team.objects.filter(id=team_id).exists():
-            team_id = uuid.uuid4().hex[:12]
+        team_id = new_id()
         team = serializer.save(id=team_id, created_by=request.user if request.user.is_authenticated else None)
         
         # Create log entry
@@ -8385,9 +7905,7 @@ def user_update(request, user_id):
             try:
                 team = Team.objects.get(id=team_id)
                 # Generate TeamMember ID
-                team_member_id = uuid.uuid4().hex[:12]
-                while TeamMember.objects.filter(id=team_member_id).exists():
-                    team_member_id = uuid.uuid4().hex[:12]
+                team_member_id = new_id()
                 TeamMember.objects.create(
                     id=team_member_id,
                     user=user_details,
@@ -8706,9 +8224,7 @@ def event_create(request):
                 pass
         
         # Generate event ID
-        event_id = uuid.uuid4().hex[:12]
-        while Event.objects.filter(id=event_id).exists():
-            event_id = uuid.uuid4().hex[:12]
+        event_id = new_id()
         
         # Get user if userId provided, otherwise use current user
         # userId can be either UserDetails ID or DjangoUser ID (for backward compatibility)
@@ -9404,10 +8920,7 @@ def team_add_member(request, team_id):
             return Response({'error': 'User is already in this team'}, status=status.HTTP_400_BAD_REQUEST)
         
         # Generate TeamMember ID
-        import uuid
-        team_member_id = uuid.uuid4().hex[:12]
-        while TeamMember.objects.filter(id=team_member_id).exists():
-            team_member_id = uuid.uuid4().hex[:12]
+        team_member_id = new_id()
         
         # Create TeamMember relationship
         team_member = TeamMember.objects.create(
@@ -9514,9 +9027,7 @@ def role_create(request):
     serializer = RoleSerializer(data=request.data)
     if serializer.is_valid():
         # Generate role ID
-        role_id = uuid.uuid4().hex[:12]
-        while Role.objects.filter(id=role_id).exists():
-            role_id = uuid.uuid4().hex[:12]
+        role_id = new_id()
         role = serializer.save(id=role_id, created_by=request.user if request.user.is_authenticated else None)
         return Response(RoleSerializer(role).data, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -9556,9 +9067,7 @@ def permission_create(request):
     serializer = PermissionSerializer(data=request.data)
     if serializer.is_valid():
         # Generate permission ID
-        permission_id = uuid.uuid4().hex[:12]
-        while Permission.objects.filter(id=permission_id).exists():
-            permission_id = uuid.uuid4().hex[:12]
+        permission_id = new_id()
         
         # Ensure action is provided, default to 'view'
         action = request.data.get('action', 'view')
@@ -9619,9 +9128,7 @@ def permission_role_create(request):
             return Response({'error': 'Permission already assigned to this role'}, status=status.HTTP_400_BAD_REQUEST)
         
         # Generate permission role ID
-        permission_role_id = uuid.uuid4().hex[:12]
-        while PermissionRole.objects.filter(id=permission_role_id).exists():
-            permission_role_id = uuid.uuid4().hex[:12]
+        permission_role_id = new_id()
         
         permission_role = PermissionRole.objects.create(
             id=permission_role_id,
@@ -9674,9 +9181,7 @@ def status_create(request):
     if serializer.is_valid():
         try:
             # Generate status ID
-            status_id = uuid.uuid4().hex[:12]
-            while Status.objects.filter(id=status_id).exists():
-                status_id = uuid.uuid4().hex[:12]
+            status_id = new_id()
             
             # Auto-assign orderIndex: get the max orderIndex for the same type and add 1
             status_type = serializer.validated_data.get('type', 'lead')
@@ -9763,9 +9268,7 @@ def source_list(request):
 @permission_classes([IsAuthenticated])
 def source_create(request):
     """Create a new source"""
-    source_id = uuid.uuid4().hex[:12]
-    while Source.objects.filter(id=source_id).exists():
-        source_id = uuid.uuid4().hex[:12]
+    source_id = new_id()
     
     # Get name from request data
     name = request.data.get('name', '').strip()
@@ -9819,9 +9322,7 @@ def platform_list(request):
 @permission_classes([IsAuthenticated])
 def platform_create(request):
     """Create a new platform"""
-    platform_id = uuid.uuid4().hex[:12]
-    while Platform.objects.filter(id=platform_id).exists():
-        platform_id = uuid.uuid4().hex[:12]
+    platform_id = new_id()
     
     # Get name from request data
     name = request.data.get('name', '').strip()
@@ -9878,9 +9379,7 @@ def note_category_create(request):
     serializer = NoteCategorySerializer(data=request.data)
     if serializer.is_valid():
         # Generate category ID
-        category_id = uuid.uuid4().hex[:12]
-        while NoteCategory.objects.filter(id=category_id).exists():
-            category_id = uuid.uuid4().hex[:12]
+        category_id = new_id()
         
         # Auto-assign orderIndex: get the max orderIndex and add 1
         max_order = NoteCategory.objects.aggregate(
@@ -9944,35 +9443,149 @@ def note_category_reorder(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
+CONTACT_LOGS_PAGE_SIZE = 50
+CONTACT_LOGS_MAX_PAGE_SIZE = 500
+
+def _encode_keyset_cursor(log):
+    """Opaque cursor of the (created_at, id) position of a row in a newest-first list (logs, notifications)"""
+    import base64
+    raw = f"{log.created_at.isoformat()}|{log.id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def _decode_keyset_cursor(cursor):
+    import base64
+    import binascii
+    try:
+        raw = base64.urlsafe_b64decode((cursor + '=' * (-len(cursor) % 4)).encode('ascii')).decode('utf-8')
+        created_at_raw, log_id = raw.split('|', 1)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError('Invalid cursor')
+    from django.utils.dateparse import parse_datetime
+    created_at = parse_datetime(created_at_raw)
+    if created_at is None or not log_id:
+        raise ValueError('Invalid cursor')
+    return created_at, log_id
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def contact_logs(request, contact_id):
-    """Get all logs related to a contact"""
+    """Get the logs related to a contact, newest first
+    Query params:
+        - cursor / page_size: keyset pagination on (created_at, id), the response has nextCursor and hasMore
+          (without them every log is returned)
+        - eventType: comma separated event types to keep
+        - summary=true: omit details/oldValue/newValue (fetch one entry with contact_log_detail)
+        - includeArchived=true: include the logs moved to the archive storage
+        - snapshots=true: add the full oldSnapshot/newSnapshot of editContact logs
+    """
     try:
         # Verify contact exists
         contact = get_object_or_404(Contact, id=contact_id)
+        params = request.query_params
+        
+        summary = params.get('summary', '').lower() in ('true', '1')
+        event_types = [event_type.strip() for event_type in params.get('eventType', '').split(',') if event_type.strip()]
+        
+        paginate = bool(params.get('cursor') or params.get('page_size'))
+        cursor = None
+        page_size = CONTACT_LOGS_PAGE_SIZE
+        if paginate:
+            try:
+                page_size = int(params.get('page_size') or CONTACT_LOGS_PAGE_SIZE)
+            except (TypeError, ValueError):
+                page_size = CONTACT_LOGS_PAGE_SIZE
+            page_size = min(max(page_size, 1), CONTACT_LOGS_MAX_PAGE_SIZE)
+            if params.get('cursor'):
+                try:
+                    cursor = _decode_keyset_cursor(params.get('cursor'))
+                except ValueError:
+                    return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Get all logs for this contact with optimized queries
         # Use select_related to avoid N+1 queries when accessing user_id, contact_id
         logs = Log.objects.filter(
             contact_id=contact
         ).select_related(
             'user_id',  # For userId and userName (who performed the action) in serializer
             'contact_id'  # For contactId in serializer
-        ).order_by('-created_at')
-        
-        # Debug: Print log types being returned
-        log_types = logs.values_list('event_type', flat=True).distinct()
-        print(f"[CONTACT LOGS] Contact {contact_id}: Found {logs.count()} logs with types: {list(log_types)}")
-        
-        serializer = LogSerializer(logs, many=True)
-        return Response({'logs': serializer.data}, status=status.HTTP_200_OK)
+        ).order_by('-created_at', '-id')
+        if event_types:
+            logs = logs.filter(event_type__in=event_types)
+        if summary:
+            logs = logs.defer('details', 'old_value', 'new_value', 'old_logs')
+        if cursor:
+            cursor_created_at, cursor_id = cursor
+            logs = logs.filter(Q(created_at__lt=cursor_created_at) | Q(created_at=cursor_created_at, id__lt=cursor_id))
+        # One extra row tells whether there is a next page
+        logs = list(logs[:page_size + 1]) if paginate else list(logs)
+        
+        # Logs moved to the archive storage by archive_logs are only read on request (one file per archived month)
+        if params.get('includeArchived', '').lower() in ('true', '1'):
+            from api.utils.log_archive import archived_log_instances, archived_logs_for_contact
+            archived = archived_log_instances(contact, archived_logs_for_contact(contact.id))
+            if event_types:
+                archived = [log for log in archived if log.event_type in event_types]
+            if cursor:
+                archived = [log for log in archived if (log.created_at, log.id) < cursor]
+            if archived:
+                logs = sorted(logs + archived, key=lambda log: (log.created_at, log.id), reverse=True)
+        
+        has_more = paginate and len(logs) > page_size
+        if paginate:
+            logs = logs[:page_size]
+        
+        serializer_class = LogSummarySerializer if summary else LogSerializer
+        logs_data = serializer_class(logs, many=True).data
+        
+        # editContact logs only store the changed fields: rebuild the full snapshots on request
+        if params.get('snapshots', '').lower() in ('true', '1') and not summary:
+            edit_logs = [log for log in logs if log.event_type == 'editContact']
+            if cursor and edit_logs:
+                # The snapshots are rebuilt from the current state: include the edits of the previous pages
+                cursor_created_at, cursor_id = cursor
+                newer_edit_logs = Log.objects.filter(
+                    contact_id=contact,
+                    event_type='editContact',
+                ).filter(
+                    Q(created_at__gt=cursor_created_at) | Q(created_at=cursor_created_at, id__gte=cursor_id)
+                ).only('id', 'event_type', 'created_at', 'old_value', 'new_value').order_by('-created_at', '-id')
+                edit_logs = list(newer_edit_logs) + edit_logs
+            snapshots = reconstruct_contact_log_snapshots(contact, edit_logs)
+            for log_data in logs_data:
+                if log_data['id'] in snapshots:
+                    log_data['oldSnapshot'], log_data['newSnapshot'] = snapshots[log_data['id']]
+        
+        response_data = {'logs': logs_data}
+        if paginate:
+            response_data['nextCursor'] = _encode_keyset_cursor(logs[-1]) if has_more else None
+            response_data['hasMore'] = has_more
+        return Response(response_data, status=status.HTTP_200_OK)
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
         print(f"Error in contact_logs: {error_details}")
         return Response({'error': str(e), 'details': error_details}, status=status.HTTP_400_BAD_REQUEST)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def contact_log_detail(request, contact_id, log_id):
+    """Get one log of a contact with its details/oldValue/newValue (expanded entry of the summary timeline)"""
+    try:
+        contact = get_object_or_404(Contact, id=contact_id)
+        log = Log.objects.filter(contact_id=contact, id=log_id).select_related('user_id', 'contact_id').first()
+        if log is None:
+            # The log may have been moved to the archive storage
+            from api.utils.log_archive import archived_log_instances, archived_logs_for_contact
+            records = [record for record in archived_logs_for_contact(contact.id) if record.get('id') == log_id]
+            if not records:
+                return Response({'error': 'Log not found'}, status=status.HTTP_404_NOT_FOUND)
+            log = archived_log_instances(contact, records)[0]
+        return Response({'log': LogSerializer(log).data}, status=status.HTTP_200_OK)
+    except Exception as e:
+        import traceback
+        error_details = traceback.format_exc()
+        print(f"Error in contact_log_detail: {error_details}")
+        return Response({'error': str(e), 'details': error_details}, status=status.HTTP_400_BAD_REQUEST)
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def contact_documents(request, contact_id):
@@ -10109,7 +9722,7 @@ def document_create(request):
             contact_id=contact,
             document_type=document_type,
             defaults={
-                'id': uuid.uuid4().hex[:12],
+                'id': new_id(),
                 'has_document': bool(file_url),
                 'file_url': file_url,
                 'file_name': file_name,
@@ -10692,9 +10305,7 @@ def smtp_config(request):
                 return Response({'error': 'SMTP configuration already exists. Use PUT to update.'}, 
                               status=status.HTTP_400_BAD_REQUEST)
             
-            config_id = uuid.uuid4().hex[:12]
-            while SMTPConfig.objects.filter(id=config_id).exists():
-                config_id = uuid.uuid4().hex[:12]
+            config_id = new_id()
             
             config = SMTPConfig.objects.create(
                 id=config_id,
@@ -10936,9 +10547,7 @@ def send_email(request):
             if contact_id:
                 contact = Contact.objects.filter(id=contact_id).first()
             
-            email_id = uuid.uuid4().hex[:12]
-            while Email.objects.filter(id=email_id).exists():
-                email_id = uuid.uuid4().hex[:12]
+            email_id = new_id()
             
             email_obj = Email.objects.create(
                 id=email_id,
@@ -11141,9 +10750,7 @@ def fetch_emails(request):
                         continue
                     
                     # Save email
-                    new_email_id = uuid.uuid4().hex[:12]
-                    while Email.objects.filter(id=new_email_id).exists():
-                        new_email_id = uuid.uuid4().hex[:12]
+                    new_email_id = new_id()
                     
                     Email.objects.create(
                         id=new_email_id,
@@ -11244,9 +10851,7 @@ def email_signatures(request):
             if is_default:
                 EmailSignature.objects.filter(user=user, is_default=True).update(is_default=False)
             
-            signature_id = uuid.uuid4().hex[:12]
-            while EmailSignature.objects.filter(id=signature_id).exists():
-                signature_id = uuid.uuid4().hex[:12]
+            signature_id = new_id()
             
             signature = EmailSignature.objects.create(
                 id=signature_id,
@@ -11626,9 +11231,7 @@ def chat_rooms(request):
                     return Response(serializer.data, status=status.HTTP_200_OK)
         
         # Create new chat room
-        chat_room_id = uuid.uuid4().hex[:12]
-        while ChatRoom.objects.filter(id=chat_room_id).exists():
-            chat_room_id = uuid.uuid4().hex[:12]
+        chat_room_id = new_id()
         
         # Create chat room with optional name
         chat_room = ChatRoom.objects.create(id=chat_room_id, name=name if name else None)
@@ -11712,9 +11315,7 @@ def chat_messages(request, chat_room_id):
             if not content:
                 return Response({'error': 'Message content is required'}, status=status.HTTP_400_BAD_REQUEST)
             
-            message_id = uuid.uuid4().hex[:12]
-            while Message.objects.filter(id=message_id).exists():
-                message_id = uuid.uuid4().hex[:12]
+            message_id = new_id()
             
             message = Message.objects.create(
                 id=message_id,
@@ -11932,29 +11533,77 @@ def chat_users(request):
     return Response(user_list)
 
 # Notification views
+NOTIFICATIONS_PAGE_SIZE = 50
+NOTIFICATIONS_MAX_PAGE_SIZE = 200
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def notification_list(request):
-    """Get all notifications for the current user"""
+    """Get notifications for the current user
+    Query params:
+        - cursor / page_size: keyset pagination on (created_at, id), newest first; the response has
+          next_cursor and has_more
+        - unread_only=true: only the unread notifications, newest first (paginated as above)
+        - limit / offset (default): unread first, then newest first
+    """
+    params = request.query_params
+    unread_only = params.get('unread_only', '').lower() in ('true', '1')
+    
     # Exclude message notifications - they are handled separately via chat popup
+    notifications = Notification.objects.filter(user=request.user).exclude(type='message')
+    
+    if unread_only or params.get('cursor') or params.get('page_size'):
+        try:
+            page_size = int(params.get('page_size') or NOTIFICATIONS_PAGE_SIZE)
+        except (TypeError, ValueError):
+            page_size = NOTIFICATIONS_PAGE_SIZE
+        page_size = min(max(page_size, 1), NOTIFICATIONS_MAX_PAGE_SIZE)
+        
+        if unread_only:
+            # (user, is_read) index
+            notifications = notifications.filter(is_read=False)
+        # (user, -created_at, -id) index
+        notifications = notifications.order_by('-created_at', '-id')
+        if params.get('cursor'):
+            try:
+                cursor_created_at, cursor_id = _decode_keyset_cursor(params.get('cursor'))
+            except ValueError:
+                return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+            notifications = notifications.filter(
+                Q(created_at__lt=cursor_created_at) | Q(created_at=cursor_created_at, id__lt=cursor_id)
+            )
+        # One extra row tells whether there is a next page
+        notifications = list(notifications[:page_size + 1])
+        has_more = len(notifications) > page_size
+        notifications = notifications[:page_size]
+        
+        serializer = NotificationSerializer(notifications, many=True)
+        return Response({
+            'notifications': serializer.data,
+            'unread_count': get_unread_count(request.user.id),
+            'next_cursor': _encode_keyset_cursor(notifications[-1]) if has_more else None,
+            'has_more': has_more,
+        })
+    
     # Order by unread status first (unread first), then by created_at (newest first)
-    notifications = Notification.objects.filter(user=request.user).exclude(type='message').order_by('is_read', '-created_at')
+    notifications = notifications.order_by('is_read', '-created_at')
     
     # Pagination - increase limit to ensure all unread notifications are included
-    limit = int(request.query_params.get('limit', 200))  # Increased to ensure unread notifications aren't paginated out
-    offset = int(request.query_params.get('offset', 0))
+    limit = int(params.get('limit', 200))  # Increased to ensure unread notifications aren't paginated out
+    offset = int(params.get('offset', 0))
     
+    total = notifications.count()
     notifications = notifications[offset:offset + limit]
     
     serializer = NotificationSerializer(notifications, many=True)
     
     # Calculate unread count for debugging
-    unread_count = Notification.objects.filter(user=request.user, is_read=False).exclude(type='message').count()
+    unread_count = get_unread_count(request.user.id)
     unread_in_response = sum(1 for n in serializer.data if not n.get('is_read', True))
     
     return Response({
         'notifications': serializer.data,
-        'total': Notification.objects.filter(user=request.user).exclude(type='message').count(),
+        'total': total,
         'unread_count': unread_count,  # Include unread count in response for debugging
         'unread_in_response': unread_in_response  # How many unread notifications are in this response
     })
@@ -11964,7 +11613,7 @@ def notification_list(request):
 def notification_unread_count(request):
     """Get unread notifications count for the current user (excluding message notifications)"""
     # Exclude message notifications - they are handled separately via chat popup
-    count = Notification.objects.filter(user=request.user, is_read=False).exclude(type='message').count()
+    count = get_unread_count(request.user.id)
     return Response({'unread_count': count})
 
 @api_view(['POST'])
@@ -11973,8 +11622,9 @@ def notification_mark_read(request, notification_id):
     """Mark a notification as read"""
     try:
         notification = Notification.objects.get(id=notification_id, user=request.user)
+        # Conditional update: the unread counter is decremented once even if marked twice concurrently
+        mark_notifications_read(request.user.id, notification.id)
         notification.is_read = True
-        notification.save()
         
         # Send websocket update to notify frontend immediately
         channel_layer = get_channel_layer()
@@ -11994,7 +11644,7 @@ def notification_mark_read(request, notification_id):
             }
             
             # Get updated unread count (excluding message notifications)
-            unread_count = Notification.objects.filter(user=request.user, is_read=False).exclude(type='message').count()
+            unread_count = get_unread_count(request.user.id)
             
             # Send via WebSocket
             async_to_sync(channel_layer.group_send)(
@@ -12016,13 +11666,13 @@ def notification_mark_read(request, notification_id):
 def notification_mark_all_read(request):
     """Mark all notifications as read for the current user (excluding message notifications)"""
     # Only mark non-message notifications as read - message notifications are handled separately
-    Notification.objects.filter(user=request.user, is_read=False).exclude(type='message').update(is_read=True)
+    mark_notifications_read(request.user.id)
     
     # Send websocket update to notify frontend immediately
     channel_layer = get_channel_layer()
     if channel_layer:
         # Get updated unread count (excluding message notifications, should be 0)
-        unread_count = Notification.objects.filter(user=request.user, is_read=False).exclude(type='message').count()
+        unread_count = get_unread_count(request.user.id)
         
         # Send via WebSocket
         async_to_sync(channel_layer.group_send)(
@@ -12053,7 +11703,7 @@ def notification_preference_detail(request, role_id):
         preference, created = NotificationPreference.objects.get_or_create(
             role=role,
             defaults={
-                'id': uuid.uuid4().hex[:12],
+                'id': new_id(),
                 'notify_message_received': True,
                 'notify_sensitive_contact_modification': True,
                 'notify_contact_edit': True
@@ -12061,9 +11711,7 @@ def notification_preference_detail(request, role_id):
         )
         # Ensure ID is set if it was just created
         if created:
-            pref_id = uuid.uuid4().hex[:12]
-            while NotificationPreference.objects.filter(id=pref_id).exists():
-                pref_id = uuid.uuid4().hex[:12]
+            pref_id = new_id()
             preference.id = pref_id
             preference.save()
         
@@ -12081,7 +11729,7 @@ def notification_preference_update(request, role_id):
         preference, created = NotificationPreference.objects.get_or_create(
             role=role,
             defaults={
-                'id': uuid.uuid4().hex[:12],
+                'id': new_id(),
                 'notify_message_received': True,
                 'notify_sensitive_contact_modification': True,
                 'notify_contact_edit': True
@@ -12090,9 +11738,7 @@ def notification_preference_update(request, role_id):
         
         # Ensure ID is set if it was just created
         if created:
-            pref_id = uuid.uuid4().hex[:12]
-            while NotificationPreference.objects.filter(id=pref_id).exists():
-                pref_id = uuid.uuid4().hex[:12]
+            pref_id = new_id()
             preference.id = pref_id
             preference.save()
         
@@ -12128,7 +11774,7 @@ def fosse_settings_detail(request, role_id):
         fosse_setting, created = FosseSettings.objects.get_or_create(
             role=role,
             defaults={
-                'id': uuid.uuid4().hex[:12],
+                'id': new_id(),
                 'forced_columns': [],
                 'forced_filters': {},
                 'default_order': 'default'
@@ -12136,9 +11782,7 @@ def fosse_settings_detail(request, role_id):
         )
         # Ensure ID is set if it was just created
         if created:
-            setting_id = uuid.uuid4().hex[:12]
-            while FosseSettings.objects.filter(id=setting_id).exists():
-                setting_id = uuid.uuid4().hex[:12]
+            setting_id = new_id()
             fosse_setting.id = setting_id
             fosse_setting.save()
         
@@ -12158,7 +11802,7 @@ def fosse_settings_update(request, role_id):
         fosse_setting, created = FosseSettings.objects.get_or_create(
             role=role,
             defaults={
-                'id': uuid.uuid4().hex[:12],
+                'id': new_id(),
                 'forced_columns': [],
                 'forced_filters': {},
                 'default_order': 'default'
@@ -12167,9 +11811,7 @@ def fosse_settings_update(request, role_id):
         
         # Ensure ID is set if it was just created
         if created:
-            setting_id = uuid.uuid4().hex[:12]
-            while FosseSettings.objects.filter(id=setting_id).exists():
-                setting_id = uuid.uuid4().hex[:12]
+            setting_id = new_id()
             fosse_setting.id = setting_id
             fosse_setting.save()
         
@@ -12354,9 +11996,7 @@ def send_otp(request):
         OTP.objects.filter(email=email, is_verified=False).update(is_verified=True)
         
         # Create new OTP record
-        otp_id = uuid.uuid4().hex[:12]
-        while OTP.objects.filter(id=otp_id).exists():
-            otp_id = uuid.uuid4().hex[:12]
+        otp_id = new_id()
         
         otp = OTP.objects.create(
             id=otp_id,
@@ -174,6 +174,31 @@ else:
         },
     }
 
+# Cache (unread notification counters), on the same Redis as the channel layer
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            # Aiven Redis uses a self-signed certificate (see the channel layer above)
+            'OPTIONS': {'ssl_cert_reqs': None} if REDIS_URL.startswith('rediss://') else {},
+        },
+    }
+elif os.getenv('USE_REDIS', 'False') == 'True':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': f"redis://{os.getenv('REDIS_HOST', 'localhost')}:{int(os.getenv('REDIS_PORT', 6379))}",
+        },
+    }
+else:
+    # Per-process cache for local dev: counters are rebuilt from the table when they expire
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+    }
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -362,9 +387,44 @@ CORS_URLS_REGEX = r'^/api/.*$'
 
 # File upload settings for large CSV imports
 DATA_UPLOAD_MAX_MEMORY_SIZE = 100 * 1024 * 1024  # 100 MB
-FILE_UPLOAD_MAX_MEMORY_SIZE = 100 * 1024 * 1024  # 100 MB
+FILE_UPLOAD_MAX_MEMORY_SIZE = 5 * 1024 * 1024  # 5 MB - larger uploads are spooled to a temporary file (imports read them as streams)
 DATA_UPLOAD_MAX_NUMBER_FIELDS = 10000  # Increase field limit for large CSV files
 
+# Background import jobs
+# 'worker': jobs are picked up by `python manage.py process_import_jobs` (worker dyno)
+# 'thread': jobs run in a background thread of the web process (local development)
+IMPORT_JOB_RUNNER = os.getenv('IMPORT_JOB_RUNNER', 'worker')
+# Where queued import files are stored until the worker reads them: 's3' (Impossible Cloud) or 'local' (MEDIA_ROOT)
+# Heroku dynos don't share a filesystem, so the worker dyno needs 's3'
+IMPORT_STORAGE_BACKEND = os.getenv('IMPORT_STORAGE_BACKEND', 's3' if os.getenv('IMPOSSIBLE_CLOUD_ACCESS_KEY') else 'local')
+# Contact import jobs map and convert rows (dates, phones...) in a pool of processes of the import worker for
+# files larger than IMPORT_PARALLEL_MIN_BYTES, the database inserts stay in the importing process. 1 disables
+# the pool. Fixed default: os.cpu_count() reports the host's CPUs on a dyno, not the dyno's share.
+IMPORT_VALIDATION_WORKERS = int(os.getenv('IMPORT_VALIDATION_WORKERS', '2'))
+IMPORT_PARALLEL_MIN_BYTES = int(os.getenv('IMPORT_PARALLEL_MIN_BYTES', str(5 * 1024 * 1024)))
+
+# Node part (0-255) of the generated IDs (api/utils/ids.py). Unset: random per process, collisions between
+# processes sharing a node are then unlikely (random sequence offsets); set a distinct value per process to rule
+# them out entirely.
+ID_NODE = os.getenv('ID_NODE') or None
+
+# Activity logs (api/utils/log_writer.py): 'async' queues them and a background thread writes them in
+# batches every LOG_WRITER_FLUSH_MS ms or LOG_WRITER_BATCH_SIZE rows; 'sync' writes each one immediately (tests).
+LOG_WRITER_MODE = os.getenv('LOG_WRITER_MODE', 'async')
+LOG_WRITER_FLUSH_MS = int(os.getenv('LOG_WRITER_FLUSH_MS', '200'))
+LOG_WRITER_BATCH_SIZE = int(os.getenv('LOG_WRITER_BATCH_SIZE', '200'))
+
+# WebSocket notifications (api/utils/notification_delivery.py): 'async' coalesces the notifications of each user
+# sent within NOTIFICATION_COALESCE_MS ms into one frame; 'sync' sends each one immediately (tests).
+NOTIFICATION_DELIVERY_MODE = os.getenv('NOTIFICATION_DELIVERY_MODE', 'async')
+NOTIFICATION_COALESCE_MS = int(os.getenv('NOTIFICATION_COALESCE_MS', '250'))
+
+# Read notifications older than this are deleted by the prune_notifications command
+NOTIFICATION_RETENTION_DAYS = int(os.getenv('NOTIFICATION_RETENTION_DAYS', '90'))
+
+# Storage of the archived activity logs (archive_logs command): 's3' or 'local', same as imports by default
+LOG_ARCHIVE_STORAGE_BACKEND = os.getenv('LOG_ARCHIVE_STORAGE_BACKEND', IMPORT_STORAGE_BACKEND)
+
 # Logging configuration
 # Custom logging filter to suppress harmless CancelledError exceptions
 # These occur when clients disconnect after responses are sent in async contexts
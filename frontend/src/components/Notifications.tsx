@@ -274,6 +274,37 @@ export default function Notifications() {
         toast.info(message.notification.title, {
           description: message.notification.message,
         });
+      } else if (message.type === 'notifications_batch') {
+        // Several notifications coalesced by the backend in one frame (e.g. bulk actions)
+        const batch = (message.notifications || []).filter((n: any) => n.type !== 'message');
+        if (batch.length === 0) {
+          return;
+        }
+
+        // Add all new notifications in one update (newest first)
+        setNotifications(prev => {
+          const existingIds = new Set(prev.map(n => n.id));
+          const added = batch.filter((n: any) => !existingIds.has(n.id)).reverse();
+          return added.length > 0 ? [...added, ...prev] : prev;
+        });
+        if (message.unread_count !== undefined) {
+          setUnreadCount(message.unread_count);
+        } else {
+          loadUnreadCount();
+        }
+
+        setUserManuallyClosed(false);
+
+        // One toast for the whole batch
+        if (batch.length === 1) {
+          toast.info(batch[0].title, {
+            description: batch[0].message,
+          });
+        } else {
+          toast.info(`${batch.length} nouvelles notifications`, {
+            description: batch[batch.length - 1].title,
+          });
+        }
       } else if (message.type === 'event_notification') {
         // Handle event notifications (reminders, assignments)
         const eventNotification = message.notification;